@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Gramlytics - Grammy Nomination Predictor
+HTTP prediction API, served alongside the Streamlit UI.
+
+Endpoints:
+    GET  /health          Model version and readiness
+    POST /predict         One song (JSON object)
+    POST /predict/batch   Many songs (JSON array, or NDJSON with
+                          Content-Type: application/x-ndjson; the response
+                          uses the same format)
+    GET  /chart/current   Current Billboard predictions (?limit=N)
+
+Explanations are included unless the request passes ?explain=false.
+Each worker process loads the model package once (and reloads it only when
+the file changes).
+
+Usage:
+    python app/api.py --workers 4 --port 8000
+    uvicorn app.api:app --workers 4
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# Add app, parent directory and shared scripts to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import pandas as pd
+
+from serving import load_current_predictions, load_model_package, load_training_data
+from predictor import predict_batch
+
+
+# Fields every song in a request must provide
+REQUIRED_FIELDS = [
+    'peak_position',
+    'weeks_on_chart',
+    'artist_past_grammy_noms',
+    'artist_past_grammy_wins',
+    'genre'
+]
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class RequestError(Exception):
+    """Invalid request payload (returned as HTTP 400)."""
+
+
+def _wants_explanation(request):
+    return request.query_params.get('explain', 'true').lower() not in ('0', 'false', 'no')
+
+
+def _is_ndjson(request):
+    return request.headers.get('content-type', '').split(';')[0].strip() == NDJSON_MEDIA_TYPE
+
+
+def _songs_frame(songs):
+    """Validate request songs and build a DataFrame."""
+    if not songs:
+        raise RequestError("Request contains no songs")
+
+    for i, song in enumerate(songs):
+        if not isinstance(song, dict):
+            raise RequestError(f"Song {i} is not a JSON object")
+        missing = [field for field in REQUIRED_FIELDS if song.get(field) is None]
+        if missing:
+            raise RequestError(f"Song {i} is missing fields: {', '.join(missing)}")
+
+    return pd.DataFrame(songs)
+
+
+def _score(songs, explain):
+    """Score songs with the (cached) model package; runs in a worker thread."""
+    model_package = load_model_package()
+    df = _songs_frame(songs)
+
+    try:
+        result = predict_batch(model_package, df, explain=explain)
+    except ValueError as e:
+        # e.g. a genre the model's encoder has never seen
+        raise RequestError(str(e))
+
+    result['prediction'] = result['prediction'].astype(bool)
+    records = result.to_dict('records')
+
+    # Echo identifying fields back so batch results can be matched up
+    for song, record in zip(songs, records):
+        for field in ('song_title', 'artist_name'):
+            if field in song:
+                record[field] = song[field]
+
+    return records
+
+
+def _error(message, status_code):
+    return JSONResponse({'error': message}, status_code=status_code)
+
+
+async def health(request):
+    try:
+        model_package = await run_in_threadpool(load_model_package)
+    except FileNotFoundError as e:
+        return _error(str(e), 503)
+
+    return JSONResponse({
+        'status': 'ok',
+        'model_version': model_package.get('version'),
+        'trained_date': model_package.get('trained_date'),
+    })
+
+
+async def predict(request):
+    try:
+        song = await request.json()
+    except ValueError:
+        return _error("Request body must be a JSON object", 400)
+
+    try:
+        records = await run_in_threadpool(_score, [song], _wants_explanation(request))
+    except RequestError as e:
+        return _error(str(e), 400)
+    except FileNotFoundError as e:
+        return _error(str(e), 503)
+
+    return JSONResponse(records[0])
+
+
+async def predict_batch_endpoint(request):
+    body = await request.body()
+    ndjson = _is_ndjson(request)
+
+    try:
+        if ndjson:
+            songs = [json.loads(line) for line in body.decode('utf-8').splitlines() if line.strip()]
+        else:
+            songs = json.loads(body)
+            if not isinstance(songs, list):
+                raise ValueError
+    except ValueError:
+        return _error("Request body must be a JSON array (or NDJSON lines)", 400)
+
+    try:
+        records = await run_in_threadpool(_score, songs, _wants_explanation(request))
+    except RequestError as e:
+        return _error(str(e), 400)
+    except FileNotFoundError as e:
+        return _error(str(e), 503)
+
+    if ndjson:
+        content = ''.join(json.dumps(record) + '\n' for record in records)
+        return Response(content, media_type=NDJSON_MEDIA_TYPE)
+
+    return JSONResponse(records)
+
+
+def _current_chart(limit, explain):
+    model_package = load_model_package()
+    pred_df = load_current_predictions(model_package, load_training_data())
+    if limit is not None:
+        pred_df = pred_df.head(limit)
+
+    columns = ['song_title', 'artist_name', 'peak_position', 'weeks_on_chart', 'genre',
+               'artist_past_grammy_noms', 'artist_past_grammy_wins', 'probability', 'prediction']
+    chart = pred_df[columns].copy()
+    chart['prediction'] = chart['prediction'].astype(bool)
+
+    if explain:
+        if 'explanation' in pred_df.columns:
+            chart['explanation'] = pred_df['explanation']
+        else:
+            chart = chart.join(predict_batch(model_package, pred_df, explain=True)[['explanation']])
+
+    return chart.to_dict('records')
+
+
+async def chart_current(request):
+    try:
+        limit = request.query_params.get('limit')
+        limit = int(limit) if limit is not None else None
+        if limit is not None and limit < 0:
+            raise ValueError
+    except ValueError:
+        return _error("limit must be a non-negative integer", 400)
+
+    try:
+        records = await run_in_threadpool(_current_chart, limit, _wants_explanation(request))
+    except FileNotFoundError as e:
+        return _error(str(e), 503)
+
+    return JSONResponse(records)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Load the model package once when a worker starts (if it exists)."""
+    try:
+        await run_in_threadpool(load_model_package)
+    except FileNotFoundError as e:
+        print(f"⚠️  {e}")
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route('/health', health, methods=['GET']),
+        Route('/predict', predict, methods=['POST']),
+        Route('/predict/batch', predict_batch_endpoint, methods=['POST']),
+        Route('/chart/current', chart_current, methods=['GET']),
+    ],
+    lifespan=lifespan,
+)
+
+
+def main():
+    """Run the API with uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Gramlytics prediction API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (each loads the model once)")
+    args = parser.parse_args()
+
+    uvicorn.run('api:app', host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Process-wide registry for the model, datasets and derived predictions.
+
+Streamlit re-executes main.py on every interaction, but imported modules stay
+loaded, so state kept here is shared by all sessions in the process. Each
+entry is tied to its source files: a changed mtime/size triggers a content
+hash check, and the entry is reloaded only if the content actually changed.
+"""
+
+import hashlib
+import os
+import threading
+
+
+_lock = threading.RLock()
+_files = {}     # path -> {'signature': (mtime_ns, size), 'sha256': str}
+_entries = {}   # key -> {'versions': tuple, 'value': object}
+
+
+def _signature(path):
+    """Cheap change detector: (mtime_ns, size)."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_version(path):
+    """
+    Content hash of a file, recomputed only when its mtime or size changes.
+
+    Args:
+        path: File path
+
+    Returns:
+        str: SHA-256 hex digest of the file contents
+    """
+    signature = _signature(path)
+
+    with _lock:
+        known = _files.get(path)
+        if known and known['signature'] == signature:
+            return known['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+        _files[path] = {'signature': signature, 'sha256': digest.hexdigest()}
+        return _files[path]['sha256']
+
+
+def get(key, paths, builder):
+    """
+    Return a cached value, rebuilding it when any source file changed.
+
+    Args:
+        key: Registry key (any hashable)
+        paths: Source file paths the value depends on
+        builder: Zero-argument callable producing the value
+
+    Returns:
+        object: The cached (shared, treat as read-only) value
+    """
+    with _lock:
+        versions = tuple(file_version(path) for path in paths)
+
+        entry = _entries.get(key)
+        if entry and entry['versions'] == versions:
+            return entry['value']
+
+        value = builder()
+        _entries[key] = {'versions': versions, 'value': value}
+        return value
+
+
+def get_file(path, loader):
+    """
+    Return a file loaded with loader(path), reloading only when it changes.
+
+    Args:
+        path: File path
+        loader: Callable taking the path and returning the loaded object
+
+    Returns:
+        object: The cached (shared, treat as read-only) value
+    """
+    return get(('file', path), [path], lambda: loader(path))
+
+
+def clear():
+    """Drop all cached entries (e.g., after retraining in-process)."""
+    with _lock:
+        _files.clear()
+        _entries.clear()
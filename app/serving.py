@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Model, data and precomputed-prediction loading shared by the Streamlit UI
+(app/main.py) and the HTTP API (app/api.py).
+
+Everything goes through the process-wide registry, so each process loads a
+file once and reloads it only when its content changes. Paths are relative
+to the repository root, where both entry points are run from.
+"""
+
+import os
+
+import pandas as pd
+
+import registry
+from model_format import MODEL_BUNDLE_DIR, MODEL_PICKLE_PATH, bundle_paths, load_model_bundle, model_source_path
+from predictor import predict_batch
+from storage import read_table, table_exists, table_path
+
+
+MODEL_PATH = MODEL_BUNDLE_DIR
+TRAINING_DATA_PATH = 'data/processed/training'
+PREDICTIONS_PATH = 'data/processed/predictions.parquet'
+BACKTEST_SUMMARY_PATH = 'data/processed/backtest_summary.json'
+
+# Columns carried into the current predictions
+PREDICTION_DISPLAY_COLUMNS = [
+    'song_title', 'artist_name', 'current_rank', 'peak_position', 'weeks_on_chart', 'genre',
+    'artist_past_grammy_noms', 'artist_past_grammy_wins'
+]
+
+# Training data columns the app reads (it never needs labels or provenance)
+APP_DATA_COLUMNS = ['data_source'] + PREDICTION_DISPLAY_COLUMNS
+
+# Columns summarized for the dataset stats shown in the app
+STATS_COLUMNS = ['data_source', 'is_nominated', 'grammy_year']
+
+
+def _read_json(path):
+    import json
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _unpickle(path):
+    import pickle
+
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def load_model_package():
+    """
+    Trained model package (shared per process, reloaded on change).
+
+    Loads the pickle-free bundle (NumPy only, no sklearn import). The legacy
+    pickle is used only when no bundle exists, e.g. for non-linear models.
+
+    Raises:
+        FileNotFoundError: If the model has not been trained yet
+    """
+    if os.path.exists(bundle_paths(MODEL_BUNDLE_DIR)[0]):
+        return registry.get(('model_bundle', MODEL_BUNDLE_DIR), bundle_paths(MODEL_BUNDLE_DIR),
+                            lambda: load_model_bundle(MODEL_BUNDLE_DIR))
+
+    if os.path.exists(MODEL_PICKLE_PATH):
+        return registry.get_file(MODEL_PICKLE_PATH, _unpickle)
+
+    raise FileNotFoundError(f"Model not found at {MODEL_PATH}. Run scripts/train_baseline.py first.")
+
+
+def load_backtest_summary():
+    """
+    Pooled backtest metrics written by scripts/backtest.py (shared per
+    process, reloaded on change).
+
+    Returns:
+        dict: Backtest summary, or None if no backtest has been run
+    """
+    if not os.path.exists(BACKTEST_SUMMARY_PATH):
+        return None
+
+    return registry.get_file(BACKTEST_SUMMARY_PATH, _read_json)
+
+
+def load_training_data():
+    """
+    Processed training data (shared per process, reloaded on change).
+
+    Only the columns the app displays or scores with are read.
+
+    Raises:
+        FileNotFoundError: If the training data has not been built yet
+    """
+    if not table_exists(TRAINING_DATA_PATH):
+        raise FileNotFoundError(f"Training data not found at {TRAINING_DATA_PATH}.parquet. "
+                                "Run scripts/prepare_training_data.py first.")
+
+    return registry.get_file(table_path(TRAINING_DATA_PATH),
+                             lambda path: read_table(TRAINING_DATA_PATH, columns=APP_DATA_COLUMNS))
+
+
+def _training_stats():
+    df = read_table(TRAINING_DATA_PATH, columns=STATS_COLUMNS)
+    grammy_years = df.loc[df['data_source'] == 'grammy_historical', 'grammy_year'].dropna()
+
+    return {
+        'rows': len(df),
+        'labeled_rows': int(df['is_nominated'].notna().sum()),
+        'grammy_records': int((df['data_source'] == 'grammy_historical').sum()),
+        'first_year': int(grammy_years.min()) if len(grammy_years) else None,
+        'last_year': int(grammy_years.max()) if len(grammy_years) else None,
+    }
+
+
+def load_training_stats():
+    """
+    Row counts and Grammy year range of the training data (shared per
+    process, reloaded on change).
+
+    Returns:
+        dict: rows, labeled_rows, grammy_records, first_year and last_year
+            (None without Grammy records)
+
+    Raises:
+        FileNotFoundError: If the training data has not been built yet
+    """
+    if not table_exists(TRAINING_DATA_PATH):
+        raise FileNotFoundError(f"Training data not found at {TRAINING_DATA_PATH}.parquet. "
+                                "Run scripts/prepare_training_data.py first.")
+
+    return registry.get('training_stats', [table_path(TRAINING_DATA_PATH)], _training_stats)
+
+
+def load_current_predictions(model_package, df):
+    """
+    Scored current Billboard songs, sorted by probability.
+
+    Served from the predictions artifact written by train_baseline.py when it
+    matches the current model and training data; otherwise scored live. Either
+    way the result is cached per model/data version and shared within the
+    process, so callers only index into it (treat it as read-only).
+
+    Args:
+        model_package: Loaded model package
+        df: Training data (as returned by load_training_data)
+
+    Returns:
+        pd.DataFrame: Current predictions; 'explanation' is present only when
+            served from the artifact
+    """
+    def build():
+        if os.path.exists(PREDICTIONS_PATH):
+            artifact = pd.read_parquet(PREDICTIONS_PATH)
+            is_fresh = (
+                len(artifact) > 0
+                and artifact['model_sha256'].iloc[0] == registry.file_version(model_source_path())
+                and artifact['training_data_sha256'].iloc[0] == registry.file_version(table_path(TRAINING_DATA_PATH))
+            )
+            if is_fresh:
+                return artifact.sort_values('probability', ascending=False).reset_index(drop=True)
+
+        # Artifact missing or stale: score live (explanations are built on demand)
+        current_df = df[df['data_source'] == 'billboard_current']
+        columns = [col for col in PREDICTION_DISPLAY_COLUMNS if col in current_df.columns]  # older tables lack current_rank
+        pred_df = current_df[columns].join(predict_batch(model_package, current_df, explain=False))
+        return pred_df.sort_values('probability', ascending=False).reset_index(drop=True)
+
+    paths = [model_source_path(), table_path(TRAINING_DATA_PATH)]
+    if os.path.exists(PREDICTIONS_PATH):
+        paths.append(PREDICTIONS_PATH)
+
+    return registry.get('current_predictions', paths, build)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Gramlytics theme: background image and custom CSS.
+
+The background is served through Streamlit's static file serving
+(server.enableStaticServing in .streamlit/config.toml) as a downscaled WebP
+variant of app/static/image002.png, so each rerun only emits a short CSS
+block with a URL. If static serving is disabled, the variant is inlined as a
+data URI that is encoded once per process.
+"""
+
+import base64
+import os
+from functools import lru_cache
+
+import streamlit as st
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_URL_PREFIX = 'app/static'
+
+BACKGROUND_IMAGE = 'image002.png'
+BACKGROUND_MAX_WIDTH = 1024
+BACKGROUND_WEBP_QUALITY = 80
+
+THEME_CSS = """
+    <style>
+    .stApp {{
+        background-image: url("{background_url}");
+        background-size: cover;
+        background-position: center;
+        background-repeat: no-repeat;
+        background-attachment: fixed;
+    }}
+    
+    /* Add semi-transparent overlay for better text readability */
+    .stApp::before {{
+        content: "";
+        position: fixed;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 100%;
+        background-color: rgba(0, 0, 0, 0.5);
+        z-index: -1;
+    }}
+    
+    /* Header styling - dark background box */
+    .stApp > header {{
+        background-color: rgba(0, 0, 0, 0.8) !important;
+        backdrop-filter: blur(10px);
+    }}
+    
+    /* Main content area - dark semi-transparent background */
+    .main .block-container {{
+        background-color: rgba(0, 0, 0, 0.7);
+        padding: 2rem;
+        border-radius: 10px;
+        backdrop-filter: blur(5px);
+    }}
+    
+    /* Title and headers - white with glow */
+    h1, h2, h3 {{
+        color: #FFD700 !important;
+        text-shadow: 0 0 10px rgba(255, 215, 0, 0.5), 2px 2px 4px rgba(0, 0, 0, 0.9);
+    }}
+    
+    /* Regular text - white */
+    .stMarkdown, .stText, p, label, span, div {{
+        color: white !important;
+        text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.8);
+    }}
+    
+    /* Sidebar - dark with gold accent */
+    [data-testid="stSidebar"] {{
+        background: linear-gradient(180deg, rgba(0, 0, 0, 0.9) 0%, rgba(20, 20, 20, 0.95) 100%);
+        border-right: 2px solid #FFD700;
+    }}
+    
+    [data-testid="stSidebar"] * {{
+        color: white !important;
+    }}
+    
+    [data-testid="stSidebar"] h1, 
+    [data-testid="stSidebar"] h2, 
+    [data-testid="stSidebar"] h3 {{
+        color: #FFD700 !important;
+    }}
+    
+    /* Expanders - dark background */
+    .streamlit-expanderHeader {{
+        background-color: rgba(0, 0, 0, 0.8) !important;
+        border: 1px solid #FFD700 !important;
+    }}
+    
+    .streamlit-expanderContent {{
+        background-color: rgba(20, 20, 20, 0.9) !important;
+        border: 1px solid #FFD700 !important;
+    }}
+    
+    /* Metrics - gold accent */
+    [data-testid="stMetricValue"] {{
+        color: #FFD700 !important;
+    }}
+    
+    /* Buttons - gold */
+    .stButton > button {{
+        background-color: #FFD700 !important;
+        color: black !important;
+        font-weight: bold;
+        border: none;
+    }}
+    
+    .stButton > button:hover {{
+        background-color: #FFC700 !important;
+        box-shadow: 0 0 15px rgba(255, 215, 0, 0.5);
+    }}
+    
+    /* Tabs - blue accent for selected */
+    .stTabs [data-baseweb="tab-list"] {{
+        background-color: rgba(0, 0, 0, 0.8);
+    }}
+    
+    .stTabs [data-baseweb="tab"] {{
+        color: white !important;
+    }}
+    
+    .stTabs [aria-selected="true"] {{
+        background-color: #1E90FF !important;
+        color: white !important;
+    }}
+    
+    /* Dividers - gold */
+    hr {{
+        border-color: #FFD700 !important;
+    }}
+    </style>
+"""
+
+
+def background_asset():
+    """
+    Filename (in STATIC_DIR) of the background image to serve.
+
+    Builds a downscaled WebP variant next to the original the first time it is
+    needed (or when the original changes); falls back to the original PNG if
+    the variant can't be written.
+
+    Returns:
+        str: Filename, or None if the background image is missing
+    """
+    source = os.path.join(STATIC_DIR, BACKGROUND_IMAGE)
+    if not os.path.exists(source):
+        return None
+
+    variant_name = f"{os.path.splitext(BACKGROUND_IMAGE)[0]}.webp"
+    variant = os.path.join(STATIC_DIR, variant_name)
+
+    if os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(source):
+        return variant_name
+
+    try:
+        from PIL import Image
+
+        with Image.open(source) as image:
+            image = image.convert('RGB')
+            if image.width > BACKGROUND_MAX_WIDTH:
+                height = round(image.height * BACKGROUND_MAX_WIDTH / image.width)
+                image = image.resize((BACKGROUND_MAX_WIDTH, height), Image.LANCZOS)
+
+            tmp_path = f"{variant}.tmp"
+            image.save(tmp_path, format='WEBP', quality=BACKGROUND_WEBP_QUALITY, method=6)
+            os.replace(tmp_path, variant)
+        return variant_name
+    except (ImportError, OSError) as e:
+        print(f"⚠️  Could not build WebP background, serving {BACKGROUND_IMAGE}: {e}")
+        return BACKGROUND_IMAGE
+
+
+@lru_cache(maxsize=4)
+def _data_uri(filename, mtime):
+    """Base64 data URI for a static file (encoded once per file version)."""
+    mime = 'image/webp' if filename.endswith('.webp') else 'image/png'
+    with open(os.path.join(STATIC_DIR, filename), 'rb') as f:
+        encoded = base64.b64encode(f.read()).decode()
+    return f"data:{mime};base64,{encoded}"
+
+
+@lru_cache(maxsize=1)
+def _background_asset_cached(source_mtime):
+    return background_asset()
+
+
+def background_url():
+    """
+    URL for the background image.
+
+    Returns:
+        str: Static file URL, data URI fallback, or None if there is no image
+    """
+    source = os.path.join(STATIC_DIR, BACKGROUND_IMAGE)
+    if not os.path.exists(source):
+        return None
+
+    filename = _background_asset_cached(os.path.getmtime(source))
+
+    if st.get_option('server.enableStaticServing'):
+        return f"{STATIC_URL_PREFIX}/{filename}"
+
+    return _data_uri(filename, os.path.getmtime(os.path.join(STATIC_DIR, filename)))
+
+
+@lru_cache(maxsize=4)
+def theme_css(background_url):
+    """Theme CSS for a background URL (formatted once per URL)."""
+    return THEME_CSS.format(background_url=background_url)
+
+
+def apply_theme():
+    """Emit the theme CSS for this rerun."""
+    url = background_url()
+    if url is None:
+        return
+
+    st.markdown(theme_css(url), unsafe_allow_html=True)
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Album art lookup via the iTunes Search API (no auth required).
+
+Lookups run concurrently through a pooled requests session and are persisted
+to a local SQLite cache (data/interim/album_art.sqlite), so a restart does
+not refetch art. Songs with no iTunes match are cached as misses for
+NEGATIVE_TTL_SECONDS; network errors are not persisted, and are retried
+after FAILURE_RETRY_SECONDS so an unreachable API doesn't stall every call.
+
+Artwork is downloaded once, resized and recompressed into a content-addressed
+thumbnail store (data/interim/thumbnails/) at THUMBNAIL_SIZES, and served as
+local bytes. The "No Cover" placeholder is generated locally.
+
+Usage (prefetch for the newest Billboard file):
+    python scripts/album_art.py
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# requests and Pillow are imported where used: the app imports this module on
+# every cold start, but only needs them once art actually has to be fetched
+
+
+ITUNES_SEARCH_URL = 'https://itunes.apple.com/search'
+CACHE_PATH = 'data/interim/album_art.sqlite'
+THUMBNAIL_DIR = 'data/interim/thumbnails'
+PLACEHOLDER_URL = "https://via.placeholder.com/300x300.png?text=No+Cover"
+
+# Display widths used by the app (st.image width=...)
+THUMBNAIL_SIZES = (150, 200)
+THUMBNAIL_QUALITY = 85
+
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 3
+NEGATIVE_TTL_SECONDS = 7 * 24 * 3600
+FAILURE_RETRY_SECONDS = 300
+
+_session = None
+_session_lock = threading.Lock()
+
+# Songs whose lookup hit a network error: {(song_title, artist_name): retry_after}
+_failed_until = {}
+
+
+def _get_session():
+    """Shared HTTP session with a connection pool sized for MAX_WORKERS."""
+    global _session
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+
+    return _session
+
+
+def _connect(cache_path):
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS album_art ("
+        " song_title TEXT NOT NULL,"
+        " artist_name TEXT NOT NULL,"
+        " artwork_url TEXT,"
+        " fetched_at REAL NOT NULL,"
+        " PRIMARY KEY (song_title, artist_name))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS artwork ("
+        " artwork_url TEXT PRIMARY KEY,"
+        " sha256 TEXT NOT NULL)"
+    )
+    return conn
+
+
+def _read_cache(songs, cache_path):
+    """
+    Look up cached results.
+
+    Returns:
+        dict: {(song_title, artist_name): artwork_url or None} for fresh entries
+    """
+    cached = {}
+    now = time.time()
+
+    conn = _connect(cache_path)
+    try:
+        for song_title, artist_name in songs:
+            row = conn.execute(
+                "SELECT artwork_url, fetched_at FROM album_art WHERE song_title = ? AND artist_name = ?",
+                (song_title, artist_name)
+            ).fetchone()
+            if row is None:
+                continue
+
+            artwork_url, fetched_at = row
+            if artwork_url is None and now - fetched_at > NEGATIVE_TTL_SECONDS:
+                continue  # Expired miss: look it up again
+
+            cached[(song_title, artist_name)] = artwork_url
+    finally:
+        conn.close()
+
+    return cached
+
+
+def _write_cache(results, cache_path):
+    now = time.time()
+
+    conn = _connect(cache_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO album_art (song_title, artist_name, artwork_url, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(title, artist, url, now) for (title, artist), url in results.items()]
+            )
+    finally:
+        conn.close()
+
+
+def fetch_album_art(song_title, artist_name, search_url=ITUNES_SEARCH_URL):
+    """
+    Query the iTunes Search API for one song.
+
+    Args:
+        song_title: Song title
+        artist_name: Artist name
+        search_url: iTunes search endpoint
+
+    Returns:
+        str: Artwork URL (300x300), or None if iTunes has no match
+
+    Raises:
+        requests.RequestException: On network/HTTP errors
+    """
+    # Clean up artist name (remove featuring, etc.)
+    artist_clean = artist_name.split('Featuring')[0].split('&')[0].strip()
+
+    response = _get_session().get(
+        search_url,
+        params={'term': f"{song_title} {artist_clean}", 'entity': 'song', 'limit': 1},
+        timeout=REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    if data.get('resultCount', 0) > 0:
+        # Get artwork URL (100x100 by default) and upgrade to higher resolution
+        artwork_url = data['results'][0].get('artworkUrl100', '')
+        if artwork_url:
+            return artwork_url.replace('100x100', '300x300')
+
+    return None
+
+
+def resolve_album_art(songs, max_workers=MAX_WORKERS, cache_path=CACHE_PATH, search_url=ITUNES_SEARCH_URL):
+    """
+    Resolve album art for many songs, fetching uncached ones concurrently.
+
+    Args:
+        songs: Iterable of (song_title, artist_name) pairs
+        max_workers: Maximum concurrent iTunes requests
+        cache_path: SQLite cache file
+        search_url: iTunes search endpoint
+
+    Returns:
+        dict: {(song_title, artist_name): artwork_url or None}
+    """
+    songs = list(dict.fromkeys((str(title), str(artist)) for title, artist in songs))
+    results = _read_cache(songs, cache_path)
+
+    now = time.time()
+    missing = [
+        song for song in songs
+        if song not in results and _failed_until.get(song, 0) <= now
+    ]
+    for song in songs:
+        results.setdefault(song, None)
+    if not missing:
+        return results
+
+    import requests
+
+    def lookup(song):
+        try:
+            return song, fetch_album_art(song[0], song[1], search_url), True
+        except (requests.RequestException, ValueError):
+            return song, None, False  # Transient failure: don't persist
+
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+        for song, artwork_url, ok in executor.map(lookup, missing):
+            results[song] = artwork_url
+            if ok:
+                fetched[song] = artwork_url
+                _failed_until.pop(song, None)
+            else:
+                _failed_until[song] = time.time() + FAILURE_RETRY_SECONDS
+
+    if fetched:
+        _write_cache(fetched, cache_path)
+
+    return results
+
+
+def _thumbnail_path(sha256, size, thumbnail_dir=THUMBNAIL_DIR):
+    return os.path.join(thumbnail_dir, sha256[:2], f"{sha256}_{size}.jpg")
+
+
+def _encode_thumbnail(image, size):
+    """Resize to a size x size square (center crop) and encode as JPEG."""
+    from PIL import Image
+
+    image = image.convert('RGB')
+    side = min(image.size)
+    left = (image.width - side) // 2
+    top = (image.height - side) // 2
+    image = image.crop((left, top, left + side, top + side)).resize((size, size), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def store_thumbnails(image_bytes, thumbnail_dir=THUMBNAIL_DIR):
+    """
+    Write resized copies of an image into the content-addressed store.
+
+    Args:
+        image_bytes: Original image bytes
+        thumbnail_dir: Thumbnail store root
+
+    Returns:
+        str: SHA-256 of the original bytes (the store key)
+    """
+    from PIL import Image
+
+    sha256 = hashlib.sha256(image_bytes).hexdigest()
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image.load()
+        for size in THUMBNAIL_SIZES:
+            path = _thumbnail_path(sha256, size, thumbnail_dir)
+            if os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_encode_thumbnail(image, size))
+            os.replace(tmp_path, path)
+
+    return sha256
+
+
+@lru_cache(maxsize=None)
+def placeholder_thumbnail(size):
+    """
+    Locally generated "No Cover" image.
+
+    Args:
+        size: Width/height in pixels
+
+    Returns:
+        bytes: PNG image
+    """
+    from PIL import Image, ImageDraw
+
+    image = Image.new('RGB', (size, size), (30, 30, 30))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, size - 1, size - 1], outline=(255, 215, 0), width=2)
+
+    text = "No Cover"
+    left, top, right, bottom = draw.textbbox((0, 0), text)
+    draw.text(((size - (right - left)) / 2, (size - (bottom - top)) / 2), text, fill=(200, 200, 200))
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def resolve_thumbnails(songs, size, max_workers=MAX_WORKERS, cache_path=CACHE_PATH,
+                       thumbnail_dir=THUMBNAIL_DIR, search_url=ITUNES_SEARCH_URL):
+    """
+    Local thumbnail bytes for many songs.
+
+    Artwork URLs are resolved with resolve_album_art; each distinct URL is
+    downloaded once (concurrently) and stored at every THUMBNAIL_SIZES width.
+
+    Args:
+        songs: Iterable of (song_title, artist_name) pairs
+        size: Thumbnail size, one of THUMBNAIL_SIZES
+        max_workers: Maximum concurrent downloads
+        cache_path: SQLite cache file
+        thumbnail_dir: Thumbnail store root
+        search_url: iTunes search endpoint
+
+    Returns:
+        dict: {(song_title, artist_name): image bytes} (placeholder if no art)
+    """
+    if size not in THUMBNAIL_SIZES:
+        raise ValueError(f"Unsupported thumbnail size {size}; expected one of {THUMBNAIL_SIZES}")
+
+    artwork_urls = resolve_album_art(songs, max_workers=max_workers, cache_path=cache_path, search_url=search_url)
+    urls = sorted({url for url in artwork_urls.values() if url})
+
+    # Map each artwork URL to its stored content hash
+    conn = _connect(cache_path)
+    try:
+        known = dict(conn.execute(
+            f"SELECT artwork_url, sha256 FROM artwork WHERE artwork_url IN ({','.join('?' * len(urls))})",
+            urls
+        ).fetchall()) if urls else {}
+    finally:
+        conn.close()
+
+    now = time.time()
+    to_download = [
+        url for url in urls
+        if (url not in known or not os.path.exists(_thumbnail_path(known[url], size, thumbnail_dir)))
+        and _failed_until.get(url, 0) <= now
+    ]
+
+    import requests
+
+    def download(url):
+        try:
+            response = _get_session().get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return url, store_thumbnails(response.content, thumbnail_dir)
+        except (requests.RequestException, OSError, ValueError):
+            return url, None
+
+    if to_download:
+        stored = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_download))) as executor:
+            for url, sha256 in executor.map(download, to_download):
+                if sha256:
+                    stored[url] = sha256
+                else:
+                    _failed_until[url] = time.time() + FAILURE_RETRY_SECONDS
+
+        if stored:
+            conn = _connect(cache_path)
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO artwork (artwork_url, sha256) VALUES (?, ?)",
+                        list(stored.items())
+                    )
+            finally:
+                conn.close()
+            known.update(stored)
+
+    thumbnails = {}
+    for song, url in artwork_urls.items():
+        image_bytes = None
+        if url in known:
+            try:
+                with open(_thumbnail_path(known[url], size, thumbnail_dir), 'rb') as f:
+                    image_bytes = f.read()
+            except OSError:
+                pass
+        thumbnails[song] = image_bytes or placeholder_thumbnail(size)
+
+    return thumbnails
+
+
+def get_thumbnail(song_title, artist_name, size, **kwargs):
+    """
+    Local thumbnail bytes for one song (placeholder if no art is available).
+
+    Args:
+        song_title: Song title
+        artist_name: Artist name
+        size: Thumbnail size, one of THUMBNAIL_SIZES
+
+    Returns:
+        bytes: Image bytes
+    """
+    return resolve_thumbnails([(song_title, artist_name)], size, **kwargs)[(str(song_title), str(artist_name))]
+
+
+def get_album_art(song_title, artist_name, **kwargs):
+    """
+    Album art URL for one song, falling back to a placeholder if not found.
+
+    Args:
+        song_title: Song title
+        artist_name: Artist name
+
+    Returns:
+        str: URL to album art image
+    """
+    artwork_url = resolve_album_art([(song_title, artist_name)], **kwargs).get((str(song_title), str(artist_name)))
+    return artwork_url or PLACEHOLDER_URL
+
+
+def prefetch_album_art(df, **kwargs):
+    """
+    Warm the album art cache and thumbnail store for every song in a DataFrame.
+    Intended to be called by ingestion so the app starts with a warm cache.
+
+    Args:
+        df: DataFrame with 'song_title' and 'artist_name' columns
+
+    Returns:
+        dict: {(song_title, artist_name): artwork_url or None}
+    """
+    songs = list(zip(df['song_title'], df['artist_name']))
+    start = time.perf_counter()
+    results = resolve_album_art(songs, **kwargs)
+    resolve_thumbnails(songs, THUMBNAIL_SIZES[0], **kwargs)
+
+    found = sum(1 for url in results.values() if url)
+    print(f"✓ Album art cached for {found}/{len(results)} songs ({time.perf_counter() - start:.1f}s)")
+
+    return results
+
+
+def main():
+    """Prefetch album art for the newest Billboard file in data/raw/."""
+    from storage import base_path_of, read_table
+
+    billboard_files = sorted({
+        base_path_of(f) for f in os.listdir('data/raw')
+        if (f.startswith('billboard_hot100_') or f.startswith('billboard_top10_'))
+        and f.endswith(('.csv', '.parquet'))
+    })
+    if not billboard_files:
+        print("No Billboard data found. Run scripts/ingest_billboard.py first.")
+        sys.exit(1)
+
+    df = read_table(f"data/raw/{billboard_files[-1]}", columns=['song_title', 'artist_name'])
+    prefetch_album_art(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Artist name normalization for matching Billboard and Grammy records.
+
+Patterns are compiled once and results are memoized in a bounded LRU cache
+(e.g. "Doja Cat feat. SZA" -> "doja cat"). An on-disk alias table
+(data/interim/artist_aliases.json) remembers only the fuzzy resolutions
+against the known Grammy artists, so repeated pipeline runs skip the fuzzy
+matching for names they have already seen. They are keyed by the candidate
+set and the normalization rules, and dropped when either changes.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import pandas as pd
+
+
+ALIAS_TABLE_PATH = 'data/interim/artist_aliases.json'
+
+# Minimum similarity ratio for a fuzzy match to be accepted
+FUZZY_CUTOFF = 0.9
+
+# Fuzzy candidates share the first or the last BLOCK_CHARS characters
+BLOCK_CHARS = 3
+
+_FEATURING_RE = re.compile(r'\s+(feat\.|featuring|feat|ft\.?|&)\s+.*')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Changes whenever the normalization rules do (stored resolutions are keyed on normalized names)
+NORMALIZER_RULES = '\n'.join([_FEATURING_RE.pattern, _PUNCTUATION_RE.pattern])
+
+# Loaded lazily, once per process
+_alias_table = None
+_alias_table_dirty = False
+
+
+def load_alias_table(path=ALIAS_TABLE_PATH):
+    """
+    Load the alias table from disk (once per process).
+
+    Args:
+        path: Path to the alias table JSON
+
+    Returns:
+        dict: {'resolved': {'fingerprint': ..., 'matches': {normalized: match}}}
+    """
+    global _alias_table
+
+    if _alias_table is None:
+        table = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    table = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Ignoring unreadable alias table {path}: {e}")
+                table = {}
+
+        table.pop('aliases', None)  # Exact normalizations are no longer stored
+        table.setdefault('resolved', {'fingerprint': None, 'matches': {}})
+        _alias_table = table
+
+    return _alias_table
+
+
+def save_alias_table(path=ALIAS_TABLE_PATH):
+    """
+    Persist the alias table if new entries were recorded this run.
+
+    Args:
+        path: Path to the alias table JSON
+
+    Returns:
+        bool: True if the file was written
+    """
+    global _alias_table_dirty
+
+    if _alias_table is None or not _alias_table_dirty:
+        return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_alias_table, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+    _alias_table_dirty = False
+    print(f"  ✓ Saved {len(_alias_table['resolved']['matches'])} fuzzy artist resolutions to {path}")
+
+    return True
+
+
+@lru_cache(maxsize=16384)
+def _normalize(name):
+    """Regex normalization of a raw artist string (memoized)."""
+    name = name.lower().strip()
+
+    # Remove featuring/feat/ft
+    name = _FEATURING_RE.sub('', name)
+
+    # Remove punctuation
+    name = _PUNCTUATION_RE.sub('', name)
+
+    # Remove extra whitespace
+    return ' '.join(name.split())
+
+
+def normalize_artist_name(name):
+    """
+    Normalize artist names for matching.
+    Handles featuring artists, case, punctuation.
+
+    Args:
+        name: Raw artist name
+
+    Returns:
+        str: Normalized name ("" for missing values)
+    """
+    if pd.isna(name):
+        return ""
+
+    return _normalize(str(name))
+
+
+class ArtistResolver:
+    """
+    Resolve artist names to a fixed set of known (normalized) artists.
+
+    Exact normalized matches are returned directly; otherwise the closest
+    candidate above FUZZY_CUTOFF is used. Fuzzy candidates come from a
+    blocking index (same leading or trailing characters, length within the
+    band a ratio above the cutoff allows), so each lookup compares against a
+    handful of names instead of every known artist. Fuzzy outcomes,
+    including misses, are stored in the alias table and reused for as long
+    as the candidate set and the normalization rules are unchanged.
+    """
+
+    def __init__(self, candidates, cutoff=FUZZY_CUTOFF):
+        self.candidates = sorted(c for c in set(candidates) if c)
+        self._candidate_set = set(self.candidates)
+        self.cutoff = cutoff
+
+        # Blocking index: candidates by their first and last characters
+        self._blocks = defaultdict(list)
+        for candidate in self.candidates:
+            self._blocks[('prefix', candidate[:BLOCK_CHARS])].append(candidate)
+            self._blocks[('suffix', candidate[-BLOCK_CHARS:])].append(candidate)
+
+        digest = hashlib.sha1('\n'.join(self.candidates).encode('utf-8'))
+        digest.update(str(cutoff).encode('utf-8'))
+        digest.update(NORMALIZER_RULES.encode('utf-8'))
+        self.fingerprint = digest.hexdigest()
+
+    def _matches(self):
+        global _alias_table_dirty
+
+        resolved = load_alias_table()['resolved']
+        if resolved.get('fingerprint') != self.fingerprint:
+            # Candidates or rules changed: earlier fuzzy outcomes no longer apply
+            resolved['fingerprint'] = self.fingerprint
+            resolved['matches'] = {}
+            _alias_table_dirty = True
+
+        return resolved['matches']
+
+    def fuzzy_candidates(self, normalized):
+        """
+        Known artists that could clear the cutoff against a name.
+
+        Args:
+            normalized: Normalized artist name
+
+        Returns:
+            list: Candidates sharing a block with the name, within the length band
+        """
+        # ratio = 2 * matches / (len(a) + len(b)) <= 2 * min / (len(a) + len(b)),
+        # so a shorter/longer length ratio below cutoff / (2 - cutoff) can't reach the cutoff
+        band = self.cutoff / (2 - self.cutoff)
+        length = len(normalized)
+
+        found = set()
+        for block in (('prefix', normalized[:BLOCK_CHARS]), ('suffix', normalized[-BLOCK_CHARS:])):
+            found.update(c for c in self._blocks.get(block, ())
+                         if min(len(c), length) >= band * max(len(c), length))
+        return sorted(found)
+
+    def resolve(self, name):
+        """
+        Resolve an artist name to a known artist.
+
+        Args:
+            name: Raw or normalized artist name
+
+        Returns:
+            str: Matching candidate, or None if there is no close match
+        """
+        global _alias_table_dirty
+
+        normalized = normalize_artist_name(name)
+        if not normalized:
+            return None
+        if normalized in self._candidate_set:
+            return normalized
+
+        matches = self._matches()
+        if normalized in matches:
+            return matches[normalized]
+
+        close = difflib.get_close_matches(normalized, self.fuzzy_candidates(normalized), n=1, cutoff=self.cutoff)
+        match = close[0] if close else None
+
+        matches[normalized] = match
+        _alias_table_dirty = True
+
+        return match
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Rolling-origin backtest over Grammy years.
+
+For every Grammy year Y in the training data, a model is trained on the
+labeled rows from years before Y and scored on year Y, so no fold ever sees
+its own year or a later one. Labeled rows without a Grammy year (e.g. the
+synthetic negatives) carry no time information; they are added to every
+fold's training set and never scored.
+
+Folds run in parallel in a process pool. Each fold's feature matrices are
+cached in data/interim/backtest_cache/<training data hash>/, so reruns on the
+same training data (e.g. comparing model families) skip feature building.
+
+Usage:
+    python scripts/backtest.py
+    python scripts/backtest.py --family hist_gb --params '{"learning_rate": 0.1, "max_depth": 3, "max_iter": 200}'
+
+Output:
+    data/processed/backtest.parquet (and backtest.csv): per-year metrics and timings
+    data/processed/backtest_summary.json: pooled metrics (shown in the app)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model_zoo import build_model
+from storage import table_path, write_table
+from train_baseline import TRAINING_COLUMNS, TRAINING_DATA_PATH, file_sha256, load_training_data, prepare_features
+
+
+BACKTEST_PATH = 'data/processed/backtest'
+BACKTEST_SUMMARY_PATH = 'data/processed/backtest_summary.json'
+BACKTEST_CACHE_DIR = 'data/interim/backtest_cache'
+
+# Baseline model (same settings as train_baseline.train_model)
+DEFAULT_FAMILY = 'logistic'
+DEFAULT_PARAMS = {'C': 1.0, 'penalty': 'l2'}
+
+
+def _write_npz(path, **arrays):
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+def build_fold_cache(df, cache_dir):
+    """
+    Build (or reuse) the per-year fold feature matrices.
+
+    Args:
+        df: Training data with TRAINING_COLUMNS and grammy_year
+        cache_dir: Cache directory for this training data version
+
+    Returns:
+        tuple: ({year: fold .npz path}, undated labeled row count)
+    """
+    X, y, feature_names, encoders, labeled_df = prepare_features(df)
+    years = labeled_df['grammy_year'].to_numpy(dtype=float)
+    dated = ~np.isnan(years)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    folds = {}
+    built = 0
+    for year in np.unique(years[dated]).astype(int):
+        path = os.path.join(cache_dir, f"fold_{year}.npz")
+        if not os.path.exists(path):
+            train = ~dated | (years < year)
+            test = years == year
+            _write_npz(path, X_train=X[train], y_train=y[train], X_test=X[test], y_test=y[test])
+            built += 1
+        folds[int(year)] = path
+
+    print(f"  ✓ {len(folds)} folds ({built} built, {len(folds) - built} cached) in {cache_dir}")
+
+    return folds, int((~dated).sum())
+
+
+def run_fold(year, path, family, params):
+    """
+    Train on the years before one Grammy year and score that year (runs in a worker process).
+
+    Args:
+        year: Test year
+        path: Fold .npz from build_fold_cache
+        family: Model family (see model_zoo.py)
+        params: Model hyperparameters
+
+    Returns:
+        dict: Fold metrics and timings, plus y_test/proba arrays for pooling
+    """
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    with np.load(path, allow_pickle=False) as fold:
+        X_train, y_train, X_test, y_test = (fold[name] for name in ('X_train', 'y_train', 'X_test', 'y_test'))
+
+    result = {
+        'year': year,
+        'train_rows': len(y_train),
+        'test_rows': len(y_test),
+        'test_positives': int(y_test.sum()),
+    }
+
+    if len(np.unique(y_train)) < 2:
+        result['skipped'] = 'training years have a single class'
+        return result
+
+    model = build_model(family, params)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    result['fit_time_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    proba = model.predict_proba(X_test)[:, 1]
+    result['score_time_s'] = time.perf_counter() - start
+
+    pred = (proba >= 0.5).astype(int)
+    result['accuracy'] = accuracy_score(y_test, pred)
+    result['precision'] = precision_score(y_test, pred, zero_division=0)
+    result['recall'] = recall_score(y_test, pred, zero_division=0)
+    result['f1'] = f1_score(y_test, pred, zero_division=0)
+    # AUC needs both classes in the test year
+    result['roc_auc'] = roc_auc_score(y_test, proba) if len(np.unique(y_test)) > 1 else np.nan
+    result['train_rows_per_s'] = len(y_train) / max(result['fit_time_s'], 1e-9)
+
+    result['y_test'] = y_test
+    result['proba'] = proba
+
+    return result
+
+
+def run_backtest(df, family=DEFAULT_FAMILY, params=None, max_workers=None, cache_root=BACKTEST_CACHE_DIR,
+                 data_version=None):
+    """
+    Rolling-origin backtest: one fold per Grammy year, run in parallel.
+
+    Args:
+        df: Training data with TRAINING_COLUMNS and grammy_year
+        family: Model family (see model_zoo.py)
+        params: Model hyperparameters (DEFAULT_PARAMS if None)
+        max_workers: Worker processes (None uses all cores)
+        cache_root: Fold cache root directory
+        data_version: Training data hash keying the cache (None disables reuse)
+
+    Returns:
+        tuple: (per-year metrics DataFrame, summary dict)
+    """
+    if params is None:
+        params = DEFAULT_PARAMS
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    start = time.perf_counter()
+
+    cache_dir = os.path.join(cache_root, data_version or 'current')
+    if data_version is None and os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+    # Only the current training data's folds are kept
+    if os.path.isdir(cache_root):
+        for name in os.listdir(cache_root):
+            if name != os.path.basename(cache_dir):
+                shutil.rmtree(os.path.join(cache_root, name), ignore_errors=True)
+
+    folds, undated = build_fold_cache(df, cache_dir)
+    if not folds:
+        raise ValueError("No labeled rows with a Grammy year to backtest")
+
+    print(f"\nBacktesting {family} {params} over {len(folds)} years ({max_workers} workers)...")
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(folds))) as executor:
+        futures = [executor.submit(run_fold, year, path, family, params) for year, path in sorted(folds.items())]
+        results = [future.result() for future in futures]
+
+    wall_time = time.perf_counter() - start
+
+    scored = [result for result in results if 'skipped' not in result]
+    y_all = np.concatenate([result.pop('y_test') for result in scored]) if scored else np.array([], dtype=int)
+    proba_all = np.concatenate([result.pop('proba') for result in scored]) if scored else np.array([])
+
+    table = pd.DataFrame(results)
+    summary = {
+        'family': family,
+        'params': params,
+        'years': [int(year) for year in sorted(folds)],
+        'scored_years': len(scored),
+        'scored_rows': int(len(y_all)),
+        'undated_training_rows': undated,
+        'wall_time_s': wall_time,
+        'fit_time_s': float(table['fit_time_s'].sum()) if 'fit_time_s' in table else 0.0,
+        'training_data_sha256': data_version,
+    }
+    summary.update(pooled_metrics(y_all, proba_all))
+    summary['train_rows_per_s'] = (float(table.loc[table['fit_time_s'].notna(), 'train_rows'].sum()) / summary['fit_time_s']
+                                   if summary['fit_time_s'] > 0 else None)
+
+    return table, summary
+
+
+def pooled_metrics(y, proba):
+    """
+    Metrics over the predictions of all folds together.
+
+    Args:
+        y: True labels
+        proba: Predicted probabilities
+
+    Returns:
+        dict: accuracy, precision, recall, f1, roc_auc (None when undefined)
+    """
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    if len(y) == 0:
+        return {'accuracy': None, 'precision': None, 'recall': None, 'f1': None, 'roc_auc': None}
+
+    pred = (proba >= 0.5).astype(int)
+    return {
+        'accuracy': float(accuracy_score(y, pred)),
+        'precision': float(precision_score(y, pred, zero_division=0)),
+        'recall': float(recall_score(y, pred, zero_division=0)),
+        'f1': float(f1_score(y, pred, zero_division=0)),
+        'roc_auc': float(roc_auc_score(y, proba)) if len(np.unique(y)) > 1 else None,
+    }
+
+
+def print_report(table, summary):
+    """Print the per-year metrics and timing report."""
+    print("\n" + "=" * 60)
+    print("BACKTEST (train on years < Y, score year Y)")
+    print("=" * 60)
+
+    print(f"\n  {'Year':<6} {'Train':>7} {'Test':>6} {'Pos':>5} {'Acc':>6} {'Prec':>6} {'Rec':>6} "
+          f"{'F1':>6} {'AUC':>6} {'Fit ms':>8}")
+    print("  " + "-" * 72)
+    for _, row in table.iterrows():
+        if pd.notna(row.get('skipped')):
+            print(f"  {row['year']:<6} {row['train_rows']:>7} {row['test_rows']:>6} {row['test_positives']:>5}  "
+                  f"skipped: {row['skipped']}")
+            continue
+        auc = f"{row['roc_auc']:.3f}" if pd.notna(row['roc_auc']) else 'n/a'
+        print(f"  {row['year']:<6} {row['train_rows']:>7} {row['test_rows']:>6} {row['test_positives']:>5} "
+              f"{row['accuracy']:>6.3f} {row['precision']:>6.3f} {row['recall']:>6.3f} {row['f1']:>6.3f} "
+              f"{auc:>6} {row['fit_time_s'] * 1000:>8.1f}")
+
+    def fmt(value):
+        return f"{value:.3f}" if value is not None else 'n/a'
+
+    print(f"\n📊 Pooled over {summary['scored_rows']} scored rows ({summary['scored_years']} years):")
+    print(f"  Accuracy:  {fmt(summary['accuracy'])}")
+    print(f"  Precision: {fmt(summary['precision'])}")
+    print(f"  Recall:    {fmt(summary['recall'])}")
+    print(f"  F1 Score:  {fmt(summary['f1'])}")
+    print(f"  ROC AUC:   {fmt(summary['roc_auc'])}")
+    if summary['roc_auc'] is None:
+        print("  ⚠️  Scored years have a single class: AUC is undefined")
+
+    print(f"\n⏱️  Timing:")
+    print(f"  Wall time:  {summary['wall_time_s']:.2f} s")
+    print(f"  Fit time:   {summary['fit_time_s']:.2f} s (all folds)")
+    if summary['train_rows_per_s']:
+        print(f"  Throughput: {summary['train_rows_per_s']:,.0f} training rows/s")
+    if summary['undated_training_rows']:
+        print(f"  ({summary['undated_training_rows']} labeled rows without a Grammy year are in every training fold)")
+
+
+def save_backtest(table, summary):
+    """
+    Save the per-year table and the pooled summary.
+
+    Args:
+        table: Per-year metrics
+        summary: Pooled metrics and timings
+
+    Returns:
+        str: Path to the per-year table
+    """
+    filename = write_table(table, BACKTEST_PATH)
+
+    os.makedirs(os.path.dirname(BACKTEST_SUMMARY_PATH), exist_ok=True)
+    tmp_path = f"{BACKTEST_SUMMARY_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp_path, BACKTEST_SUMMARY_PATH)
+
+    print(f"\n✓ Saved to {filename} and {BACKTEST_SUMMARY_PATH}")
+
+    return filename
+
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest over Grammy years")
+    parser.add_argument('--family', default=DEFAULT_FAMILY, help="Model family (see model_zoo.py)")
+    parser.add_argument('--params', type=json.loads, default=None, help="Model hyperparameters as JSON")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Backtest by Grammy Year")
+    print("=" * 60)
+    print()
+
+    df = load_training_data(columns=TRAINING_COLUMNS + ['grammy_year'])
+    data_version = file_sha256(table_path(TRAINING_DATA_PATH))[:16]
+
+    table, summary = run_backtest(df, args.family, args.params, args.workers, data_version=data_version)
+
+    print_report(table, summary)
+    save_backtest(table, summary)
+
+    return table, summary
+
+
+if __name__ == "__main__":
+    main()
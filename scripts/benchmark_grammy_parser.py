@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming Grammy page parser against the BeautifulSoup parsers
+it replaced.
+
+Runs both parsers over Grammy pages, checks they extract the same nominees,
+and prints the best time of several runs for each. By default the pages are
+the committed fixture for the layout (tests/fixtures/grammy_pages/<layout>/,
+the 66th Grammy Awards in Wikipedia's markup) plus a larger generated page,
+so results are reproducible from the repo alone.
+
+Usage:
+    python scripts/benchmark_grammy_parser.py --layout list
+    python scripts/benchmark_grammy_parser.py --layout table --synthetic-categories 400 --runs 5
+    python scripts/benchmark_grammy_parser.py --fixtures path/to/pages --layout list
+
+--fixtures replaces the defaults with the .html files in a directory (e.g.
+pages saved from the HTTP cache, or with `curl -o`).
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from grammy_parser import TABLE_CATEGORY_KEYWORDS, iter_nominees
+from scrape_grammy_history import TARGET_CATEGORIES
+
+
+PAGE_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'tests', 'fixtures', 'grammy_pages')
+
+
+def legacy_parse_list(html, categories):
+    """Previous scrape_grammy_year parser (BeautifulSoup, sibling walk per heading)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    nominees = []
+
+    for header in soup.find_all(['h3', 'h4']):
+        category_text = header.get_text().strip()
+
+        matched_category = None
+        for target in categories:
+            if target.lower() in category_text.lower():
+                matched_category = target
+                break
+
+        if not matched_category:
+            continue
+
+        next_elem = header.find_next_sibling()
+        while next_elem and next_elem.name not in ['h2', 'h3', 'h4']:
+            if next_elem.name == 'ul':
+                for li in next_elem.find_all('li'):
+                    text = li.get_text()
+                    match = re.search(r'"([^"]+)".*?(?:by|–|-)\s*([^()\n]+)', text)
+                    if match:
+                        is_winner = '✓' in text or li.find('b') is not None
+                        nominees.append((matched_category, match.group(1).strip(), match.group(2).strip(), is_winner))
+            next_elem = next_elem.find_next_sibling()
+
+    return nominees
+
+
+def legacy_parse_table(html):
+    """Previous scrape_wikipedia_grammy parser (BeautifulSoup, backwards heading search per table)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    nominees = []
+
+    for table in soup.find_all('table', {'class': 'wikitable'}):
+        prev_header = table.find_previous(['h2', 'h3', 'h4'])
+        if not prev_header:
+            continue
+
+        category_text = prev_header.get_text().strip()
+        if not any(keyword in category_text.lower() for keyword in TABLE_CATEGORY_KEYWORDS):
+            continue
+
+        for row in table.find_all('tr')[1:]:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                nominee_cell = cells[0].get_text().strip()
+                is_winner = bool(row.find('b') or '✓' in nominee_cell or row.get('style', '').find('background') != -1)
+                match = re.search(r'"([^"]+)".*?(?:by|–|-)\s*([^(\n]+)', nominee_cell)
+                if match:
+                    nominees.append((category_text, match.group(1).strip(), match.group(2).strip(), is_winner))
+
+    return nominees
+
+
+def synthetic_page(layout, n_categories, nominees_per_category=5, filler_paragraphs=20):
+    """
+    Generate a Wikipedia-like Grammy page.
+
+    Args:
+        layout: 'list' or 'table'
+        n_categories: Number of category sections
+        nominees_per_category: Nominees per category
+        filler_paragraphs: Paragraphs of unrelated prose per section
+
+    Returns:
+        str: HTML page
+    """
+    filler = ''.join(
+        f"<p>Paragraph {i} with <a href='/wiki/Link_{i}'>a link</a> and some prose.</p>"
+        for i in range(filler_paragraphs)
+    )
+
+    parts = ['<html><body><h2>Nominees and winners</h2>']
+    for i in range(n_categories):
+        category = TARGET_CATEGORIES[i % len(TARGET_CATEGORIES)]
+        parts.append(f'<h3>{category}</h3>{filler}')
+
+        if layout == 'list':
+            parts.append('<ul>')
+            for j in range(nominees_per_category):
+                nominee = f'"Song {i}-{j}" by Artist {i}-{j}'
+                parts.append(f'<li><b>{nominee}</b></li>' if j == 0 else f'<li>{nominee}</li>')
+            parts.append('</ul>')
+        else:
+            parts.append('<table class="wikitable"><tr><th>Nominee</th><th>Label</th></tr>')
+            for j in range(nominees_per_category):
+                nominee = f'"Song {i}-{j}" – Artist {i}-{j}'
+                cell = f'<b>{nominee}</b>' if j == 0 else nominee
+                parts.append(f'<tr><td>{cell}</td><td>Label {j}</td></tr>')
+            parts.append('</table>')
+    parts.append('</body></html>')
+
+    return ''.join(parts)
+
+
+def best_time(func, runs):
+    """Best wall time of several runs, and the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Main benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark the Grammy page parsers')
+    parser.add_argument('--fixtures', help='Directory of saved .html pages (replaces the default pages)')
+    parser.add_argument('--layout', choices=['list', 'table'], default='list',
+                        help='Page layout of the fixtures / synthetic page')
+    parser.add_argument('--synthetic-categories', type=int, default=200,
+                        help='Category sections in the generated page (no --fixtures; 0 skips it)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per parser (best is reported)')
+    args = parser.parse_args()
+
+    fixtures_dir = args.fixtures or os.path.join(PAGE_FIXTURES_DIR, args.layout)
+    paths = sorted(glob.glob(os.path.join(fixtures_dir, '*.html')))
+    if args.fixtures and not paths:
+        print(f"⚠️  No .html files in {args.fixtures}")
+        return 1
+
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not args.fixtures and args.synthetic_categories > 0:
+        pages.append(('synthetic', synthetic_page(args.layout, args.synthetic_categories).encode('utf-8')))
+
+    if args.layout == 'list':
+        legacy = lambda html: legacy_parse_list(html, TARGET_CATEGORIES)
+        streaming = lambda html: list(iter_nominees(html, 'list', TARGET_CATEGORIES))
+    else:
+        legacy = legacy_parse_table
+        streaming = lambda html: list(iter_nominees(html, 'table'))
+
+    print("=" * 60)
+    print(f"Grammy parser benchmark ({args.layout} layout, best of {args.runs})")
+    print("=" * 60)
+    print(f"{'page':<40} {'KB':>7} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}")
+
+    mismatches = 0
+    total_legacy = total_streaming = 0.0
+    for name, html in pages:
+        legacy_time, legacy_rows = best_time(lambda: legacy(html), args.runs)
+        streaming_time, streaming_rows = best_time(lambda: streaming(html), args.runs)
+        total_legacy += legacy_time
+        total_streaming += streaming_time
+
+        print(f"{name[:40]:<40} {len(html) / 1024:>7.0f} {legacy_time * 1000:>9.1f} "
+              f"{streaming_time * 1000:>9.1f} {legacy_time / max(streaming_time, 1e-9):>7.1f}x")
+
+        if sorted(legacy_rows) != sorted(streaming_rows):
+            mismatches += 1
+            print(f"  ⚠️  Output differs: {len(legacy_rows)} rows (bs4) vs {len(streaming_rows)} rows (lxml)")
+
+    print(f"\nTotal: {total_legacy * 1000:.1f} ms (bs4) vs {total_streaming * 1000:.1f} ms (lxml), "
+          f"{total_legacy / max(total_streaming, 1e-9):.1f}x")
+
+    if mismatches:
+        print(f"⚠️  {mismatches} page(s) with different output")
+        return 1
+
+    print("✓ Same nominees extracted from every page")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Benchmark the training pipeline on seeded synthetic data.
+
+Generates a Billboard chart history and a Grammy history of the requested
+size, writes them to a temporary data/ tree (the Billboard history both as
+the Billboard input and as a weekly chart archive), and runs the production
+entry points of prepare_training_data.py and train_baseline.py on them one
+at a time, recording wall time and peak memory (tracemalloc: Python and
+NumPy allocations, not Arrow's) for each:
+
+    load       read the Grammy table and build its event store
+    build      build_training_data_streaming: artist/song indexes, Grammy
+               history features, chart-archive negatives, trajectories and
+               labels, streamed --chunk-size rows at a time to the training table
+    encoding   load the training table, filter labeled rows, build the feature matrix
+    fit        train the baseline model
+    save       write the model pickle and bundle
+    score      score the current chart rows and write the predictions artifact
+
+Results are printed and, with --output, written as JSON (with the git
+commit and library versions) so runs can be compared across commits with
+--compare. Each size also reports the process's peak RSS so far (sizes run
+in the order given).
+
+Usage:
+    python scripts/benchmark_training.py --sizes 1k 100k --output bench.json
+    python scripts/benchmark_training.py --sizes 100k --compare bench.json
+    python scripts/benchmark_training.py --sizes 10m --no-memory
+
+Same seed and size give the same data, so timings are comparable. Inputs are
+generated and written a block of weeks at a time, and the build streams, so
+memory is bounded by the chunk size and the tables the pipeline itself loads
+whole (the Grammy table and, for training, the labeled rows).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from scrape_grammy_history import TARGET_CATEGORIES
+
+
+STAGES = ['load', 'build', 'encoding', 'fit', 'save', 'score']
+
+DEFAULT_SIZES = ['1k', '100k']
+DEFAULT_SEED = 42
+
+# Rows per chunk of the streamed build (prepare_training_data.py --chunk-size)
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Rows generated and written at a time (rounded to whole chart weeks)
+GENERATE_ROWS = 500_000
+
+GENRES = ['Pop', 'Rap', 'R&B', 'Rock', 'Country', 'Alternative']
+
+# Weekly charts span the Hot 100's history; sizes beyond 100 entries a week
+# put several charts' worth of entries in each week
+FIRST_CHART_DATE = pd.Timestamp('1958-08-09')
+LATEST_CHART_DATE = pd.Timestamp('2025-10-11')
+CHART_SIZE = 100
+
+# Weeks a song holds its chart slot (real Hot 100 runs last about three months)
+MIN_RUN_WEEKS = 4
+MAX_RUN_WEEKS = 30
+
+# Grammy years of the synthetic history
+FIRST_GRAMMY_YEAR = 1959
+LATEST_GRAMMY_YEAR = 2025
+
+# Artist names are spelled in these syllables (base-30 digits of the artist id),
+# so names vary from the first letter on, like real ones
+NAME_SYLLABLES = np.array(['ka', 'lo', 'mi', 'ra', 'ne', 'so', 'ta', 'vi', 'zu', 'be',
+                           'do', 'fa', 'gi', 'ha', 'jo', 'ku', 'le', 'ma', 'no', 'pe',
+                           'ri', 'sa', 'te', 'va', 'xo', 'yu', 'ar', 'el', 'in', 'os'], dtype=object)
+
+# Multiplier coprime to 30 (scatters ids over the 30^6 possible names)
+NAME_SCATTER = 500_000_003
+
+# Chart-only acts get ids from here on, so they never share a name with a Grammy artist
+CHART_ACT_OFFSET = 27_000_000
+
+
+def parse_size(size):
+    """
+    Parse a row count such as '1k', '100k' or '10m'.
+
+    Args:
+        size: Row count, optionally suffixed with k or m
+
+    Returns:
+        int: Number of rows
+    """
+    size = str(size).strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(size[-1:], 1)
+    return int(float(size.rstrip('km')) * multiplier)
+
+
+def chart_layout(n_rows):
+    """
+    Weekly chart layout of a chart history.
+
+    Args:
+        n_rows: Chart entries in the history
+
+    Returns:
+        tuple: (number of weeks, entries per week)
+    """
+    max_weeks = (LATEST_CHART_DATE - FIRST_CHART_DATE).days // 7 + 1
+    per_week = max(CHART_SIZE, -(-n_rows // max_weeks))
+    return -(-n_rows // per_week), per_week
+
+
+def _block_rng(seed, start):
+    """Generator for the rows from start on (the same block gives the same rows)."""
+    return np.random.default_rng([seed, start])
+
+
+def artist_names(ids):
+    """
+    Distinct synthetic artist names for integer ids, e.g. 'Kalo Mira'.
+
+    Args:
+        ids: Non-negative artist ids
+
+    Returns:
+        np.ndarray: Names (object), the same for the same id
+    """
+    base = len(NAME_SYLLABLES)
+
+    # Scatter consecutive ids over the name space (an invertible map mod 30^6,
+    # so names stay distinct) so neighbouring artists don't share a first name
+    ids = (np.asarray(ids, dtype=np.int64) * NAME_SCATTER) % base ** 6
+
+    # Six base-30 digits: two for the first name, four for the last
+    digits = [NAME_SYLLABLES[(ids // base ** power) % base] for power in range(5, -1, -1)]
+    first = pd.Series(digits[0] + digits[1]).str.capitalize()
+    last = pd.Series(digits[2] + digits[3] + digits[4] + digits[5]).str.capitalize()
+
+    return (first + ' ' + last).to_numpy(dtype=object)
+
+
+def synthetic_grammy(n_rows, seed=DEFAULT_SEED, start=0, stop=None):
+    """
+    Generate nominations start..stop of a Grammy history (GRAMMY_COLUMNS schema).
+
+    Args:
+        n_rows: Nominations in the whole history
+        seed: Random seed
+        start: First nomination to generate
+        stop: End of the block (None for the end of the history)
+
+    Returns:
+        pd.DataFrame: Grammy nominations in year order, about one winner in five
+    """
+    stop = n_rows if stop is None else min(stop, n_rows)
+    size = stop - start
+    rng = _block_rng(seed, start)
+    n_artists = min(max(50, n_rows // 20), 30_000)
+
+    categories = np.array(TARGET_CATEGORIES, dtype=object)
+
+    # Popular artists are nominated more often (Zipf-like)
+    artist_idx = np.minimum(rng.zipf(1.3, size) - 1, n_artists - 1)
+    song_idx = rng.integers(0, 20, size)
+    category_idx = rng.integers(0, len(categories), size)
+
+    song_titles = pd.Series(artist_idx).astype(str).radd('Song ') + '-' + pd.Series(song_idx).astype(str)
+    song_titles = song_titles.astype(object)
+    is_new_artist = categories[category_idx] == 'Best New Artist'
+    song_titles[is_new_artist] = None
+
+    # Nominations are spread evenly over the years, in order
+    n_years = LATEST_GRAMMY_YEAR - FIRST_GRAMMY_YEAR + 1
+    years = FIRST_GRAMMY_YEAR + np.arange(start, stop) * n_years // n_rows
+
+    return pd.DataFrame({
+        'year': years,
+        'category': categories[category_idx],
+        'song_title': song_titles,
+        'artist_name': artist_names(artist_idx),
+        'is_nominated': True,
+        'is_winner': rng.random(size) < 0.2,
+    })
+
+
+def _uniform(ids, salt):
+    """Uniform [0, 1) values depending only on (id, salt): splitmix64 of the id."""
+    x = np.asarray(ids, dtype=np.uint64) + np.uint64(salt * 0x9E3779B97F4A7C15 % 2 ** 64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / 2.0 ** 53
+
+
+def synthetic_billboard(n_rows, seed=DEFAULT_SEED, start=0, stop=None):
+    """
+    Generate entries start..stop of a Billboard chart history
+    (prepare_training_data.BILLBOARD_COLUMNS).
+
+    Each chart slot holds one song for a run of MIN_RUN_WEEKS-MAX_RUN_WEEKS
+    weeks, then the next song, so a song appears in consecutive weeks like
+    a real chart run (about one song per 17 entries). Half of the songs are
+    by artists also in the Grammy history (some with "feat." credits, so
+    they need normalizing); about one in twenty is a nominated song.
+
+    Args:
+        n_rows: Chart entries in the whole history
+        seed: Random seed
+        start: First entry to generate
+        stop: End of the block (None for the end of the history)
+
+    Returns:
+        pd.DataFrame: Chart entries in date order (see chart_layout), the
+            last week dated LATEST_CHART_DATE
+    """
+    stop = n_rows if stop is None else min(stop, n_rows)
+    n_grammy_artists = min(max(50, n_rows // 20), 30_000)
+    n_artists = min(max(50, n_rows // 30), 30_000)
+
+    n_weeks, per_week = chart_layout(n_rows)
+    position = np.arange(start, stop)
+    week, slot = position // per_week, position % per_week
+
+    # Runs in each slot: a fixed length per slot, staggered by a per-slot phase
+    run_weeks = MIN_RUN_WEEKS + (_uniform(slot, seed * 16) * (MAX_RUN_WEEKS - MIN_RUN_WEEKS + 1)).astype(np.int64)
+    run_week = week + (_uniform(slot, seed * 16 + 1) * run_weeks).astype(np.int64)
+    song = (run_week // run_weeks) * per_week + slot
+
+    # Everything else about a song depends only on its id
+    def draw(salt):
+        return _uniform(song, seed * 16 + salt)
+
+    shared = draw(2) < 0.5
+    artist_ids = np.where(
+        shared,
+        (draw(3) * n_grammy_artists).astype(np.int64),
+        CHART_ACT_OFFSET + (draw(3) * n_artists).astype(np.int64),
+    )
+    names = artist_names(artist_ids)
+    featuring = draw(4) < 0.15
+    names[featuring] = names[featuring] + ' Featuring Guest'
+
+    # Songs of shared artists sometimes reuse a Grammy title
+    nominated_title = shared & (draw(5) < 0.1)
+    grammy_titles = 'Song ' + pd.Series(artist_ids).astype(str) + '-' + pd.Series((draw(6) * 20).astype(np.int64)).astype(str)
+    titles = np.where(nominated_title, grammy_titles.to_numpy(dtype=object),
+                      ('Tune ' + pd.Series(song).astype(str)).to_numpy(dtype=object))
+
+    genres = np.array(GENRES, dtype=object)[(draw(7) * len(GENRES)).astype(np.int64)]
+
+    rank = slot % CHART_SIZE + 1
+    chart_dates = LATEST_CHART_DATE - pd.to_timedelta((n_weeks - 1 - week) * 7, unit='D')
+
+    return pd.DataFrame({
+        'song_title': titles,
+        'artist_name': names,
+        'peak_position': rank.astype(float),
+        'weeks_on_chart': (run_week % run_weeks + 1).astype(float),
+        'genre': np.where(draw(8) < 0.8, genres, None),
+        'chart_date': chart_dates.strftime('%Y-%m-%d'),
+        'current_rank': rank,
+    })
+
+
+def write_inputs(n_rows, seed=DEFAULT_SEED):
+    """
+    Write the synthetic inputs into the data/ tree of the working directory.
+
+    The Grammy history goes to the Grammy table, and the chart history both
+    to a Billboard input file and to the hot-100 chart archive, a block of
+    weeks at a time.
+
+    Args:
+        n_rows: Rows in each of the Billboard and Grammy inputs
+        seed: Random seed
+    """
+    import prepare_training_data as prep
+    from chart_archive import write_partition
+    from storage import TableWriter
+
+    with TableWriter(prep.GRAMMY_HISTORY_PATH) as writer:
+        for start in range(0, n_rows, GENERATE_ROWS):
+            writer.write(synthetic_grammy(n_rows, seed, start, start + GENERATE_ROWS))
+
+    per_week = chart_layout(n_rows)[1]
+    block = max(1, GENERATE_ROWS // per_week) * per_week
+    with TableWriter(f"data/raw/billboard_hot100_{LATEST_CHART_DATE:%Y-%m-%d}") as writer:
+        for start in range(0, n_rows, block):
+            chart = synthetic_billboard(n_rows, seed, start, start + block)
+            writer.write(chart)
+            for chart_date, week in chart.groupby('chart_date', sort=False):
+                write_partition(week.drop(columns='chart_date'), chart_date)
+
+
+class StageTimer:
+    """Wall time and peak traced memory of each pipeline stage."""
+
+    def __init__(self, track_memory=True):
+        self.track_memory = track_memory
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+
+        # Pipeline functions print progress; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+
+        result = {'seconds': time.perf_counter() - start}
+        if self.track_memory:
+            result['peak_mb'] = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+        self.stages[name] = result
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_pipeline(n_rows, seed=DEFAULT_SEED, track_memory=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run every stage on synthetic data of one size.
+
+    Args:
+        n_rows: Rows in each of the Billboard and Grammy inputs
+        seed: Random seed
+        track_memory: Record peak memory per stage (tracemalloc slows the run)
+        chunk_size: Rows per chunk of the streamed build
+
+    Returns:
+        dict: rows, per-stage seconds/peak_mb, total_seconds, dataset sizes, peak_rss_mb
+    """
+    import artist_normalizer
+    import entity_resolution
+    import prepare_training_data as prep
+    import train_baseline
+
+    # Import scikit-learn up front so its import time isn't charged to a stage
+    import sklearn.linear_model
+    import sklearn.model_selection
+    import sklearn.preprocessing
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            write_inputs(n_rows, seed)
+
+            # Start cold: no alias table or memoized normalizations from an earlier size
+            artist_normalizer._alias_table = None
+            artist_normalizer._normalize.cache_clear()
+            entity_resolution._normalize_title.cache_clear()
+
+            timer = StageTimer(track_memory)
+            if track_memory:
+                tracemalloc.start()
+
+            with timer.stage('load'):
+                grammy_df = prep.load_grammy_data()
+                events = prep.load_grammy_events(grammy_df)
+
+            with timer.stage('build'):
+                prep.build_training_data_streaming(grammy_df, events, chunk_size)
+                prep.save_alias_table()
+            del grammy_df, events
+
+            with timer.stage('encoding'):
+                training_df = train_baseline.load_training_data()
+                X, y, feature_names, encoders, _ = train_baseline.prepare_features(training_df)
+            training_rows = len(training_df)
+            del training_df
+
+            with timer.stage('fit'):
+                model = train_baseline.train_model(X, y)[0]
+
+            with timer.stage('save'):
+                model_package = train_baseline.save_model(model, encoders, feature_names)[1]
+
+            with timer.stage('score'):
+                predictions_df = train_baseline.predict_current_billboard(model_package)
+                if predictions_df is not None:
+                    train_baseline.save_predictions(predictions_df, model_package)
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            os.chdir(cwd)
+
+    return {
+        'rows': n_rows,
+        'chunk_size': chunk_size,
+        'training_rows': training_rows,
+        'labeled_rows': len(y),
+        'stages': timer.stages,
+        'total_seconds': sum(stage['seconds'] for stage in timer.stages.values()),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def environment():
+    """Git commit and library versions for the JSON report."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import sklearn
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def print_results(result, baseline=None):
+    """Print one size's stage table, with ratios against a baseline run if given."""
+    print(f"\n{result['rows']:,} rows ({result['training_rows']:,} training rows, {result['labeled_rows']:,} labeled)")
+    header = f"  {'stage':<10} {'seconds':>9} {'peak MB':>9}"
+    if baseline:
+        header += f" {'vs base':>9}"
+    print(header)
+
+    for name in STAGES:
+        stage = result['stages'][name]
+        peak = f"{stage['peak_mb']:>9.1f}" if 'peak_mb' in stage else f"{'-':>9}"
+        line = f"  {name:<10} {stage['seconds']:>9.3f} {peak}"
+        if baseline and name in baseline['stages']:
+            line += f" {stage['seconds'] / max(baseline['stages'][name]['seconds'], 1e-9):>8.2f}x"
+        print(line)
+    print(f"  {'total':<10} {result['total_seconds']:>9.3f}")
+    if result.get('peak_rss_mb'):
+        print(f"  peak RSS so far: {result['peak_rss_mb']:,.0f} MB")
+
+
+def main():
+    """Main benchmark."""
+    parser = argparse.ArgumentParser(description='Benchmark the training pipeline on synthetic data')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help='Input sizes (e.g. 1k 100k 10m)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Random seed for the generators')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Rows per chunk of the streamed build')
+    parser.add_argument('--no-memory', action='store_true', help='Skip tracemalloc (faster, no peak memory)')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = {result['rows']: result for result in json.load(f)['results']}
+
+    print("=" * 60)
+    print(f"Training pipeline benchmark (seed {args.seed})")
+    print("=" * 60)
+
+    results = []
+    for size in args.sizes:
+        result = run_pipeline(parse_size(size), seed=args.seed, track_memory=not args.no_memory,
+                              chunk_size=args.chunk_size)
+        print_results(result, baseline.get(result['rows']))
+        results.append(result)
+
+    if args.output:
+        report = {'environment': environment(), 'seed': args.seed, 'results': results}
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
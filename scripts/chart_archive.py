@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Historical Billboard chart archive with incremental weekly ingestion.
+
+Weekly charts are stored one partition per chart date:
+    data/raw/charts/<chart>/<YYYY-MM-DD>.parquet
+
+Each run walks back from the latest chart and requests only weeks that are
+not archived yet: new weeks at the top, any holes left by an interrupted run,
+then the backfill below the oldest archived week. The checkpoint
+(data/raw/charts/<chart>/_checkpoint.json) records dates known to have no
+chart and whether the backfill has reached the start of the chart, so those
+are never requested again. Partitions are written atomically and the
+checkpoint is saved after each week, so an interrupted run resumes cleanly.
+
+Entries of the genre charts (pop-songs, rap-song, ...) are stored with that
+chart's genre, so archived songs get a genre by chart membership
+(negative_sampling.membership_genres), as in ingest_billboard.
+
+Weeks are walked via ChartData.previousDate. Current billboard.py releases no
+longer populate it, so the walk falls back to stepping back seven days
+(Billboard rounds a date up to the nearest published chart).
+
+Charts can be replayed from a fixtures directory instead of billboard.com:
+    <fixtures>/<chart>/<YYYY-MM-DD>.json   (ChartData.json() output)
+    <fixtures>/<chart>/<YYYY-MM-DD>.html   (saved chart page)
+and a live run can record such fixtures with --record-fixtures.
+
+Usage:
+    python scripts/chart_archive.py                        # catch up + backfill
+    python scripts/chart_archive.py --since 2015-01-01 --max-weeks 200
+    python scripts/chart_archive.py --fixtures tests/fixtures/charts
+"""
+
+import argparse
+import json
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from http_fetch import HostRateLimiter
+from storage import read_table, write_table
+
+# billboard.py (and ingest_billboard) are imported when charts are first
+# fetched, so reading the archive back needs only pandas
+
+
+ARCHIVE_DIR = 'data/raw/charts'
+CHECKPOINT_FILE = '_checkpoint.json'
+DEFAULT_CHART = 'hot-100'
+
+BILLBOARD_HOST = 'www.billboard.com'
+
+# Seconds between live requests to billboard.com
+REQUEST_DELAY = 1.0
+
+# Consecutive missing weeks tolerated before the backfill is considered
+# to have reached the start of the chart's history
+MAX_GAP_WEEKS = 4
+
+
+class BillboardSource:
+    """Fetches charts from billboard.com via billboard.py (safe to share between threads)."""
+
+    def __init__(self, delay=REQUEST_DELAY, record_dir=None):
+        self.limiter = HostRateLimiter(delay)
+        self.record_dir = record_dir
+
+    def fetch(self, chart_name, chart_date=None):
+        import billboard
+
+        self.limiter.wait(BILLBOARD_HOST)
+        chart = billboard.ChartData(chart_name, date=chart_date)
+
+        if self.record_dir and chart.date and len(chart) > 0:
+            directory = os.path.join(self.record_dir, chart_name)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"{chart.date}.json"), 'w', encoding='utf-8') as f:
+                f.write(chart.json())
+
+        return chart
+
+
+class FixtureChartSource:
+    """
+    Replays charts saved in a fixtures directory.
+
+    Mirrors billboard.com's behaviour: no date means the newest chart, and a
+    date without a chart rounds up to the next available one (an empty chart
+    if there is none).
+    """
+
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = fixtures_dir
+
+    def _files(self, chart_name):
+        directory = os.path.join(self.fixtures_dir, chart_name)
+        if not os.path.isdir(directory):
+            return {}
+
+        files = {}
+        for filename in os.listdir(directory):
+            stem, ext = os.path.splitext(filename)
+            if ext in ('.json', '.html'):
+                files.setdefault(stem, os.path.join(directory, filename))
+        return files
+
+    def fetch(self, chart_name, chart_date=None):
+        import billboard
+
+        files = self._files(chart_name)
+        dates = sorted(d for d in files if chart_date is None or d >= chart_date)
+
+        chart = billboard.ChartData(chart_name, date=chart_date, fetch=False)
+        if not dates:
+            chart.previousDate = None
+            return chart
+
+        found = dates[-1] if chart_date is None else dates[0]
+        path = files[found]
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if path.endswith('.json'):
+            data = json.loads(content)
+            entry_fields = ('title', 'artist', 'image', 'peakPos', 'lastPos', 'weeks', 'rank', 'isNew')
+            chart.entries = [
+                billboard.ChartEntry(**{field: entry.get(field) for field in entry_fields})
+                for entry in data.get('entries', [])
+            ]
+            chart.title = data.get('title', '')
+            chart.date = data.get('date') or found
+            chart.previousDate = data.get('previousDate')
+        else:
+            from bs4 import BeautifulSoup
+
+            # _parsePage reads the date from the page; it must be set
+            # beforehand for peak/last/weeks to be parsed
+            chart.date = found
+            chart._parsePage(BeautifulSoup(content, 'html.parser'))
+
+        return chart
+
+
+def chart_dir(chart_name=DEFAULT_CHART, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, chart_name)
+
+
+def archived_dates(chart_name=DEFAULT_CHART, archive_dir=ARCHIVE_DIR):
+    """Sorted chart dates (YYYY-MM-DD) already in the archive."""
+    directory = chart_dir(chart_name, archive_dir)
+    if not os.path.isdir(directory):
+        return []
+
+    return sorted(f[:-len('.parquet')] for f in os.listdir(directory)
+                  if f.endswith('.parquet') and not f.startswith(('_', '.')))
+
+
+def load_checkpoint(chart_name=DEFAULT_CHART, archive_dir=ARCHIVE_DIR):
+    """Backfill state: {'no_chart_dates': [...], 'backfill_complete': bool, ...}."""
+    path = os.path.join(chart_dir(chart_name, archive_dir), CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {'no_chart_dates': [], 'backfill_complete': False}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint, chart_name=DEFAULT_CHART, archive_dir=ARCHIVE_DIR):
+    """Write the checkpoint atomically."""
+    directory = chart_dir(chart_name, archive_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def write_partition(df, chart_date, chart_name=DEFAULT_CHART, archive_dir=ARCHIVE_DIR):
+    """
+    Store one week of a chart (replacing any existing partition for that date).
+
+    Args:
+        df: Chart entries in the ingest_billboard schema
+        chart_date: Chart date (YYYY-MM-DD)
+        chart_name: Billboard chart name
+        archive_dir: Archive root
+
+    Returns:
+        str: Path to the partition
+    """
+    df = df.copy()
+    df['chart_date'] = chart_date
+    df = df.drop_duplicates(subset=['song_title', 'artist_name'], keep='first')
+
+    directory = chart_dir(chart_name, archive_dir)
+    os.makedirs(directory, exist_ok=True)
+
+    # Write under a temporary name, then rename, so readers never see a partial week
+    tmp_base = os.path.join(directory, f".{chart_date}.tmp")
+    tmp_path = write_table(df, tmp_base, csv=False)
+    path = os.path.join(directory, f"{chart_date}.parquet")
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def load_chart_archive(chart_name=DEFAULT_CHART, columns=None, since=None, until=None, archive_dir=ARCHIVE_DIR):
+    """
+    Load archived weeks as one DataFrame.
+
+    Args:
+        chart_name: Billboard chart name
+        columns: Columns to read (chart_date is always included)
+        since: First chart date to include (YYYY-MM-DD)
+        until: Last chart date to include (YYYY-MM-DD)
+        archive_dir: Archive root
+
+    Returns:
+        pd.DataFrame: Chart entries ordered by chart date, then rank
+    """
+    if columns is not None and 'chart_date' not in columns:
+        columns = list(columns) + ['chart_date']
+
+    weeks = [
+        read_table(os.path.join(chart_dir(chart_name, archive_dir), chart_date), columns=columns)
+        for chart_date in archived_dates(chart_name, archive_dir)
+        if (since is None or chart_date >= since) and (until is None or chart_date <= until)
+    ]
+    if not weeks:
+        return pd.DataFrame(columns=columns or [])
+
+    return pd.concat(weeks, ignore_index=True)
+
+
+def _previous_date(chart_date, chart=None):
+    """Date of the week before chart_date (ChartData.previousDate when set)."""
+    if chart is not None and getattr(chart, 'previousDate', None):
+        return chart.previousDate
+    return (date.fromisoformat(chart_date) - timedelta(days=7)).isoformat()
+
+
+def update_archive(chart_name=DEFAULT_CHART, source=None, since=None, max_weeks=None, archive_dir=ARCHIVE_DIR):
+    """
+    Fetch and store every week missing from the archive.
+
+    Walks back from the latest chart. Archived weeks, and dates the
+    checkpoint records as having no chart, are stepped over without a
+    request. The walk stops at `since`, after `max_weeks` requests, or at the
+    start of the chart's history (MAX_GAP_WEEKS empty weeks in a row).
+
+    Args:
+        chart_name: Billboard chart name
+        source: Chart source (BillboardSource or FixtureChartSource)
+        since: Oldest chart date to backfill to (None: start of the chart)
+        max_weeks: Maximum number of charts to request in this run
+        archive_dir: Archive root
+
+    Returns:
+        list: Chart dates added in this run
+    """
+    from ingest_billboard import archive_entries
+
+    source = source or BillboardSource()
+    have = set(archived_dates(chart_name, archive_dir))
+    checkpoint = load_checkpoint(chart_name, archive_dir)
+    no_chart = set(checkpoint.get('no_chart_dates', []))
+    added = []
+    fetches = 0
+
+    def store(chart):
+        df = archive_entries(chart_name, chart)
+        write_partition(df, chart.date, chart_name, archive_dir)
+        have.add(chart.date)
+        added.append(chart.date)
+        print(f"  ✓ {chart.date}: {len(df)} entries")
+
+    def save():
+        checkpoint['no_chart_dates'] = sorted(no_chart)
+        checkpoint['weeks'] = len(have)
+        checkpoint['oldest_date'] = min(have) if have else None
+        checkpoint['newest_date'] = max(have) if have else None
+        save_checkpoint(checkpoint, chart_name, archive_dir)
+
+    print(f"Updating {chart_name} archive ({len(have)} weeks stored)...")
+    chart = source.fetch(chart_name)
+    fetches += 1
+    if not chart.date or len(chart) == 0:
+        print(f"  ⚠️  No current {chart_name} chart returned")
+        return added
+
+    if chart.date not in have and (since is None or chart.date >= since):
+        store(chart)
+        save()
+    next_date = _previous_date(chart.date, chart)
+
+    gap = 0
+    while since is None or next_date >= since:
+        if next_date in have or next_date in no_chart:
+            next_date = _previous_date(next_date)
+            continue
+        if checkpoint.get('backfill_complete') and have and next_date < min(have):
+            break
+        if max_weeks is not None and fetches >= max_weeks:
+            break
+
+        chart = source.fetch(chart_name, next_date)
+        fetches += 1
+
+        if chart.date and len(chart) > 0 and chart.date not in have:
+            store(chart)
+            gap = 0
+            next_date = _previous_date(chart.date, chart)
+        else:
+            # No chart for this week (it rounded up to a week we have, or
+            # nothing came back): remember that and step further back
+            no_chart.add(next_date)
+            gap += 1
+            if gap >= MAX_GAP_WEEKS:
+                if have and next_date < min(have):
+                    checkpoint['backfill_complete'] = True
+                    print(f"  ✓ Reached the start of {chart_name}")
+                break
+            next_date = _previous_date(next_date)
+
+        save()
+
+    save()
+
+    return added
+
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description="Backfill and update the Billboard chart archive")
+    parser.add_argument('--chart', default=DEFAULT_CHART, help="Billboard chart name")
+    parser.add_argument('--since', help="Oldest chart date to backfill to (YYYY-MM-DD)")
+    parser.add_argument('--max-weeks', type=int, help="Maximum charts to request in this run")
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--fixtures', help="Replay charts from this fixtures directory")
+    parser.add_argument('--record-fixtures', help="Save fetched charts as JSON fixtures here")
+    parser.add_argument('--delay', type=float, default=REQUEST_DELAY, help="Seconds between requests")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Billboard Chart Archive: {args.chart}")
+    print("=" * 60)
+
+    if args.fixtures:
+        source = FixtureChartSource(args.fixtures)
+    else:
+        source = BillboardSource(delay=args.delay, record_dir=args.record_fixtures)
+
+    added = update_archive(args.chart, source, since=args.since, max_weeks=args.max_weeks,
+                           archive_dir=args.archive_dir)
+    dates = archived_dates(args.chart, args.archive_dir)
+
+    print()
+    print("=" * 60)
+    print(f"✓ Complete: {len(added)} new weeks")
+    if dates:
+        print(f"  Archive: {len(dates)} weeks ({dates[0]} to {dates[-1]})")
+    print(f"  Output: {chart_dir(args.chart, args.archive_dir)}/")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the app and script entry points.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`,
+reads its cumulative import time, and fails if any exceeds its budget. The
+best of several runs is used to smooth out noise from disk caches.
+
+Usage:
+    python scripts/check_import_budget.py
+    python scripts/check_import_budget.py --runs 5 --scale 1.5
+
+Exit code is 1 if any entry point is over budget. The same check runs under
+pytest (tests/test_import_budget.py; set IMPORT_BUDGET_SCALE on slow machines).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> (directory it lives in, budget in milliseconds)
+IMPORT_BUDGETS_MS = {
+    # Streamlit UI: streamlit + pandas; no sklearn, requests or Pillow
+    'main': ('app', 1200),
+    # HTTP API: starlette + pandas; no sklearn
+    'api': ('app', 900),
+    # Shared scorer: numpy + pandas only
+    'predictor': ('scripts', 800),
+    # Training: sklearn is deferred until a model is actually fit/evaluated
+    'train_baseline': ('scripts', 900),
+    'prepare_training_data': ('scripts', 800),
+    'ingest_billboard': ('scripts', 1200),
+}
+
+# Modules that must not be imported just by loading an entry point
+FORBIDDEN_IMPORTS = {
+    'main': ['sklearn', 'PIL', 'requests'],
+    'api': ['sklearn', 'PIL'],
+    'predictor': ['sklearn'],
+    'train_baseline': ['sklearn'],
+}
+
+
+def measure_import(module, directory):
+    """
+    Import a module in a fresh interpreter under -X importtime.
+
+    Args:
+        module: Module name
+        directory: Directory (relative to the repo root) holding the module
+
+    Returns:
+        tuple: (cumulative import time in ms, set of top-level packages imported)
+    """
+    path_setup = f"import sys; sys.path[:0] = [{os.path.join(ROOT_DIR, directory)!r}, {os.path.join(ROOT_DIR, 'scripts')!r}]"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"{path_setup}; import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+
+        name = parts[2].rstrip()
+        imported.add(name.strip().split('.')[0])
+        if name.strip() == module and name == f" {module}":
+            cumulative_us = int(parts[1])
+
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry found for {module}")
+
+    return cumulative_us / 1000, imported
+
+
+def check_module(module, runs=3, scale=1.0):
+    """
+    Measure one entry point against its budget and forbidden imports.
+
+    Args:
+        module: Module name (a key of IMPORT_BUDGETS_MS)
+        runs: Runs to take the best time of
+        scale: Budget multiplier
+
+    Returns:
+        tuple: (best import time in ms, budget in ms, forbidden modules imported)
+    """
+    directory, budget_ms = IMPORT_BUDGETS_MS[module]
+    measured = [measure_import(module, directory) for _ in range(runs)]
+    best_ms = min(ms for ms, _ in measured)
+    imported = measured[0][1]
+
+    forbidden = [name for name in FORBIDDEN_IMPORTS.get(module, []) if name in imported]
+    return best_ms, budget_ms * scale, forbidden
+
+
+def main():
+    """Main execution."""
+    parser = argparse.ArgumentParser(description="Check import-time budgets")
+    parser.add_argument('--runs', type=int, default=3, help="Runs per module (best is kept)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiply all budgets (e.g., for slow CI)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Import-Time Budget Check")
+    print("=" * 60)
+
+    failures = []
+    for module in IMPORT_BUDGETS_MS:
+        best_ms, budget_ms, forbidden = check_module(module, args.runs, args.scale)
+        ok = best_ms <= budget_ms and not forbidden
+        status = "✓" if ok else "✗"
+        print(f"  {status} {module:<24} {best_ms:7.0f} ms  (budget {budget_ms:.0f} ms)")
+
+        if forbidden:
+            print(f"    ⚠️  Imports {', '.join(forbidden)} at startup")
+        if not ok:
+            failures.append(module)
+
+    print()
+    if failures:
+        print(f"✗ Over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+    print("✓ All entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
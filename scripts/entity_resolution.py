@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Entity resolution between Billboard chart entries and Grammy nominations.
+
+Songs are keyed by (normalized artist, normalized title), hashed to a uint64
+so the join itself is a plain integer merge. Keys with no exact match are
+resolved fuzzily, once per distinct key, against candidates from a blocking
+index (Grammy songs by the same normalized artist, or with the same
+normalized title), so each lookup compares against a handful of songs
+instead of all of them.
+Chart entries are then labeled, in one vectorized join, with the matched
+song's Grammy outcome at the ceremony whose eligibility window their chart
+week falls in.
+
+Usage:
+    index = GrammySongIndex(grammy_df)
+    labeled = index.label(chart_df, latest_grammy_year=grammy_df['year'].max())
+"""
+
+import difflib
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from artist_normalizer import normalize_artist_name
+
+
+# Fuzzy match thresholds (difflib ratio) for titles and artists
+TITLE_CUTOFF = 0.9
+ARTIST_CUTOFF = 0.85
+
+# Grammy eligibility years run roughly October to September: a song charting
+# in October 2023 - September 2024 competes at the 2025 ceremony
+ELIGIBILITY_START_MONTH = 10
+
+_TITLE_BRACKETS_RE = re.compile(r'\s*[\(\[][^\)\]]*[\)\]]')  # (feat. X), [Remix]
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=65536)
+def _normalize_title(title):
+    title = _TITLE_BRACKETS_RE.sub('', title.lower())
+    title = _PUNCTUATION_RE.sub('', title)
+    return ' '.join(title.split())
+
+
+def normalize_title(title):
+    """
+    Normalize a song title for matching (case, bracketed credits, punctuation).
+
+    Args:
+        title: Raw song title
+
+    Returns:
+        str: Normalized title ("" for missing values)
+    """
+    if pd.isna(title):
+        return ""
+    return _normalize_title(str(title))
+
+
+def _similarity(matcher, candidate, cutoff):
+    """difflib ratio of candidate against the matcher's seq2, or None below cutoff."""
+    matcher.set_seq1(candidate)
+    if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+        return None
+    ratio = matcher.ratio()
+    return ratio if ratio >= cutoff else None
+
+
+def _map_unique(values, func):
+    """Apply func once per distinct value of a Series."""
+    unique_values = values.dropna().unique()
+    return values.map(dict(zip(unique_values, map(func, unique_values)))).fillna('')
+
+
+def song_keys(df, artist_col='artist_name', title_col='song_title'):
+    """
+    Normalized and hashed song keys for a table of songs.
+
+    Args:
+        df: DataFrame with artist and title columns
+        artist_col: Artist column
+        title_col: Title column
+
+    Returns:
+        pd.DataFrame: artist_key, title_key and song_hash (uint64), on df's index
+    """
+    artist_keys = _map_unique(df[artist_col].astype(object), normalize_artist_name)
+    title_keys = _map_unique(df[title_col].astype(object), normalize_title)
+
+    combined = (artist_keys + '\x1f' + title_keys).to_numpy(dtype=object)
+
+    return pd.DataFrame({
+        'artist_key': artist_keys,
+        'title_key': title_keys,
+        'song_hash': pd.util.hash_array(combined),
+    }, index=df.index)
+
+
+def grammy_year_for_chart_date(chart_dates):
+    """
+    Grammy ceremony year a chart week falls under.
+
+    Args:
+        chart_dates: Chart dates (strings or datetimes)
+
+    Returns:
+        pd.Series: Ceremony years (nullable Int64; missing for unparseable dates)
+    """
+    dates = pd.to_datetime(pd.Series(chart_dates), errors='coerce')
+    offset = np.where(dates.dt.month >= ELIGIBILITY_START_MONTH, 2, 1)
+    return (dates.dt.year + offset).astype('Int64')
+
+
+class GrammySongIndex:
+    """
+    Grammy-nominated songs keyed by hashed (artist, title), with a blocking
+    index for fuzzy candidates.
+
+    Each song's outcome aggregates all its nominations: number of
+    nominations, whether any won, and the first nomination's year and
+    category. yearly_outcomes holds the same per ceremony year.
+    """
+
+    def __init__(self, grammy_df):
+        songs = grammy_df[grammy_df['song_title'].notna()]
+        songs = songs[(songs['is_nominated'] == True).fillna(False)]
+        keys = song_keys(songs)
+
+        nominations = pd.DataFrame({
+            'song_hash': keys['song_hash'],
+            'artist_key': keys['artist_key'],
+            'title_key': keys['title_key'],
+            'year': songs['year'],
+            'category': songs['category'],
+            'is_winner': (songs['is_winner'] == True).fillna(False),
+        })
+        nominations = nominations[(nominations['artist_key'] != '') & (nominations['title_key'] != '')]
+        nominations = nominations.sort_values(['year', 'category'], kind='stable')
+
+        self.outcomes = nominations.groupby('song_hash', sort=False).agg(
+            artist_key=('artist_key', 'first'),
+            title_key=('title_key', 'first'),
+            grammy_nominations=('year', 'size'),
+            is_winner=('is_winner', 'any'),
+            grammy_year=('year', 'first'),
+            grammy_category=('category', 'first'),
+        )
+
+        # Outcome per song and ceremony, for labeling chart weeks in that ceremony's window
+        self.yearly_outcomes = nominations.groupby(['song_hash', 'year'], sort=False).agg(
+            grammy_nominations=('year', 'size'),
+            is_winner=('is_winner', 'any'),
+            grammy_category=('category', 'first'),
+        )
+
+        # Blocking index: candidates share the artist or the title
+        self._blocks = defaultdict(list)
+        for song_hash, artist_key, title_key in zip(
+                self.outcomes.index, self.outcomes['artist_key'], self.outcomes['title_key']):
+            candidate = (song_hash, artist_key, title_key)
+            self._blocks[('artist', artist_key)].append(candidate)
+            self._blocks[('title', title_key)].append(candidate)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def candidates(self, artist_key, title_key):
+        """
+        Grammy songs sharing a block with a key.
+
+        Args:
+            artist_key: Normalized artist
+            title_key: Normalized title
+
+        Returns:
+            list: (song_hash, artist_key, title_key) candidates, without duplicates
+        """
+        found = {}
+        for block in (('artist', artist_key), ('title', title_key)):
+            for candidate in self._blocks.get(block, ()):
+                found[candidate[0]] = candidate
+        return list(found.values())
+
+    def fuzzy_match(self, artist_key, title_key):
+        """
+        Best fuzzy match for a song key among its block candidates.
+
+        Args:
+            artist_key: Normalized artist
+            title_key: Normalized title
+
+        Returns:
+            int: Matched song hash, or None if no candidate clears both cutoffs
+        """
+        # The query side is set once as seq2 (difflib caches its analysis);
+        # the cheap upper bounds reject most candidates before ratio()
+        title_matcher = difflib.SequenceMatcher(None, b=title_key)
+        artist_matcher = difflib.SequenceMatcher(None, b=artist_key)
+
+        best_hash, best_score = None, 0.0
+        for song_hash, candidate_artist, candidate_title in self.candidates(artist_key, title_key):
+            title_score = _similarity(title_matcher, candidate_title, TITLE_CUTOFF)
+            if title_score is None:
+                continue
+            artist_score = _similarity(artist_matcher, candidate_artist, ARTIST_CUTOFF)
+            if artist_score is None:
+                continue
+            if title_score + artist_score > best_score:
+                best_hash, best_score = song_hash, title_score + artist_score
+        return best_hash
+
+    def resolve(self, chart_df):
+        """
+        Match chart entries to Grammy songs.
+
+        Exact hashed keys are matched in one vectorized lookup; the remaining
+        distinct keys go through fuzzy_match once each.
+
+        Args:
+            chart_df: DataFrame with artist_name and song_title columns
+
+        Returns:
+            pd.DataFrame: grammy_song (matched hash, nullable UInt64) and
+                grammy_match ('exact', 'fuzzy' or None), on chart_df's index
+        """
+        keys = song_keys(chart_df)
+        valid = (keys['artist_key'] != '') & (keys['title_key'] != '')
+
+        exact = valid & keys['song_hash'].isin(self.outcomes.index)
+        matched = keys['song_hash'].astype('UInt64').where(exact)
+        kind = pd.Series(np.where(exact, 'exact', None), index=chart_df.index, dtype=object)
+
+        pending = keys[valid & ~exact].drop_duplicates('song_hash')
+        fuzzy = {}
+        for song_hash, artist_key, title_key in zip(pending['song_hash'], pending['artist_key'], pending['title_key']):
+            match = self.fuzzy_match(artist_key, title_key)
+            if match is not None:
+                fuzzy[song_hash] = match
+
+        if fuzzy:
+            # Hashes stay uint64 throughout (a float round trip would corrupt them)
+            targets = np.fromiter(fuzzy.values(), dtype=np.uint64, count=len(fuzzy))
+            positions = pd.Index(np.fromiter(fuzzy.keys(), dtype=np.uint64, count=len(fuzzy))).get_indexer(
+                keys['song_hash'])
+            is_fuzzy = (valid & ~exact).to_numpy() & (positions >= 0)
+            matched[is_fuzzy] = targets[positions[is_fuzzy]]
+            kind[is_fuzzy] = 'fuzzy'
+
+        return pd.DataFrame({'grammy_song': matched, 'grammy_match': kind}, index=chart_df.index)
+
+    def label(self, chart_df, latest_grammy_year=None):
+        """
+        Label chart entries with their Grammy outcome.
+
+        Each chart week is labeled for the ceremony whose eligibility window
+        it falls in (see grammy_year_for_chart_date):
+        - matched to a song nominated at that ceremony: nominated (and a
+          winner if that year's nominations won)
+        - matched to a nominated song, but outside its ceremony's window:
+          missing, since the week is no example of either outcome
+        - unmatched, and the ceremony is covered by the Grammy data: not
+          nominated
+        - otherwise (a ceremony not held yet): missing, to be predicted
+        Labeled entries carry their ceremony as grammy_year. Without a
+        chart_date column, a match is labeled with the song's first
+        nomination and everything else stays missing.
+
+        Args:
+            chart_df: DataFrame with artist_name, song_title and chart_date
+            latest_grammy_year: Last ceremony year in the Grammy data
+
+        Returns:
+            pd.DataFrame: chart_df plus grammy_match, is_nominated, is_winner,
+                grammy_nominations, grammy_year and grammy_category
+        """
+        matches = self.resolve(chart_df)
+        is_match = matches['grammy_song'].notna().to_numpy()
+        grammy_song = matches['grammy_song'].fillna(0).to_numpy(dtype=np.uint64)
+
+        labeled = chart_df.drop(columns=['is_nominated', 'is_winner', 'grammy_year', 'grammy_category'],
+                                errors='ignore')
+        labeled = labeled.join(matches[['grammy_match']])
+
+        if 'chart_date' in chart_df.columns:
+            ceremony = grammy_year_for_chart_date(chart_df['chart_date']).to_numpy(dtype=float, na_value=np.nan)
+            outcomes = self.yearly_outcomes.reindex(
+                pd.MultiIndex.from_arrays([grammy_song, np.nan_to_num(ceremony).astype(np.int64)]))
+        else:
+            outcomes = self.outcomes.reindex(grammy_song)
+            ceremony = outcomes['grammy_year'].to_numpy(dtype=float)
+
+        nominated = is_match & outcomes['grammy_nominations'].notna().to_numpy()
+
+        # Unmatched weeks are negatives once their ceremony is in the Grammy data
+        not_nominated = np.zeros(len(labeled), dtype=bool)
+        if latest_grammy_year is not None:
+            has_song = (chart_df['song_title'].notna() & chart_df['artist_name'].notna()).to_numpy()
+            not_nominated = has_song & ~is_match & (ceremony <= latest_grammy_year)
+        resolved = nominated | not_nominated
+
+        labeled['is_nominated'] = pd.Series(nominated, index=labeled.index, dtype='boolean').where(resolved)
+        labeled['is_winner'] = pd.Series(nominated & (outcomes['is_winner'] == True).to_numpy(),
+                                         index=labeled.index, dtype='boolean').where(resolved)
+        labeled['grammy_nominations'] = np.where(nominated, outcomes['grammy_nominations'].fillna(0), 0).astype(int)
+        labeled['grammy_year'] = np.where(resolved, ceremony, np.nan)
+        labeled['grammy_category'] = np.where(nominated, outcomes['grammy_category'].to_numpy(dtype=object), None)
+
+        return labeled
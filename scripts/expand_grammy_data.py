@@ -10,10 +10,12 @@ Usage:
 import pandas as pd
 import os
 
+from storage import read_table, write_table
+
 
 def load_base_data():
     """Load the real Grammy data."""
-    df = pd.read_csv('data/raw/grammy_history_real.csv')
+    df = read_table('data/raw/grammy_history_real')
     print(f"Loaded {len(df)} base records")
     return df
 
@@ -126,8 +128,7 @@ def main():
     print(f"  Winners: {combined_df['is_winner'].sum()}")
     
     # Save
-    filename = 'data/raw/grammy_history.csv'
-    combined_df.to_csv(filename, index=False)
+    filename = write_table(combined_df, 'data/raw/grammy_history')
     print(f"\n✓ Saved to {filename}")
     
     if len(combined_df) >= 300:
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Compact, indexed store of Grammy nomination events.
+
+One event per nomination, held as integer-coded numpy arrays:
+    year        int16
+    category    int32   id into `categories`
+    artist      int32   id into `artists` (normalized names, see artist_normalizer)
+    song        int32   id into `songs` (lowercased titles; -1 when there is
+                        no song, e.g. Best New Artist)
+    is_winner   bool
+
+The vocabularies are string arrays, and everything is saved to a single .npz
+file (no pickling). On load the events are indexed by (artist, year): each
+artist's events are one contiguous slice, and "nominations/wins before year Y"
+for a whole column of artists is a single searchsorted over a composite key,
+so lookups stay cheap with the full award history (~100k events).
+
+Events keep the order of the source table.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from artist_normalizer import normalize_artist_name
+
+
+GRAMMY_EVENTS_PATH = 'data/processed/grammy_events.npz'
+
+# Composite (artist, year) key: artist * YEAR_KEY_SPAN + year
+YEAR_KEY_SPAN = 10000
+
+
+def _vocab(values):
+    return np.array(list(values), dtype=str) if len(values) else np.array([], dtype='<U1')
+
+
+class GrammyEventStore:
+    """
+    Integer-coded Grammy nominations with a per-artist year index.
+
+    Args:
+        year, category, artist, song, is_winner: Event arrays (same length)
+        categories, artists, songs: Vocabularies the id arrays point into
+    """
+
+    def __init__(self, year, category, artist, song, is_winner, categories, artists, songs):
+        self.year = np.asarray(year, dtype=np.int16)
+        self.category = np.asarray(category, dtype=np.int32)
+        self.artist = np.asarray(artist, dtype=np.int32)
+        self.song = np.asarray(song, dtype=np.int32)
+        self.is_winner = np.asarray(is_winner, dtype=bool)
+
+        self.categories = _vocab(categories)
+        self.artists = _vocab(artists)
+        self.songs = _vocab(songs)
+
+        # (artist, year) index; lexsort is stable, so source order is kept within a year
+        order = np.lexsort((self.year, self.artist))
+        sorted_artists = self.artist[order].astype(np.int64)
+        self._keys = sorted_artists * YEAR_KEY_SPAN + self.year[order]
+        self._wins_before = np.concatenate(([0], np.cumsum(self.is_winner[order])))
+        self.artist_offsets = np.searchsorted(sorted_artists, np.arange(len(self.artists) + 1))
+
+        self._artist_index = pd.Index(self.artists)
+
+    def __len__(self):
+        return len(self.year)
+
+    @classmethod
+    def from_frame(cls, grammy_df):
+        """
+        Build the store from a Grammy table.
+
+        Args:
+            grammy_df: DataFrame with year, category, song_title, artist_name,
+                is_nominated and is_winner columns
+
+        Returns:
+            GrammyEventStore: Nominations with a named artist
+        """
+        df = grammy_df[(grammy_df['is_nominated'] == True).fillna(False)]
+
+        names = df['artist_name']
+        unique_names = names.dropna().unique()
+        normalized = names.map(dict(zip(unique_names, map(normalize_artist_name, unique_names))))
+        has_artist = normalized.fillna('') != ''
+        df, normalized = df[has_artist], normalized[has_artist]
+
+        artist, artists = pd.factorize(normalized, sort=True)
+        category, categories = pd.factorize(df['category'].astype(str), sort=True)
+        song, songs = pd.factorize(df['song_title'].str.lower().str.strip(), sort=True)
+
+        return cls(
+            year=df['year'].to_numpy(),
+            category=category,
+            artist=artist,
+            song=song,
+            is_winner=(df['is_winner'] == True).fillna(False).to_numpy(dtype=bool),
+            categories=categories,
+            artists=artists,
+            songs=songs,
+        )
+
+    def save(self, path=GRAMMY_EVENTS_PATH):
+        """
+        Write the store to a compressed .npz file.
+
+        Args:
+            path: Output path
+
+        Returns:
+            str: Path written
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            year=self.year, category=self.category, artist=self.artist,
+            song=self.song, is_winner=self.is_winner,
+            categories=self.categories, artists=self.artists, songs=self.songs,
+        )
+        os.replace(tmp_path, path)
+
+        return path
+
+    @classmethod
+    def load(cls, path=GRAMMY_EVENTS_PATH):
+        """
+        Load a store written by save().
+
+        Args:
+            path: .npz path
+
+        Returns:
+            GrammyEventStore: Loaded store
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in data.files})
+
+    def artist_ids(self, artist_names):
+        """
+        Exact artist ids for raw artist names.
+
+        Args:
+            artist_names: Iterable of raw artist names
+
+        Returns:
+            np.ndarray: Artist ids (-1 where the normalized name is unknown)
+        """
+        names = pd.Series(artist_names, dtype=object)
+        unique_names = names.dropna().unique()
+        return self.key_ids(names.map(dict(zip(unique_names, map(normalize_artist_name, unique_names)))))
+
+    def key_ids(self, artist_keys):
+        """
+        Artist ids for already-normalized artist names.
+
+        Args:
+            artist_keys: Iterable of normalized names (None for unknown)
+
+        Returns:
+            np.ndarray: Artist ids (-1 where the name is not in the store)
+        """
+        keys = pd.Series(artist_keys, dtype=object).fillna('')
+        return self._artist_index.get_indexer(keys)
+
+    def history(self, artist_ids, before_years=None):
+        """
+        Nomination/win counts for many artists at once.
+
+        Args:
+            artist_ids: Artist ids (-1 counts as no history)
+            before_years: Only count Grammy years strictly before these (one
+                per artist id, or a single year); None counts everything
+
+        Returns:
+            tuple: (nominations, wins) as int arrays
+        """
+        artist_ids = np.asarray(artist_ids, dtype=np.int64)
+        known = artist_ids >= 0
+        ids = np.where(known, artist_ids, 0)
+
+        if len(self.artists) == 0:
+            zeros = np.zeros(len(artist_ids), dtype=np.int64)
+            return zeros, zeros.copy()
+
+        start = self.artist_offsets[ids]
+        if before_years is None:
+            end = self.artist_offsets[ids + 1]
+        else:
+            years = np.broadcast_to(np.asarray(before_years, dtype=np.int64), ids.shape)
+            end = np.searchsorted(self._keys, ids * YEAR_KEY_SPAN + years, side='left')
+
+        noms = np.where(known, end - start, 0)
+        wins = np.where(known, self._wins_before[end] - self._wins_before[start], 0)
+
+        return noms, wins
+
+    def to_frame(self):
+        """
+        Decode the events back into a table.
+
+        Returns:
+            pd.DataFrame: year, category, song_key, artist_key, is_winner
+        """
+        songs = np.append(self.songs, None).astype(object)
+        return pd.DataFrame({
+            'year': self.year,
+            'category': self.categories[self.category],
+            'song_key': songs[self.song],
+            'artist_key': self.artists[self.artist],
+            'is_winner': self.is_winner,
+        })
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Single-pass Grammy page parser (lxml pull parser).
+
+Streams a Wikipedia Grammy Awards page through lxml's HTMLPullParser and
+emits (category, song_title, artist_name, is_winner) tuples as elements
+close, tracking the current section heading instead of searching backwards
+or sideways from each element. Cost is linear in the page size. Finished
+lists and tables are cleared as soon as they close, so memory stays flat on
+large pages.
+
+Two layouts are supported:
+    'list'   nominees as <li> items under an h3/h4 category heading
+             (scrape_grammy_history.py)
+    'table'  nominees as rows of a wikitable under the nearest preceding
+             h2/h3/h4 heading (scrape_grammy_real.py)
+"""
+
+import re
+
+from lxml import etree
+
+
+HEADINGS = ('h2', 'h3', 'h4')
+
+# "Song" by Artist / "Song" – Artist
+LIST_NOMINEE_RE = re.compile(r'"([^"]+)".*?(?:by|–|-)\s*([^()\n]+)')
+TABLE_NOMINEE_RE = re.compile(r'"([^"]+)".*?(?:by|–|-)\s*([^(\n]+)')
+
+# Table layout: headings that name a music category
+TABLE_CATEGORY_KEYWORDS = ('record', 'song', 'performance', 'album', 'artist')
+
+# List layout without a category filter: headings that name an award
+# ("Best ...", "... of the Year"), minus Wikipedia's "[edit]" link text
+AWARD_HEADING_RE = re.compile(r'^(best\b|.*\bof the year\b)', re.IGNORECASE)
+EDIT_LINK_RE = re.compile(r'\s*\[edit\]\s*$')
+
+CHUNK_SIZE = 1 << 16
+
+
+def _text(element):
+    return ''.join(element.itertext())
+
+
+def _has_descendant(element, tag):
+    return next(element.iterdescendants(tag), None) is not None
+
+
+def _chunks(html):
+    for start in range(0, len(html), CHUNK_SIZE):
+        yield html[start:start + CHUNK_SIZE]
+
+
+def _match_list_category(heading_text, categories):
+    if categories is None:
+        heading_text = EDIT_LINK_RE.sub('', heading_text)
+        return heading_text if AWARD_HEADING_RE.match(heading_text) else None
+
+    heading_lower = heading_text.lower()
+    for category in categories:
+        if category.lower() in heading_lower:
+            return category
+    return None
+
+
+def iter_nominees(html, layout, categories=None, encoding='utf-8'):
+    """
+    Stream nominee tuples out of a Grammy page.
+
+    Args:
+        html: Page content (bytes or str)
+        layout: 'list' or 'table'
+        categories: Category names to keep for the list layout (a heading
+            matches the first name it contains, case-insensitively); None
+            keeps every award heading under its own name
+        encoding: Encoding of bytes input
+
+    Yields:
+        tuple: (category, song_title, artist_name, is_winner)
+    """
+    if layout not in ('list', 'table'):
+        raise ValueError(f"Unknown layout: {layout}")
+    if isinstance(html, bytes):
+        parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    else:
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+
+    list_category = None   # list layout: category of the current h3/h4 section
+    heading_text = None    # table layout: text of the last heading seen
+    tables = []            # table layout: [category or None, rows seen] per open wikitable
+    list_depth = 0         # open <ul> elements (cleared when the outermost closes)
+
+    def events():
+        for chunk in _chunks(html):
+            parser.feed(chunk)
+            yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+
+    for event, element in events():
+        tag = element.tag
+
+        if event == 'start':
+            if tag == 'table' and layout == 'table':
+                is_wikitable = 'wikitable' in (element.get('class') or '').split()
+                category = None
+                if is_wikitable and heading_text is not None:
+                    if any(keyword in heading_text.lower() for keyword in TABLE_CATEGORY_KEYWORDS):
+                        category = heading_text
+                tables.append([category if is_wikitable else None, 0])
+            elif tag == 'ul':
+                list_depth += 1
+            continue
+
+        if tag in HEADINGS:
+            text = _text(element).strip()
+            heading_text = text
+            if layout == 'list':
+                list_category = _match_list_category(text, categories) if tag != 'h2' else None
+            element.clear(keep_tail=True)
+
+        elif tag == 'li' and layout == 'list' and list_category is not None and list_depth > 0:
+            text = _text(element)
+            match = LIST_NOMINEE_RE.search(text)
+            if match:
+                is_winner = '✓' in text or _has_descendant(element, 'b')
+                yield (list_category, match.group(1).strip(), match.group(2).strip(), is_winner)
+
+        elif tag == 'ul':
+            list_depth -= 1
+            if list_depth == 0:
+                element.clear(keep_tail=True)
+
+        elif tag == 'tr' and tables:
+            table = tables[-1]
+            table[1] += 1
+            if table[0] is not None and table[1] > 1:  # first row is the header
+                cells = [cell for cell in element.iter('td', 'th')]
+                if len(cells) >= 2:
+                    nominee = _text(cells[0]).strip()
+                    is_winner = bool(
+                        _has_descendant(element, 'b') or '✓' in nominee
+                        or 'background' in (element.get('style') or '')
+                    )
+                    match = TABLE_NOMINEE_RE.search(nominee)
+                    if match:
+                        yield (table[0], match.group(1).strip(), match.group(2).strip(), is_winner)
+
+        elif tag == 'table' and tables:
+            tables.pop()
+            if not tables:
+                element.clear(keep_tail=True)
+
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Shared, polite HTTP fetch layer with an on-disk response cache.
+
+Used by the Grammy scrapers. One pooled requests session is shared by a
+bounded thread pool; requests to the same host are spaced at least
+`min_interval` seconds apart. Responses are cached under
+data/interim/http_cache/ (body + JSON metadata per URL):
+
+- within `max_age` a cached page is returned without any request
+- after that it is revalidated with If-None-Match / If-Modified-Since, and a
+  304 reuses the cached body
+- if the network fails, a cached copy (however old) is served instead
+- a failed request is recorded, and the URL isn't requested again until a
+  backoff has passed (failure_backoff, doubling with each consecutive
+  failure up to max_age): meanwhile the cached copy is served, or the call
+  fails at once with FetchBackoff, so a dead endpoint costs one request per
+  backoff period instead of one per run
+
+Point a scraper's base URL at a local server (e.g. `python -m http.server`
+over saved pages) to run against fixtures.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# requests is imported when the session is first created
+
+
+CACHE_DIR = 'data/interim/http_cache'
+
+USER_AGENT = 'Gramlytics/0.1 (Grammy nomination research; python-requests)'
+
+MAX_WORKERS = 4
+MIN_INTERVAL = 1.0  # seconds between requests to the same host
+REQUEST_TIMEOUT = 15
+DEFAULT_MAX_AGE = 24 * 3600
+FAILURE_BACKOFF = 15 * 60  # seconds before retrying a failed URL (doubles per failure)
+
+
+class FetchBackoff(Exception):
+    """Raised instead of requesting a URL that failed recently and has no cached copy."""
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least min_interval seconds apart (thread-safe)."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchResult:
+    """A fetched (or cached) page."""
+
+    def __init__(self, url, status_code, content, from_cache):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+
+class CachedFetcher:
+    """
+    Pooled, rate-limited HTTP GETs backed by an on-disk cache.
+
+    Args:
+        cache_dir: Response cache directory
+        max_workers: Concurrent requests in get_many (and connection pool size)
+        min_interval: Minimum seconds between requests to one host
+        max_age: Seconds a cached page is used without revalidating
+            (0 always revalidates; None never does)
+        timeout: Request timeout in seconds
+        failure_backoff: Seconds before a failed URL is requested again,
+            doubled per consecutive failure (0 always retries)
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=MAX_WORKERS, min_interval=MIN_INTERVAL,
+                 max_age=DEFAULT_MAX_AGE, timeout=REQUEST_TIMEOUT, failure_backoff=FAILURE_BACKOFF):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.max_age = max_age
+        self.failure_backoff = failure_backoff
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(min_interval)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                self._session = session
+        return self._session
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        directory = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(directory, f"{key}.body"), os.path.join(directory, f"{key}.json")
+
+    def _failure_path(self, url):
+        return self._paths(url)[1][:-len('.json')] + '.failed.json'
+
+    def _read_failure(self, url):
+        path = self._failure_path(url)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _record_failure(self, url, failure, error):
+        path = self._failure_path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        failure = {
+            'failures': (failure or {}).get('failures', 0) + 1,
+            'failed_at': time.time(),
+            'error': f"{type(error).__name__}: {error}",
+        }
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(failure, f)
+        os.replace(tmp_path, path)
+
+    def _retry_at(self, failure):
+        """Time a failed URL may be requested again."""
+        backoff = self.failure_backoff * 2 ** (failure['failures'] - 1)
+        if self.max_age:
+            backoff = min(backoff, self.max_age)
+        return failure['failed_at'] + backoff
+
+    def _read_cache(self, url):
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None, None
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        return meta, body
+
+    def _write_cache(self, url, meta, body=None):
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        # Body before metadata, each via rename, so a reader never pairs new
+        # metadata with an old or partial body
+        if body is not None:
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def get(self, url):
+        """
+        GET a URL through the cache.
+
+        Args:
+            url: URL to fetch
+
+        Returns:
+            FetchResult: Page content (from_cache is True if no new body was downloaded)
+
+        Raises:
+            requests.RequestException: If the request fails and nothing is cached
+            FetchBackoff: If the URL failed recently and nothing is cached
+        """
+        meta, body = self._read_cache(url)
+
+        if meta is not None:
+            age = time.time() - meta['fetched_at']
+            if self.max_age is None or age < self.max_age:
+                return FetchResult(url, meta['status_code'], body, from_cache=True)
+
+        failure = self._read_failure(url)
+        if failure is not None and self.failure_backoff and time.time() < self._retry_at(failure):
+            if meta is not None:
+                return FetchResult(url, meta['status_code'], body, from_cache=True)
+            raise FetchBackoff(f"{url} failed {failure['failures']} time(s), last with {failure['error']}; "
+                               f"not retrying for {self._retry_at(failure) - time.time():.0f}s")
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        self.limiter.wait(urlsplit(url).netloc)
+        try:
+            response = self._get_session().get(url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            self._record_failure(url, failure, e)
+            if meta is not None:
+                return FetchResult(url, meta['status_code'], body, from_cache=True)
+            raise
+
+        if failure is not None:
+            os.remove(self._failure_path(url))
+
+        if response.status_code == 304:
+            meta['fetched_at'] = time.time()
+            self._write_cache(url, meta)
+            return FetchResult(url, meta['status_code'], body, from_cache=True)
+
+        meta = {
+            'url': url,
+            'status_code': response.status_code,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        }
+        self._write_cache(url, meta, response.content)
+
+        return FetchResult(url, response.status_code, response.content, from_cache=False)
+
+    def get_many(self, urls):
+        """
+        GET several URLs concurrently (bounded by max_workers).
+
+        Args:
+            urls: URLs to fetch
+
+        Returns:
+            dict: {url: FetchResult or the exception the fetch raised}
+        """
+        def fetch(url):
+            try:
+                return self.get(url)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(urls, executor.map(fetch, urls)))
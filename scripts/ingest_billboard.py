@@ -2,45 +2,119 @@
 """
 S1-01: Billboard Top 10 Ingestion Script
 Pulls current Billboard Hot 100 Top 10 and normalizes to datamodel.md schema.
+Genre and album charts are fetched alongside it (in parallel) and merged into
+a song-level table, so a song's genre comes from the genre charts it is on.
 
 Usage:
     python scripts/ingest_billboard.py
+    python scripts/ingest_billboard.py --charts hot-100 pop-songs rap-song --workers 2
+    python scripts/ingest_billboard.py --fixtures path/to/fixtures   # offline replay
+    
+    (To backfill/update the full weekly history, use scripts/chart_archive.py)
     
 Output:
-    data/raw/billboard_top10_<date>.csv
+    data/raw/billboard_hot100_<date>.parquet (and .csv)
+    data/raw/billboard_songs_<date>.parquet (and .csv; all charted songs)
+    data/raw/charts/<chart>/<date>.parquet (weekly archive partitions)
 """
 
-import billboard
+import argparse
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import os
 
+from album_art import prefetch_album_art
+from artist_normalizer import normalize_artist_name
+from storage import write_table
+
+
+# Charts pulled on each run: the Hot 100 holds the songs we predict for,
+# genre charts assign genre by membership, and the Billboard 200 (albums)
+# flags artists with a charting album
+CHARTS = [
+    'hot-100',
+    'pop-songs',
+    'rap-song',
+    'r-and-b-songs',
+    'country-songs',
+    'hot-rock-songs',
+    'hot-alternative-songs',
+    'billboard-200',
+]
+
+# Song chart -> genre (genres match the model's genre categories)
+CHART_GENRES = {
+    'pop-songs': 'Pop',
+    'rap-song': 'Rap',
+    'r-and-b-songs': 'R&B',
+    'country-songs': 'Country',
+    'hot-rock-songs': 'Rock',
+    'hot-alternative-songs': 'Alternative',
+}
+
+# Charts whose entries are albums, not songs
+ALBUM_CHARTS = {'billboard-200'}
+
+MAX_WORKERS = 4
+
 
-def fetch_billboard_hot100():
+def fetch_charts(chart_names=CHARTS, source=None, max_workers=MAX_WORKERS):
     """
-    Fetch current Billboard Hot 100 (all 100 songs).
+    Fetch the current week of several Billboard charts in parallel.
     
+    Requests go through a bounded thread pool; the source spaces requests to
+    billboard.com REQUEST_DELAY seconds apart however many workers run.
+    
+    Args:
+        chart_names: Billboard chart names (must include 'hot-100')
+        source: Chart source (chart_archive.BillboardSource by default, or a
+            FixtureChartSource to replay recorded charts offline)
+        max_workers: Maximum concurrent fetches
+        
     Returns:
-        list: List of ChartEntry objects
+        dict: {chart_name: ChartData} for every chart that was fetched
+        
+    Raises:
+        RuntimeError: If the Hot 100 could not be fetched
     """
-    print("Fetching Billboard Hot 100 chart...")
-    chart = billboard.ChartData('hot-100')
+    # chart_archive imports this module, so import it here rather than at the top
+    from chart_archive import BillboardSource
+    
+    source = source or BillboardSource()
     
-    # Get all 100 entries
-    hot100 = chart[:]
+    print(f"Fetching {len(chart_names)} Billboard charts...")
+    charts = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(source.fetch, name): name for name in chart_names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                chart = future.result()
+            except Exception as e:
+                print(f"  ⚠️  {name}: {e}")
+                continue
+            
+            if len(chart) == 0:
+                print(f"  ⚠️  {name}: no entries")
+                continue
+            
+            charts[name] = chart
+            print(f"  ✓ {name}: {len(chart)} entries ({chart.date})")
     
-    print(f"✓ Fetched {len(hot100)} songs from Billboard Hot 100")
-    print(f"  Chart date: {chart.date}")
+    if 'hot-100' not in charts:
+        raise RuntimeError("Could not fetch the Billboard Hot 100")
     
-    return hot100, chart.date
+    return charts
 
 
-def normalize_to_schema(chart_entries):
+def normalize_to_schema(chart_entries, verbose=True):
     """
     Normalize Billboard data to datamodel.md schema.
     
     Args:
         chart_entries: List of billboard.ChartEntry objects
+        verbose: Print a summary line
         
     Returns:
         pd.DataFrame: Normalized data with schema fields
@@ -67,7 +141,107 @@ def normalize_to_schema(chart_entries):
     
     df = pd.DataFrame(records)
     
-    print(f"✓ Normalized {len(df)} records to schema")
+    if verbose:
+        print(f"✓ Normalized {len(df)} records to schema")
+    
+    return df
+
+
+def merge_charts(charts):
+    """
+    Merge song charts into one song-level table.
+    
+    Entries are matched across charts on normalized artist and title. A
+    song's chart fields (rank, peak, weeks) come from the Hot 100 when it is
+    on it, otherwise from its best-ranked chart; its genre comes from its
+    best-ranked genre chart.
+    
+    Args:
+        charts: {chart_name: ChartData} from fetch_charts
+        
+    Returns:
+        pd.DataFrame: One row per song with the normalize_to_schema columns plus
+            'charts' ('|'-separated chart names), 'on_hot_100' and
+            'artist_on_billboard_200' (None if the Billboard 200 wasn't fetched)
+    """
+    chart_order = {name: i for i, name in enumerate(CHARTS)}
+    
+    frames = []
+    for name, chart in charts.items():
+        if name in ALBUM_CHARTS:
+            continue
+        df = normalize_to_schema(chart.entries, verbose=False)
+        df['chart_date'] = chart.date
+        df['chart_name'] = name
+        frames.append(df)
+    
+    entries = pd.concat(frames, ignore_index=True)
+    entries['artist_key'] = entries['artist_name'].map(normalize_artist_name)
+    entries['title_key'] = entries['song_title'].str.lower().str.strip()
+    entries['chart_order'] = entries['chart_name'].map(chart_order).fillna(len(chart_order))
+    entries['not_hot_100'] = entries['chart_name'] != 'hot-100'
+    keys = ['artist_key', 'title_key']
+    
+    # One row per song: its Hot 100 entry if any, else its best-ranked entry
+    songs = (
+        entries.sort_values(['not_hot_100', 'current_rank', 'chart_order'])
+        .drop_duplicates(subset=keys, keep='first')
+        .set_index(keys)
+    )
+    
+    # Genre from the best-ranked genre chart the song is on
+    genre_entries = entries[entries['chart_name'].isin(CHART_GENRES.keys())]
+    genres = (
+        genre_entries.sort_values(['current_rank', 'chart_order'])
+        .drop_duplicates(subset=keys, keep='first')
+        .set_index(keys)['chart_name']
+        .map(CHART_GENRES)
+    )
+    songs['genre'] = genres.reindex(songs.index)
+    
+    songs['charts'] = entries.sort_values('chart_order').groupby(keys)['chart_name'].agg('|'.join)
+    songs['on_hot_100'] = ~songs['not_hot_100']
+    
+    album_charts = [charts[name] for name in ALBUM_CHARTS if name in charts]
+    if album_charts:
+        album_artists = {normalize_artist_name(entry.artist) for chart in album_charts for entry in chart.entries}
+        songs['artist_on_billboard_200'] = songs.index.get_level_values('artist_key').isin(album_artists)
+    else:
+        songs['artist_on_billboard_200'] = None
+    
+    songs = songs.drop(columns=['chart_name', 'chart_order', 'not_hot_100']).reset_index(drop=True)
+    
+    genre_count = songs['genre'].notna().sum()
+    print(f"✓ Merged {len(entries)} chart entries into {len(songs)} songs ({genre_count} with a chart genre)")
+    
+    return songs
+
+
+def archive_entries(chart_name, chart, songs_df=None):
+    """
+    One week of a chart in the archive schema, with chart-membership genres.
+    
+    Entries of a genre chart get that chart's genre; entries of other song
+    charts get the genre merge_charts gave the song, when songs_df is given.
+    
+    Args:
+        chart_name: Billboard chart name
+        chart: ChartData for the week
+        songs_df: merge_charts output for the same week (optional)
+        
+    Returns:
+        pd.DataFrame: normalize_to_schema output with genre filled in
+    """
+    df = normalize_to_schema(chart.entries, verbose=False)
+    
+    if chart_name in CHART_GENRES:
+        df['genre'] = CHART_GENRES[chart_name]
+    elif songs_df is not None and chart_name not in ALBUM_CHARTS and len(df) > 0:
+        def song_key(frame):
+            return frame['artist_name'].map(normalize_artist_name) + '\x1f' + frame['song_title'].str.lower().str.strip()
+        
+        genres = dict(zip(song_key(songs_df), songs_df['genre']))
+        df['genre'] = song_key(df).map(genres)
     
     return df
 
@@ -86,11 +260,8 @@ def save_to_csv(df, chart_date):
     # Add chart date to all records
     df['chart_date'] = chart_date
     
-    # Generate filename
-    filename = f"data/raw/billboard_hot100_{chart_date}.csv"
-    
-    # Save
-    df.to_csv(filename, index=False)
+    # Save (Parquet plus a CSV copy)
+    filename = write_table(df, f"data/raw/billboard_hot100_{chart_date}")
     
     print(f"✓ Saved to {filename}")
     print(f"\nPreview (Top 10):")
@@ -101,24 +272,53 @@ def save_to_csv(df, chart_date):
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Ingest current Billboard charts")
+    parser.add_argument('--charts', nargs='+', default=CHARTS, help="Billboard chart names (hot-100 is always included)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="Concurrent chart fetches")
+    parser.add_argument('--fixtures', help="Replay recorded charts from this directory instead of billboard.com")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Billboard Hot 100 Ingestion")
     print("=" * 60)
     print()
     
-    # Step 1: Fetch data
-    hot100, chart_date = fetch_billboard_hot100()
+    from chart_archive import FixtureChartSource, write_partition
+    
+    chart_names = ['hot-100'] + [name for name in args.charts if name != 'hot-100']
+    source = FixtureChartSource(args.fixtures) if args.fixtures else None
     
-    # Step 2: Normalize to schema
-    df = normalize_to_schema(hot100)
+    # Step 1: Fetch charts
+    charts = fetch_charts(chart_names, source=source, max_workers=args.workers)
+    chart_date = charts['hot-100'].date
     
-    # Step 3: Save to CSV
+    # Step 2: Normalize and merge into one song-level table
+    songs_df = merge_charts(charts)
+    df = songs_df[songs_df['on_hot_100']].sort_values('current_rank').reset_index(drop=True)
+    df = df.drop(columns=['on_hot_100'])
+    
+    # Step 3: Save (Parquet + CSV)
     filename = save_to_csv(df, chart_date)
+    write_table(songs_df, f"data/raw/billboard_songs_{chart_date}")
+    
+    # Step 4: Add this week of each chart to the chart archive (see chart_archive.py)
+    for name, chart in charts.items():
+        write_partition(archive_entries(name, chart, songs_df), chart.date, name)
+    
+    # Step 5: Warm the album art cache for the app (needs the network, so not for fixture replays)
+    if args.fixtures:
+        print("Skipping album art prefetch (fixture replay)")
+    else:
+        try:
+            prefetch_album_art(df)
+        except Exception as e:
+            print(f"⚠️  Album art prefetch failed: {e}")
     
     print()
     print("=" * 60)
     print(f"✓ Complete: {len(df)} songs ingested")
     print(f"  Output: {filename}")
+    print(f"  Song table: {len(songs_df)} songs across {len(charts)} charts")
     print("=" * 60)
     
     return df
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Versioned, pickle-free model bundle for linear models.
+
+A bundle is a directory holding:
+    manifest.json   format version, feature order, class lists, encoder
+                    classes, metadata and checksums of the arrays
+    coef.npy        coefficients, shape (n_features,)
+    intercept.npy   intercept, shape (1,)
+
+Loading needs only NumPy (arrays are memory-mapped), never unpickles, and is
+independent of the scikit-learn version used for training. The loaded
+package has the same shape as the pickled one ('model', 'encoders',
+'feature_names', 'version', 'trained_date'), so predictor.predict_batch
+works with either.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+BUNDLE_FORMAT = 'gramlytics-linear'
+BUNDLE_FORMAT_VERSION = 1
+
+MODEL_BUNDLE_DIR = 'model/baseline_lr'
+MODEL_PICKLE_PATH = 'model/baseline_lr.pkl'
+
+MANIFEST_FILE = 'manifest.json'
+ARRAY_FILES = ('coef.npy', 'intercept.npy')
+
+
+class CategoryEncoder:
+    """NumPy replacement for a fitted sklearn LabelEncoder (transform only)."""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+        self._codes = {label: code for code, label in enumerate(self.classes_)}
+
+    def transform(self, values):
+        values = np.asarray(values, dtype=object)
+        try:
+            return np.fromiter((self._codes[v] for v in values), dtype=np.int64, count=len(values))
+        except KeyError:
+            unseen = sorted({str(v) for v in values if v not in self._codes})
+            raise ValueError(f"y contains previously unseen labels: {', '.join(repr(v) for v in unseen)}")
+
+
+class LinearScorer:
+    """Pure-NumPy binary logistic regression scorer (predict / predict_proba)."""
+
+    def __init__(self, coef, intercept, classes):
+        self.coef_ = np.asarray(coef, dtype=np.float64).reshape(1, -1)
+        self.intercept_ = np.asarray(intercept, dtype=np.float64).reshape(1)
+        self.classes_ = np.asarray(classes)
+
+    def decision_function(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X):
+        scores = self.decision_function(X)
+        positive = np.exp(-np.logaddexp(0.0, -scores))  # numerically stable sigmoid
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _to_json(value):
+    """Convert NumPy scalars to plain Python for the manifest."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def bundle_paths(bundle_dir=MODEL_BUNDLE_DIR):
+    """All files making up a bundle (manifest first)."""
+    return [os.path.join(bundle_dir, MANIFEST_FILE)] + [os.path.join(bundle_dir, f) for f in ARRAY_FILES]
+
+
+def model_source_path(bundle_dir=MODEL_BUNDLE_DIR, pickle_path=MODEL_PICKLE_PATH):
+    """
+    File identifying the current model: the bundle manifest if a bundle
+    exists, otherwise the legacy pickle.
+    """
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    return manifest_path if os.path.exists(manifest_path) else pickle_path
+
+
+def can_export(model):
+    """True if the model is a binary linear classifier the bundle can hold."""
+    return (
+        hasattr(model, 'coef_') and hasattr(model, 'intercept_') and hasattr(model, 'classes_')
+        and np.ndim(model.coef_) == 2 and np.shape(model.coef_)[0] == 1
+        and len(model.classes_) == 2
+    )
+
+
+def export_model_bundle(model_package, bundle_dir=MODEL_BUNDLE_DIR):
+    """
+    Write a model package as a bundle.
+
+    Args:
+        model_package: Dict with 'model' (binary linear classifier),
+            'encoders' (fitted LabelEncoders), 'feature_names', 'version',
+            'trained_date'
+        bundle_dir: Output directory
+
+    Returns:
+        str: Path to the manifest
+
+    Raises:
+        ValueError: If the model is not a binary linear classifier
+    """
+    model = model_package['model']
+    if not can_export(model):
+        raise ValueError(f"{type(model).__name__} is not a binary linear model; it can't be exported as a bundle")
+
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    arrays = {
+        'coef.npy': np.ascontiguousarray(model.coef_[0], dtype=np.float64),
+        'intercept.npy': np.ascontiguousarray(model.intercept_, dtype=np.float64).reshape(1),
+    }
+    checksums = {}
+    for filename, array in arrays.items():
+        path = os.path.join(bundle_dir, filename)
+        np.save(path, array)
+        checksums[filename] = _sha256(path)
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'model_type': type(model).__name__,
+        'feature_names': list(model_package['feature_names']),
+        'classes': [_to_json(c) for c in model.classes_],
+        'encoders': {
+            name: [_to_json(c) for c in encoder.classes_]
+            for name, encoder in model_package['encoders'].items()
+        },
+        'version': model_package.get('version'),
+        'trained_date': model_package.get('trained_date'),
+        'checksums': checksums,
+    }
+
+    # Manifest last (atomically), so a reader never sees it before the arrays
+    manifest_path = os.path.join(bundle_dir, MANIFEST_FILE)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    return manifest_path
+
+
+def load_model_bundle(bundle_dir=MODEL_BUNDLE_DIR, mmap=True, verify=True):
+    """
+    Load a bundle into a model package.
+
+    Args:
+        bundle_dir: Bundle directory
+        mmap: Memory-map the arrays instead of reading them
+        verify: Check array checksums against the manifest
+
+    Returns:
+        dict: Model package ('model', 'encoders', 'feature_names', 'version',
+            'trained_date', 'format_version')
+
+    Raises:
+        ValueError: If the bundle format is unknown or a checksum mismatches
+    """
+    with open(os.path.join(bundle_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != BUNDLE_FORMAT or manifest.get('format_version', 0) > BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model bundle: {manifest.get('format')} v{manifest.get('format_version')}")
+
+    arrays = {}
+    for filename in ARRAY_FILES:
+        path = os.path.join(bundle_dir, filename)
+        if verify and _sha256(path) != manifest['checksums'][filename]:
+            raise ValueError(f"Checksum mismatch for {path}")
+        arrays[filename] = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+
+    return {
+        'model': LinearScorer(arrays['coef.npy'], arrays['intercept.npy'], manifest['classes']),
+        'encoders': {name: CategoryEncoder(classes) for name, classes in manifest['encoders'].items()},
+        'feature_names': manifest['feature_names'],
+        'version': manifest['version'],
+        'trained_date': manifest['trained_date'],
+        'format_version': manifest['format_version'],
+    }
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Cross-validated model search across several model families.
+
+Each candidate is a model family plus one set of hyperparameters. Candidates
+are cross-validated in parallel in a process pool (one task per candidate),
+and each records its fit time, scoring latency and CV metrics. The champion
+is the best-scoring candidate that scores within a latency budget.
+
+Families:
+    logistic            regularized logistic regression (L2 or L1)
+    hist_gb             gradient-boosted trees (HistGradientBoostingClassifier)
+    calibrated_hist_gb  gradient-boosted trees with sigmoid/isotonic calibration
+    calibrated_logistic logistic regression with isotonic calibration
+    xgboost             gradient-boosted trees via XGBoost (only if installed)
+
+Only plain logistic regression can be exported as a pickle-free bundle; the
+other families are saved as the pickled model package (see model_format.py).
+
+scikit-learn is imported inside the functions, so importing this module
+stays cheap.
+"""
+
+import importlib.util
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+CV_FOLDS = 5
+RANDOM_STATE = 42
+
+# Candidates are ranked by this CV metric (mean over folds)
+SELECTION_METRIC = 'roc_auc'
+
+# Scoring latency is measured on a batch of this many rows (best of
+# LATENCY_REPEATS), roughly a full chart scored by the app
+LATENCY_BATCH_ROWS = 1000
+LATENCY_REPEATS = 5
+
+# Default latency budget for the champion, in milliseconds per batch
+DEFAULT_LATENCY_BUDGET_MS = 25.0
+
+
+def default_candidates():
+    """
+    Model families and hyperparameter grids to search.
+
+    Returns:
+        list: (family, params) tuples
+    """
+    candidates = []
+
+    for C in (0.01, 0.1, 1.0, 10.0):
+        candidates.append(('logistic', {'C': C, 'penalty': 'l2'}))
+    for C in (0.1, 1.0):
+        candidates.append(('logistic', {'C': C, 'penalty': 'l1'}))
+
+    for learning_rate in (0.05, 0.1):
+        for max_depth in (3, None):
+            candidates.append(('hist_gb', {'learning_rate': learning_rate, 'max_depth': max_depth,
+                                           'max_iter': 200}))
+
+    for method in ('sigmoid', 'isotonic'):
+        candidates.append(('calibrated_hist_gb', {'method': method, 'learning_rate': 0.1, 'max_depth': 3}))
+    candidates.append(('calibrated_logistic', {'method': 'isotonic', 'C': 1.0}))
+
+    # Optional dependency: skipped when XGBoost isn't installed
+    if importlib.util.find_spec('xgboost') is not None:
+        for max_depth in (3, 6):
+            candidates.append(('xgboost', {'max_depth': max_depth, 'learning_rate': 0.1, 'n_estimators': 200}))
+
+    return candidates
+
+
+def build_model(family, params):
+    """
+    Instantiate an unfitted model.
+
+    Args:
+        family: Model family (see module docstring)
+        params: Hyperparameters for the family
+
+    Returns:
+        object: scikit-learn compatible classifier
+
+    Raises:
+        ValueError: If the family is unknown
+    """
+    if family == 'logistic':
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(C=params['C'], penalty=params['penalty'],
+                                  solver='liblinear' if params['penalty'] == 'l1' else 'lbfgs',
+                                  max_iter=1000, class_weight='balanced', random_state=RANDOM_STATE)
+
+    if family == 'hist_gb':
+        from sklearn.ensemble import HistGradientBoostingClassifier
+
+        return HistGradientBoostingClassifier(learning_rate=params['learning_rate'], max_depth=params['max_depth'],
+                                              max_iter=params['max_iter'], class_weight='balanced',
+                                              random_state=RANDOM_STATE)
+
+    if family == 'calibrated_hist_gb':
+        from sklearn.calibration import CalibratedClassifierCV
+
+        base = build_model('hist_gb', {'learning_rate': params['learning_rate'], 'max_depth': params['max_depth'],
+                                       'max_iter': 200})
+        return CalibratedClassifierCV(base, method=params['method'], cv=3)
+
+    if family == 'calibrated_logistic':
+        from sklearn.calibration import CalibratedClassifierCV
+
+        base = build_model('logistic', {'C': params['C'], 'penalty': 'l2'})
+        return CalibratedClassifierCV(base, method=params['method'], cv=3)
+
+    if family == 'xgboost':
+        from xgboost import XGBClassifier
+
+        return XGBClassifier(max_depth=params['max_depth'], learning_rate=params['learning_rate'],
+                             n_estimators=params['n_estimators'], eval_metric='logloss',
+                             random_state=RANDOM_STATE, n_jobs=1)
+
+    raise ValueError(f"Unknown model family: {family}")
+
+
+def scoring_latency_ms(model, X, rows=LATENCY_BATCH_ROWS, repeats=LATENCY_REPEATS):
+    """
+    Best wall time of predict_proba on a batch of rows.
+
+    Args:
+        model: Fitted model
+        X: Feature rows to tile into the batch
+        rows: Batch size
+        repeats: Timed runs (the best is kept)
+
+    Returns:
+        float: Milliseconds per batch
+    """
+    batch = np.resize(np.asarray(X, dtype=float), (rows, np.shape(X)[1]))
+
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def evaluate_candidate(family, params, X, y, folds):
+    """
+    Cross-validate one candidate (runs in a worker process).
+
+    Args:
+        family: Model family
+        params: Hyperparameters
+        X: Feature matrix
+        y: Target labels
+        folds: List of (train_idx, validation_idx) pairs
+
+    Returns:
+        dict: family, params, mean CV metrics, fit_time_s (mean per fold),
+            latency_ms (per LATENCY_BATCH_ROWS rows), or error
+    """
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    from sklearn.metrics import accuracy_score, f1_score, log_loss, roc_auc_score
+
+    result = {'family': family, 'params': params}
+    scores = {'roc_auc': [], 'f1': [], 'accuracy': [], 'log_loss': []}
+    fit_times = []
+    model = None
+
+    try:
+        for train_idx, val_idx in folds:
+            model = build_model(family, params)
+
+            start = time.perf_counter()
+            model.fit(X[train_idx], y[train_idx])
+            fit_times.append(time.perf_counter() - start)
+
+            proba = model.predict_proba(X[val_idx])[:, 1]
+            pred = (proba >= 0.5).astype(int)
+            y_val = y[val_idx]
+
+            scores['roc_auc'].append(roc_auc_score(y_val, proba) if len(np.unique(y_val)) > 1 else np.nan)
+            scores['f1'].append(f1_score(y_val, pred, zero_division=0))
+            scores['accuracy'].append(accuracy_score(y_val, pred))
+            scores['log_loss'].append(log_loss(y_val, proba, labels=[0, 1]))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    for metric, values in scores.items():
+        result[metric] = float(np.nanmean(values)) if not np.all(np.isnan(values)) else np.nan
+    result['fit_time_s'] = float(np.mean(fit_times))
+    result['latency_ms'] = scoring_latency_ms(model, X)
+
+    return result
+
+
+def cv_folds(y, n_splits=CV_FOLDS):
+    """
+    Stratified CV folds (fewer splits if the minority class is small).
+
+    Args:
+        y: Target labels
+        n_splits: Requested number of folds
+
+    Returns:
+        list: (train_idx, validation_idx) pairs
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    n_splits = max(2, min(n_splits, int(np.bincount(y).min())))
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=RANDOM_STATE)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def run_search(X, y, candidates=None, n_splits=CV_FOLDS, max_workers=None):
+    """
+    Cross-validate all candidates in parallel.
+
+    Args:
+        X: Feature matrix
+        y: Target labels
+        candidates: (family, params) tuples (default_candidates() if None)
+        n_splits: CV folds
+        max_workers: Worker processes (None uses all cores)
+
+    Returns:
+        list: evaluate_candidate results, in candidate order
+    """
+    if candidates is None:
+        candidates = default_candidates()
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=int)
+    folds = cv_folds(y, n_splits)
+
+    print(f"\nSearching {len(candidates)} candidates ({len(folds)}-fold CV, {max_workers} workers)...")
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(candidates))) as executor:
+        futures = [executor.submit(evaluate_candidate, family, params, X, y, folds) for family, params in candidates]
+        results = [future.result() for future in futures]
+
+    failed = [result for result in results if 'error' in result]
+    for result in failed:
+        print(f"  ⚠️  {result['family']} {result['params']} failed: {result['error']}")
+    print(f"  ✓ Evaluated {len(results) - len(failed)} candidates")
+
+    return results
+
+
+def choose_champion(results, latency_budget_ms=DEFAULT_LATENCY_BUDGET_MS, metric=SELECTION_METRIC):
+    """
+    Pick the best candidate that scores within the latency budget.
+
+    Ties on the metric go to the faster candidate. If no candidate is within
+    budget, the fastest one is chosen.
+
+    Args:
+        results: run_search results
+        latency_budget_ms: Max milliseconds per LATENCY_BATCH_ROWS rows
+        metric: CV metric to maximize
+
+    Returns:
+        dict: Champion result
+
+    Raises:
+        ValueError: If every candidate failed
+    """
+    valid = [result for result in results if 'error' not in result and not np.isnan(result[metric])]
+    if not valid:
+        raise ValueError("No candidate could be evaluated")
+
+    within_budget = [result for result in valid if result['latency_ms'] <= latency_budget_ms]
+    if not within_budget:
+        print(f"  ⚠️  No candidate scores within {latency_budget_ms:.1f} ms; using the fastest")
+        return min(valid, key=lambda result: result['latency_ms'])
+
+    return max(within_budget, key=lambda result: (round(result[metric], 6), -result['latency_ms']))
+
+
+def results_table(results, latency_budget_ms=DEFAULT_LATENCY_BUDGET_MS, metric=SELECTION_METRIC):
+    """
+    Search results as a table, best first.
+
+    Args:
+        results: run_search results
+        latency_budget_ms: Latency budget (flags candidates within it)
+        metric: Sort metric
+
+    Returns:
+        pd.DataFrame: One row per candidate
+    """
+    import pandas as pd
+
+    df = pd.DataFrame([
+        {**{key: value for key, value in result.items() if key != 'params'}, 'params': str(result['params'])}
+        for result in results
+    ])
+    for col in ('roc_auc', 'f1', 'accuracy', 'log_loss', 'fit_time_s', 'latency_ms', 'error'):
+        if col not in df.columns:
+            df[col] = np.nan if col != 'error' else None
+    df['within_budget'] = df['latency_ms'] <= latency_budget_ms
+
+    return df.sort_values([metric, 'latency_ms'], ascending=[False, True], na_position='last').reset_index(drop=True)
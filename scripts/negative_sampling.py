@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Negative examples sampled from the Billboard chart archive.
+
+A negative is a real chart song that was eligible for a Grammy year but was
+never nominated. Each archived song is assigned to the ceremony its first
+chart week falls under (entity_resolution.grammy_year_for_chart_date), and
+songs that match any Grammy nomination (exact or fuzzy, see
+GrammySongIndex) are left out.
+
+For each Grammy year, ratio x (nominated songs that year) negatives are
+drawn, stratified by peak position band and genre: every (band, genre)
+stratum gets a share of the year's quota proportional to its share of the
+year's eligible songs, so the negatives follow the chart's own mix rather
+than clustering at the bottom of it. Chart-weeks are collapsed to songs with
+one groupby, and the draw itself is a single lexsort over random keys, so
+there is no Python loop over songs or strata.
+
+Genres come from chart membership: the genre stored with each archived week,
+else the genre chart (archived under its own name, e.g. pop-songs) the song
+ranked best on. Songs with no known genre are only drawn where a year can't
+fill its quota from songs with one, so a missing genre (later filled with a
+default) doesn't mark a row as a negative.
+
+The archive is read WEEKS_PER_BATCH weeks at a time and the per-batch runs
+are combined, so memory is bounded by a batch and the song table.
+
+Usage:
+    runs = archive_song_runs()
+    negatives = sample_negatives(runs, grammy_df, GrammySongIndex(grammy_df))
+"""
+
+import numpy as np
+import pandas as pd
+
+from entity_resolution import grammy_year_for_chart_date, song_keys
+
+
+# Negatives per nominated song, per Grammy year
+NEGATIVE_RATIO = 1.0
+NEGATIVE_SEED = 42
+
+# Peak position bands: 1-10, 11-40, 41 and below
+PEAK_BAND_EDGES = [10, 40]
+PEAK_BAND_LABELS = ['1-10', '11-40', '41+']
+
+# Stratum for songs with no chart or inferred genre
+UNKNOWN_GENRE = 'Unknown'
+
+# Chart archive columns the sampler reads
+ARCHIVE_COLUMNS = ['song_title', 'artist_name', 'peak_position', 'weeks_on_chart', 'genre',
+                   'current_rank', 'chart_date']
+
+# Archived weeks read at a time (about a year)
+WEEKS_PER_BATCH = 52
+
+# Aggregations that collapse chart-weeks (or earlier runs, in date order) into songs.
+# Rows come in date order, so the first chart date is the earliest ('min' on
+# date strings would fall back to a Python loop over groups)
+RUN_AGGREGATIONS = {
+    'song_title': ('song_title', 'first'),
+    'artist_name': ('artist_name', 'first'),
+    'first_chart_date': ('first_chart_date', 'first'),
+    'peak_position': ('peak_position', 'min'),
+    'weeks_on_chart': ('weeks_on_chart', 'max'),
+    'genre': ('genre', 'first'),
+}
+
+
+def chart_song_runs(weeks):
+    """
+    Collapse chart-weeks into one row per song.
+
+    Args:
+        weeks: Chart entries (ARCHIVE_COLUMNS), e.g. from
+            chart_archive.load_chart_archive
+
+    Returns:
+        pd.DataFrame: song_hash, song_title, artist_name, first_chart_date,
+            peak_position (best rank reached), weeks_on_chart, genre (first
+            known) and grammy_year (ceremony of the first chart week)
+    """
+    keys = song_keys(weeks)
+    valid = ((keys['artist_key'] != '') & (keys['title_key'] != '')).to_numpy()
+
+    columns = [col for col in ARCHIVE_COLUMNS if col in weeks.columns]
+    entries = weeks.loc[valid, columns].assign(song_hash=keys['song_hash'].to_numpy()[valid])
+
+    # Best rank seen: the reported peak, or the weekly rank where the peak is missing
+    best_rank = entries['peak_position'].astype(float)
+    if 'current_rank' in entries.columns:
+        best_rank = best_rank.fillna(entries['current_rank'].astype(float))
+    entries['peak_position'] = best_rank
+    entries['first_chart_date'] = entries['chart_date']
+    if 'genre' not in entries.columns:
+        entries['genre'] = None
+
+    return combine_song_runs([entries])
+
+
+def combine_song_runs(parts):
+    """
+    Combine song runs (or chart-weeks) from consecutive stretches of weeks.
+
+    Args:
+        parts: DataFrames with song_hash and the RUN_AGGREGATIONS source
+            columns, in chart date order
+
+    Returns:
+        pd.DataFrame: One run per song (see chart_song_runs)
+    """
+    parts = [part for part in parts if len(part) > 0]
+    if not parts:
+        return pd.DataFrame(columns=['song_hash', *RUN_AGGREGATIONS, 'grammy_year'])
+
+    rows = pd.concat(parts, ignore_index=True)
+    rows['genre'] = rows['genre'].astype(object)
+
+    runs = rows.groupby('song_hash', sort=False).agg(**RUN_AGGREGATIONS).reset_index()
+    runs['grammy_year'] = grammy_year_for_chart_date(runs['first_chart_date']).to_numpy()
+
+    return runs
+
+
+def membership_genres(archive_dir=None, weeks_per_batch=WEEKS_PER_BATCH):
+    """
+    Genre of each song from the archived genre charts it ranked on.
+
+    Args:
+        archive_dir: Chart archive root (chart_archive.ARCHIVE_DIR if None)
+        weeks_per_batch: Archived weeks read at a time
+
+    Returns:
+        pd.Series: Genre by song_hash, from the genre chart with the song's
+            best rank (empty if no genre chart is archived)
+    """
+    from chart_archive import ARCHIVE_DIR, archived_dates, load_chart_archive
+    from ingest_billboard import CHART_GENRES
+
+    archive_dir = archive_dir or ARCHIVE_DIR
+    best = []
+    for order, (chart_name, genre) in enumerate(CHART_GENRES.items()):
+        dates = archived_dates(chart_name, archive_dir)
+        for start in range(0, len(dates), weeks_per_batch):
+            batch = dates[start:start + weeks_per_batch]
+            weeks = load_chart_archive(chart_name, columns=['song_title', 'artist_name', 'current_rank'],
+                                       since=batch[0], until=batch[-1], archive_dir=archive_dir)
+            ranks = pd.DataFrame({
+                'song_hash': song_keys(weeks)['song_hash'].to_numpy(),
+                'rank': weeks['current_rank'].to_numpy(dtype=float),
+                'order': order,
+            })
+            best.append(ranks.sort_values(['rank', 'order'], kind='stable').drop_duplicates('song_hash'))
+
+    if not best:
+        return pd.Series(dtype=object)
+
+    genres = np.array(list(CHART_GENRES.values()), dtype=object)
+    best = pd.concat(best, ignore_index=True).sort_values(['rank', 'order'], kind='stable').drop_duplicates('song_hash')
+    return pd.Series(genres[best['order'].to_numpy()], index=best['song_hash'].to_numpy())
+
+
+def archive_song_runs(chart_name=None, archive_dir=None, weeks_per_batch=WEEKS_PER_BATCH):
+    """
+    Song runs over the whole chart archive, read a batch of weeks at a time.
+
+    Songs without a stored genre get their genre chart membership
+    (membership_genres).
+
+    Args:
+        chart_name: Archived chart (chart_archive.DEFAULT_CHART if None)
+        archive_dir: Chart archive root (chart_archive.ARCHIVE_DIR if None)
+        weeks_per_batch: Archived weeks read at a time
+
+    Returns:
+        tuple: (runs as in chart_song_runs, number of archived weeks)
+    """
+    from chart_archive import ARCHIVE_DIR, DEFAULT_CHART, archived_dates, load_chart_archive
+
+    chart_name = chart_name or DEFAULT_CHART
+    archive_dir = archive_dir or ARCHIVE_DIR
+
+    dates = archived_dates(chart_name, archive_dir)
+    parts = []
+    for start in range(0, len(dates), weeks_per_batch):
+        batch = dates[start:start + weeks_per_batch]
+        weeks = load_chart_archive(chart_name, columns=ARCHIVE_COLUMNS, since=batch[0], until=batch[-1],
+                                   archive_dir=archive_dir)
+        parts.append(chart_song_runs(weeks))
+
+    runs = combine_song_runs(parts)
+    if len(runs) > 0:
+        missing = runs['genre'].isna()
+        if missing.any():
+            genres = membership_genres(archive_dir, weeks_per_batch)
+            runs.loc[missing, 'genre'] = genres.reindex(runs.loc[missing, 'song_hash'].to_numpy()).to_numpy()
+
+    return runs, len(dates)
+
+
+def stratum_quotas(group_sizes, group_years, year_quotas):
+    """
+    Split each year's quota across its strata in proportion to their size.
+
+    Largest-remainder rounding, so the shares add up to the year's quota
+    (capped at the stratum sizes).
+
+    Args:
+        group_sizes: Eligible songs per stratum
+        group_years: Year index of each stratum (0..n_years-1)
+        year_quotas: Negatives wanted per year
+
+    Returns:
+        np.ndarray: Negatives to draw per stratum
+    """
+    year_pool = np.bincount(group_years, weights=group_sizes, minlength=len(year_quotas))
+    wanted = np.minimum(year_quotas, year_pool)
+
+    exact = wanted[group_years] * group_sizes / np.maximum(year_pool[group_years], 1)
+    base = np.floor(exact).astype(np.int64)
+    leftover = (wanted - np.bincount(group_years, weights=base, minlength=len(year_quotas))).astype(np.int64)
+
+    # Hand out the leftover, one each, to the strata with the largest remainders in each year
+    order = np.lexsort((-(exact - base), group_years))
+    year_starts = np.searchsorted(group_years[order], np.arange(len(year_quotas)))
+    rank_in_year = np.arange(len(order)) - year_starts[group_years[order]]
+    extra = np.zeros(len(group_sizes), dtype=np.int64)
+    extra[order] = rank_in_year < leftover[group_years[order]]
+
+    return np.minimum(base + extra, group_sizes)
+
+
+def sample_negatives(runs, grammy_df, song_index, ratio=NEGATIVE_RATIO, seed=NEGATIVE_SEED, genres=None):
+    """
+    Draw stratified negatives for every Grammy year in the data.
+
+    Args:
+        runs: Output of chart_song_runs
+        grammy_df: Grammy DataFrame (nominations per year set the quotas)
+        song_index: GrammySongIndex for grammy_df (matched songs are excluded)
+        ratio: Negatives per nominated song
+        seed: Random seed
+        genres: Optional array of genres to use where a run has none (e.g.
+            inferred from the artist's Grammy categories), aligned with runs
+
+    Returns:
+        pd.DataFrame: Sampled runs (chart_song_runs columns plus peak_band),
+            ordered by Grammy year
+    """
+    runs = runs.copy()
+    if genres is not None:
+        runs['genre'] = runs['genre'].where(runs['genre'].notna(), pd.Series(genres, index=runs.index, dtype=object))
+
+    # Nominated songs per year (the positives the negatives are matched to)
+    nominated = grammy_df[grammy_df['song_title'].notna() & (grammy_df['is_nominated'] == True).fillna(False)]
+    positives = nominated.groupby('year').size()
+
+    years = runs['grammy_year']
+    eligible = years.notna() & years.isin(positives.index)
+    eligible &= song_index.resolve(runs)['grammy_song'].isna()
+    candidates = runs[eligible.to_numpy()].reset_index(drop=True)
+    if len(candidates) == 0:
+        return candidates.assign(peak_band=pd.Series(dtype=object))
+
+    candidates['peak_band'] = np.array(PEAK_BAND_LABELS, dtype=object)[
+        np.searchsorted(PEAK_BAND_EDGES, candidates['peak_position'].fillna(100).to_numpy(), side='left')
+    ]
+    genre_stratum = candidates['genre'].astype(object).where(candidates['genre'].notna(), UNKNOWN_GENRE)
+
+    # Strata: (year, peak band, genre), numbered in sorted order
+    group = candidates.groupby([candidates['grammy_year'], candidates['peak_band'], genre_stratum],
+                               sort=True).ngroup().to_numpy()
+    group_sizes = np.bincount(group)
+    first_of_group = np.unique(group, return_index=True)[1]
+    year_values, group_years = np.unique(candidates['grammy_year'].to_numpy(dtype=np.int64)[first_of_group],
+                                         return_inverse=True)
+    year_quotas = np.round(ratio * positives.reindex(year_values).to_numpy(dtype=float)).astype(np.int64)
+
+    # Songs with a known genre first; songs without one only make up what a year can't fill
+    group_known = (genre_stratum.to_numpy(dtype=object)[first_of_group] != UNKNOWN_GENRE)
+    quotas = stratum_quotas(np.where(group_known, group_sizes, 0), group_years, year_quotas)
+    shortfall = year_quotas - np.bincount(group_years, weights=quotas, minlength=len(year_quotas)).astype(np.int64)
+    quotas += stratum_quotas(np.where(group_known, 0, group_sizes), group_years, shortfall)
+
+    # Random order within each stratum; keep the first `quota` of each
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(candidates)), group))
+    group_starts = np.concatenate(([0], np.cumsum(group_sizes)[:-1]))
+    rank_in_group = np.arange(len(order)) - group_starts[group[order]]
+    chosen = np.sort(order[rank_in_group < quotas[group[order]]])
+
+    return candidates.iloc[chosen].sort_values('grammy_year', kind='stable').reset_index(drop=True)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Batch prediction helpers shared by the Streamlit app and the training scripts.
+
+Scores a whole DataFrame of songs in one vectorized pass: genres are encoded
+once, a single feature matrix is built, and the model is called once for
+probabilities and once for labels. Explanations are built column-wise with
+NumPy/pandas string operations instead of per-row Python.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Model input order (must match scripts/train_baseline.py)
+FEATURE_COLUMNS = [
+    'peak_position',
+    'weeks_on_chart',
+    'artist_past_grammy_noms',
+    'artist_past_grammy_wins',
+    'genre_encoded'
+]
+
+STRONG_GENRES = ['Pop', 'R&B', 'Rap']
+
+
+def build_feature_matrix(model_package, df):
+    """
+    Build the model feature matrix for a DataFrame of songs.
+
+    Args:
+        model_package: Loaded model package
+        df: DataFrame with song features (one row per song)
+
+    Returns:
+        np.ndarray: Feature matrix of shape (len(df), len(FEATURE_COLUMNS))
+    """
+    encoders = model_package['encoders']
+
+    genre_encoded = encoders['genre'].transform(df['genre'].to_numpy())
+
+    return np.column_stack([
+        df['peak_position'].to_numpy(dtype=float),
+        df['weeks_on_chart'].to_numpy(dtype=float),
+        df['artist_past_grammy_noms'].to_numpy(dtype=float),
+        df['artist_past_grammy_wins'].to_numpy(dtype=float),
+        genre_encoded
+    ])
+
+
+def generate_explanations(df, probabilities):
+    """
+    Generate rule-based explanations for a batch of predictions.
+
+    Args:
+        df: DataFrame with song features
+        probabilities: Array of nomination probabilities (0-1), aligned with df
+
+    Returns:
+        pd.Series: Explanation text, indexed like df
+    """
+    peak = df['peak_position'].to_numpy(dtype=float)
+    weeks = df['weeks_on_chart'].to_numpy(dtype=float)
+    noms = df['artist_past_grammy_noms'].to_numpy(dtype=float)
+    wins = df['artist_past_grammy_wins'].to_numpy(dtype=float)
+    genre = df['genre'].astype(str).to_numpy(dtype=object)
+    probabilities = np.asarray(probabilities, dtype=float)
+
+    # Peak position factor
+    peak_text = np.select(
+        [peak <= 5, peak <= 10, peak <= 20],
+        [
+            "🎯 **Top 5 hit** - strong chart performance",
+            "📈 **Top 10 hit** - good chart performance",
+            "📊 Reached Top 20"
+        ],
+        default="⚠️ Lower chart position may reduce chances"
+    )
+
+    # Weeks on chart factor
+    weeks_text = np.select(
+        [weeks >= 20, weeks >= 10],
+        [
+            "⏱️ **Extended chart run** (20+ weeks) - shows longevity",
+            "⏱️ Solid chart presence (10+ weeks)"
+        ],
+        default="⏱️ Brief chart appearance"
+    )
+
+    # Grammy history factor (counts are formatted only for the rows that need them)
+    history_text = np.full(len(df), "🆕 No prior Grammy recognition", dtype=object)
+    has_noms = noms > 0
+    has_wins = wins > 0
+    history_text[has_noms] = [
+        f"🎵 **Grammy nominee** ({int(n)} nominations)" for n in noms[has_noms]
+    ]
+    history_text[has_wins] = [
+        f"🏆 **Grammy winner** ({int(w)} wins) - proven track record" for w in wins[has_wins]
+    ]
+
+    # Genre factor
+    genre_suffix = np.where(
+        np.isin(genre, STRONG_GENRES),
+        " genre - historically strong Grammy presence",
+        " genre"
+    )
+    genre_text = "🎼 " + genre + genre_suffix.astype(object)
+
+    # Overall assessment
+    verdict = np.select(
+        [probabilities >= 0.8, probabilities >= 0.6, probabilities >= 0.4, probabilities >= 0.2],
+        [
+            "**Very High** nomination likelihood - strong across all factors",
+            "**High** nomination likelihood - favorable indicators",
+            "**Moderate** nomination likelihood - mixed signals",
+            "**Low** nomination likelihood - some challenges"
+        ],
+        default="**Very Low** nomination likelihood - multiple limiting factors"
+    )
+
+    explanations = (
+        pd.Series(peak_text, index=df.index, dtype=object)
+        + "\n\n" + pd.Series(weeks_text, index=df.index, dtype=object)
+        + "\n\n" + pd.Series(history_text, index=df.index, dtype=object)
+        + "\n\n" + pd.Series(genre_text, index=df.index, dtype=object)
+        + "\n\n**Assessment:** " + pd.Series(verdict, index=df.index, dtype=object)
+    )
+
+    return explanations
+
+
+def generate_explanation(row, probability):
+    """
+    Generate rule-based explanation for a single prediction.
+
+    Args:
+        row: DataFrame row (or dict) with song features
+        probability: Nomination probability (0-1)
+
+    Returns:
+        str: Explanation text
+    """
+    df = pd.DataFrame([dict(row)])
+    return generate_explanations(df, [probability]).iloc[0]
+
+
+def predict_batch(model_package, df, explain=True):
+    """
+    Make predictions for a batch of songs in one vectorized pass.
+
+    Args:
+        model_package: Loaded model package
+        df: DataFrame with song features (one row per song)
+        explain: Whether to generate explanation text
+
+    Returns:
+        pd.DataFrame: Columns 'probability', 'prediction' (and 'explanation'
+            when explain=True), indexed like df
+    """
+    result = pd.DataFrame(index=df.index)
+
+    if len(df) == 0:
+        result['probability'] = pd.Series(dtype=float)
+        result['prediction'] = pd.Series(dtype=int)
+        if explain:
+            result['explanation'] = pd.Series(dtype=object)
+        return result
+
+    model = model_package['model']
+    X = build_feature_matrix(model_package, df)
+
+    result['probability'] = model.predict_proba(X)[:, 1]
+    result['prediction'] = model.predict(X)
+
+    if explain:
+        result['explanation'] = generate_explanations(df, result['probability'].to_numpy())
+
+    return result
+
+
+def predict_for_song(model_package, song_data):
+    """
+    Make prediction for a single song.
+
+    Args:
+        model_package: Loaded model package
+        song_data: Dictionary with song features
+
+    Returns:
+        tuple: (probability, prediction, explanation)
+    """
+    result = predict_batch(model_package, pd.DataFrame([song_data])).iloc[0]
+
+    return result['probability'], result['prediction'], result['explanation']
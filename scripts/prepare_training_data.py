@@ -5,234 +5,375 @@ Merges Billboard and Grammy data, engineers features, creates training.csv
 
 Usage:
     python scripts/prepare_training_data.py
+    python scripts/prepare_training_data.py --chunk-size 50000   # streamed, bounded memory
+    python scripts/prepare_training_data.py --negative-ratio 2     # negatives per nominated song
     
 Output:
-    data/processed/training.csv
+    data/processed/training.parquet (and training.csv)
+    data/processed/training_parts/part-NNNNN.parquet (streamed builds, one per chunk)
 """
 
+import argparse
+import itertools
 import pandas as pd
 import numpy as np
 import os
-from datetime import datetime
-import re
 
+from artist_normalizer import ArtistResolver, save_alias_table
+from entity_resolution import GrammySongIndex, grammy_year_for_chart_date, song_keys
+from grammy_events import GRAMMY_EVENTS_PATH, GrammyEventStore
+from negative_sampling import NEGATIVE_RATIO, NEGATIVE_SEED, archive_song_runs, sample_negatives
+from storage import TableWriter, base_path_of, iter_table, read_table, table_exists, table_path, write_table
 
-def load_billboard_data():
-    """Load most recent Billboard Hot 100 data."""
+
+GRAMMY_HISTORY_PATH = 'data/raw/grammy_history'
+TRAINING_DATA_PATH = 'data/processed/training'
+TRAINING_PARTITIONS_DIR = 'data/processed/training_parts'
+
+# Columns read from each input (the rest of the raw schema is never used here)
+BILLBOARD_COLUMNS = ['song_title', 'artist_name', 'current_rank', 'peak_position', 'weeks_on_chart', 'genre', 'chart_date']
+GRAMMY_COLUMNS = ['year', 'category', 'song_title', 'artist_name', 'is_nominated', 'is_winner']
+
+# Training table columns, in order; numeric and label columns get a fixed
+# dtype so every chunk of a streamed build has the same schema (None: as built)
+TRAINING_DTYPES = {
+    'song_title': None,
+    'artist_name': None,
+    'peak_position': 'float64',
+    'weeks_on_chart': 'float64',
+    'genre': None,
+    'artist_past_grammy_noms': 'int64',
+    'artist_past_grammy_wins': 'int64',
+    'label_type': None,
+    'release_month': 'float64',
+    'is_nominated': 'boolean',
+    'grammy_year': 'float64',
+    'grammy_category': None,
+    'data_source': None,
+    # This week's chart position of current Billboard rows (shown with their
+    # predictions; not a model feature)
+    'current_rank': 'float64',
+    # Chart-trajectory features up to the end of the row's Grammy year (trajectory_features.py;
+    # missing for songs not in the chart archive by then)
+    'debut_rank': 'float64',
+    'weeks_in_top10': 'float64',
+    'rank_auc': 'float64',
+    'velocity': 'float64',
+    're_entries': 'float64',
+}
+
+
+# Grammy category keyword -> genre, checked in order
+CATEGORY_GENRES = [
+    (('pop',), 'Pop'),
+    (('rap', 'hip hop'), 'Rap'),
+    (('r&b', 'r & b'), 'R&B'),
+    (('rock',), 'Rock'),
+    (('country',), 'Country'),
+    (('alternative',), 'Alternative'),
+]
+
+
+def latest_billboard_path():
+    """Path (without extension) of the most recent Billboard Hot 100 data."""
     # Find most recent billboard file (try hot100 first, then top10 for backwards compatibility)
-    billboard_files = [f for f in os.listdir('data/raw') if f.startswith('billboard_hot100_') or f.startswith('billboard_top10_')]
+    billboard_files = {
+        base_path_of(f) for f in os.listdir('data/raw')
+        if (f.startswith('billboard_hot100_') or f.startswith('billboard_top10_'))
+        and f.endswith(('.csv', '.parquet'))
+    }
     
     if not billboard_files:
         raise FileNotFoundError("No Billboard data found. Run scripts/ingest_billboard.py first.")
     
     # Get most recent
     latest_file = sorted(billboard_files)[-1]
-    filepath = f'data/raw/{latest_file}'
     
-    print(f"Loading Billboard data: {latest_file}")
-    df = pd.read_csv(filepath)
+    return f'data/raw/{latest_file}'
+
+
+def load_billboard_data():
+    """Load most recent Billboard Hot 100 data."""
+    filepath = latest_billboard_path()
+    
+    print(f"Loading Billboard data: {os.path.basename(table_path(filepath))}")
+    df = read_table(filepath, columns=BILLBOARD_COLUMNS)
     print(f"  ✓ Loaded {len(df)} Billboard records")
     
     return df
 
 
+def iter_billboard_data(chunk_size):
+    """
+    Stream the most recent Billboard Hot 100 data in chunks.
+    
+    Args:
+        chunk_size: Rows per chunk
+        
+    Yields:
+        pd.DataFrame: Billboard records (BILLBOARD_COLUMNS)
+    """
+    filepath = latest_billboard_path()
+    
+    print(f"Streaming Billboard data: {os.path.basename(table_path(filepath))}")
+    yield from iter_table(filepath, columns=BILLBOARD_COLUMNS, chunk_size=chunk_size)
+
+
 def load_grammy_data():
     """Load Grammy historical data."""
-    filepath = 'data/raw/grammy_history.csv'
+    filepath = GRAMMY_HISTORY_PATH
     
-    if not os.path.exists(filepath):
+    if not table_exists(filepath):
         raise FileNotFoundError("No Grammy data found. Run scripts/scrape_grammy_real.py first.")
     
-    print(f"Loading Grammy data: {filepath}")
-    df = pd.read_csv(filepath)
+    print(f"Loading Grammy data: {table_path(filepath)}")
+    df = read_table(filepath, columns=GRAMMY_COLUMNS)
     print(f"  ✓ Loaded {len(df)} Grammy records")
     
     return df
 
 
-def normalize_artist_name(name):
+def genre_from_category(category):
     """
-    Normalize artist names for matching.
-    Handles featuring artists, case, punctuation.
-    """
-    if pd.isna(name):
-        return ""
-    
-    name = str(name).lower().strip()
-    
-    # Remove featuring/feat/ft
-    name = re.sub(r'\s+(feat\.|featuring|feat|ft\.?|&)\s+.*', '', name)
+    Map a Grammy category name to a genre.
     
-    # Remove punctuation
-    name = re.sub(r'[^\w\s]', '', name)
-    
-    # Remove extra whitespace
-    name = ' '.join(name.split())
-    
-    return name
+    Args:
+        category: Grammy category (e.g., 'Best Rap Song')
+        
+    Returns:
+        str: Genre, or None if the category is not genre-specific
+    """
+    cat_lower = str(category).lower()
+    for keywords, genre in CATEGORY_GENRES:
+        if any(keyword in cat_lower for keyword in keywords):
+            return genre
+    return None
 
 
-def calculate_artist_grammy_history(billboard_df, grammy_df):
+class ArtistGrammyIndex:
     """
-    Calculate Grammy nomination/win history for each artist in Billboard data.
+    Grammy history keyed by normalized artist name.
     
-    Args:
-        billboard_df: Billboard DataFrame
-        grammy_df: Grammy DataFrame
-        
-    Returns:
-        dict: {artist_name: {'noms': count, 'wins': count}}
+    Backed by a GrammyEventStore (built from the Grammy DataFrame unless one is
+    passed in): "prior noms/wins before year Y" is a search over the store's
+    (artist, year) index, for one artist or a whole column at once. Each
+    artist's genre is resolved once from their categories.
     """
-    print("\nCalculating artist Grammy history...")
     
-    artist_history = {}
+    def __init__(self, grammy_df=None, events=None):
+        if events is None:
+            events = GrammyEventStore.from_frame(grammy_df)
+        self.events = events
+        
+        # Genre from the first genre-specific category the artist appears in
+        # (events in source order), 'Pop' if none match
+        category_genres = np.array([genre_from_category(cat) for cat in events.categories] + [None], dtype=object)
+        event_genres = category_genres[events.category]
+        has_genre = pd.notna(event_genres)
+        genre_artists, first = np.unique(events.artist[has_genre], return_index=True)
+        
+        self._genres = np.full(len(events.artists), 'Pop', dtype=object)
+        self._genres[genre_artists] = event_genres[has_genre][first]
+        
+        # Billboard spellings that miss an exact key fall back to fuzzy matching
+        self._resolver = ArtistResolver(events.artists)
     
-    for artist in billboard_df['artist_name'].unique():
-        if pd.isna(artist):
-            continue
+    def resolve(self, artist_name):
+        """
+        Map an artist name to its key in the index.
         
-        # Normalize for matching
-        norm_artist = normalize_artist_name(artist)
+        Args:
+            artist_name: Raw artist name
+            
+        Returns:
+            str: Normalized artist key, or None if the artist is not indexed
+        """
+        return self._resolver.resolve(artist_name)
+    
+    def resolve_ids(self, artist_names):
+        """
+        Map a column of artist names to event store artist ids.
         
-        # Find Grammy records for this artist
-        grammy_matches = grammy_df[
-            grammy_df['artist_name'].apply(normalize_artist_name) == norm_artist
-        ]
+        Exact normalized matches are looked up in one pass; only the
+        remaining distinct names go through fuzzy matching.
         
-        noms = len(grammy_matches[grammy_matches['is_nominated'] == True])
-        wins = len(grammy_matches[grammy_matches['is_winner'] == True])
+        Args:
+            artist_names: Raw artist names
+            
+        Returns:
+            np.ndarray: Artist ids (-1 for artists not indexed)
+        """
+        names = pd.Series(artist_names, dtype=object).reset_index(drop=True)
+        ids = self.events.artist_ids(names)
         
-        artist_history[artist] = {
-            'noms': noms,
-            'wins': wins
-        }
+        misses = (ids < 0) & names.notna().to_numpy()
+        if misses.any():
+            keys = {name: self.resolve(name) for name in names[misses].unique()}
+            ids[misses] = self.events.key_ids(names[misses].map(keys))
         
-        if noms > 0:
-            print(f"  {artist}: {noms} nominations, {wins} wins")
+        return ids
+    
+    def __contains__(self, artist_name):
+        return self.resolve(artist_name) is not None
     
-    return artist_history
+    def history_many(self, artist_names, before_years=None):
+        """
+        Grammy nominations/wins for a column of artists.
+        
+        Args:
+            artist_names: Raw artist names
+            before_years: Only count Grammy years strictly before these (one
+                per artist, or a single year); None counts the full history
+            
+        Returns:
+            tuple: (nominations, wins) as int arrays
+        """
+        return self.events.history(self.resolve_ids(artist_names), before_years)
+    
+    def history(self, artist_name, before_year=None):
+        """
+        Grammy nominations/wins for an artist.
+        
+        Args:
+            artist_name: Artist name (raw or normalized)
+            before_year: Only count Grammy years strictly before this one
+                (None counts the full history)
+            
+        Returns:
+            dict: {'noms': count, 'wins': count}
+        """
+        noms, wins = self.history_many([artist_name], before_year)
+        return {'noms': int(noms[0]), 'wins': int(wins[0])}
+    
+    def genres_many(self, artist_names):
+        """
+        Genres inferred from Grammy categories for a column of artists.
+        
+        Args:
+            artist_names: Raw artist names
+            
+        Returns:
+            np.ndarray: Genres (None for artists with no Grammy records)
+        """
+        return self.genres_of(self.resolve_ids(artist_names))
+    
+    def genres_of(self, artist_ids):
+        """
+        Genres for event store artist ids.
+        
+        Args:
+            artist_ids: Artist ids from resolve_ids
+            
+        Returns:
+            np.ndarray: Genres (None for -1)
+        """
+        artist_ids = np.asarray(artist_ids)
+        genres = np.full(len(artist_ids), None, dtype=object)
+        known = artist_ids >= 0
+        genres[known] = self._genres[artist_ids[known]]
+        return genres
+    
+    def genre(self, artist_name):
+        """
+        Genre inferred from the artist's Grammy categories.
+        
+        Args:
+            artist_name: Artist name (raw or normalized)
+            
+        Returns:
+            str: Inferred genre, or None if the artist has no Grammy records
+        """
+        return self.genres_many([artist_name])[0]
 
 
-def infer_genre(song_title, artist_name, grammy_df):
+def load_grammy_events(grammy_df):
     """
-    Infer genre from Grammy category if artist/song appears in Grammy data.
-    Otherwise return None for manual filling.
+    Load the Grammy event store, rebuilding it if the Grammy table is newer.
     
     Args:
-        song_title: Song title
-        artist_name: Artist name
-        grammy_df: Grammy DataFrame
+        grammy_df: Grammy DataFrame (as loaded from GRAMMY_HISTORY_PATH)
         
     Returns:
-        str: Inferred genre or None
+        GrammyEventStore: Grammy nominations
     """
-    # Normalize for matching
-    norm_artist = normalize_artist_name(artist_name)
-    
-    # Look for matches in Grammy data
-    matches = grammy_df[
-        grammy_df['artist_name'].apply(normalize_artist_name) == norm_artist
-    ]
-    
-    if len(matches) == 0:
-        return None
+    if (os.path.exists(GRAMMY_EVENTS_PATH)
+            and os.path.getmtime(GRAMMY_EVENTS_PATH) >= os.path.getmtime(table_path(GRAMMY_HISTORY_PATH))):
+        events = GrammyEventStore.load(GRAMMY_EVENTS_PATH)
+        print(f"  ✓ Loaded {len(events)} Grammy events from {GRAMMY_EVENTS_PATH}")
+        return events
     
-    # Infer genre from category
-    categories = matches['category'].unique()
+    events = GrammyEventStore.from_frame(grammy_df)
+    events.save(GRAMMY_EVENTS_PATH)
+    print(f"  ✓ Indexed {len(events)} Grammy events ({len(events.artists)} artists) to {GRAMMY_EVENTS_PATH}")
     
-    for cat in categories:
-        cat_lower = cat.lower()
-        if 'pop' in cat_lower:
-            return 'Pop'
-        elif 'rap' in cat_lower or 'hip hop' in cat_lower:
-            return 'Rap'
-        elif 'r&b' in cat_lower or 'r & b' in cat_lower:
-            return 'R&B'
-        elif 'rock' in cat_lower:
-            return 'Rock'
-        elif 'country' in cat_lower:
-            return 'Country'
-        elif 'alternative' in cat_lower:
-            return 'Alternative'
-    
-    return 'Pop'  # Default fallback
+    return events
+
+
+def _slices(df, chunk_size):
+    """Consecutive row slices of a DataFrame (one slice if chunk_size is None)."""
+    if chunk_size is None:
+        chunk_size = max(len(df), 1)
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
 
 
-def create_training_dataset(billboard_df, grammy_df):
+def _conform(df):
+    """Cast a chunk of training records to TRAINING_DTYPES (so chunks share one schema)."""
+    return df.astype({col: dtype for col, dtype in TRAINING_DTYPES.items() if dtype is not None and col in df.columns})
+
+
+def grammy_historical_records(grammy_df, index, chunk_size=None):
     """
-    Create training dataset by combining Billboard and Grammy data.
+    Part 1: Grammy historical data (labeled training examples).
     
-    Strategy:
-    1. Use Grammy historical data as training examples (with labels)
-    2. Add Billboard current data as prediction targets (no labels yet)
+    Prior nominations/wins (before each row's year) and genres are looked up
+    for a whole chunk at once.
     
     Args:
-        billboard_df: Billboard DataFrame
         grammy_df: Grammy DataFrame
+        index: ArtistGrammyIndex for grammy_df
+        chunk_size: Rows per chunk (None for a single chunk)
         
-    Returns:
-        pd.DataFrame: Training dataset
+    Yields:
+        pd.DataFrame: Training records
     """
-    print("\nCreating training dataset...")
-    
-    # Calculate artist Grammy history
-    artist_history = calculate_artist_grammy_history(billboard_df, grammy_df)
-    
-    training_records = []
-    
-    # Part 1: Grammy historical data (labeled training examples)
     print("\nProcessing Grammy historical data...")
-    for _, row in grammy_df.iterrows():
-        if pd.isna(row['song_title']):  # Skip Best New Artist entries
-            continue
-        
-        # Get artist history (excluding current nomination)
-        artist = row['artist_name']
-        norm_artist = normalize_artist_name(artist)
-        
-        # Count prior nominations/wins (before this year)
-        prior_grammy = grammy_df[
-            (grammy_df['artist_name'].apply(normalize_artist_name) == norm_artist) &
-            (grammy_df['year'] < row['year'])
-        ]
-        
-        prior_noms = len(prior_grammy[prior_grammy['is_nominated'] == True])
-        prior_wins = len(prior_grammy[prior_grammy['is_winner'] == True])
-        
-        # Infer genre from category
-        genre = infer_genre(row['song_title'], artist, grammy_df)
-        
-        record = {
-            'song_title': row['song_title'],
-            'artist_name': artist,
-            'peak_position': None,  # Not available for historical Grammy data
-            'weeks_on_chart': None,
-            'genre': genre,
+    historical = grammy_df[grammy_df['song_title'].notna()]  # Skip Best New Artist entries
+    
+    for chunk in _slices(historical, chunk_size):
+        artist_ids = index.resolve_ids(chunk['artist_name'])
+        prior_noms, prior_wins = index.events.history(artist_ids, chunk['year'].to_numpy())
+        
+        yield _conform(pd.DataFrame({
+            'song_title': chunk['song_title'].to_numpy(),
+            'artist_name': chunk['artist_name'].to_numpy(),
+            'peak_position': np.nan,  # Not available for historical Grammy data
+            'weeks_on_chart': np.nan,
+            'genre': index.genres_of(artist_ids),
             'artist_past_grammy_noms': prior_noms,
             'artist_past_grammy_wins': prior_wins,
             'label_type': None,  # Optional
             'release_month': None,
-            'is_nominated': row['is_nominated'],
-            'grammy_year': row['year'],
-            'grammy_category': row['category'],
-            'data_source': 'grammy_historical'
-        }
-        
-        training_records.append(record)
-    
-    print(f"  ✓ Added {len(training_records)} Grammy historical records")
+            'is_nominated': chunk['is_nominated'].to_numpy(dtype=object),
+            'grammy_year': chunk['year'].to_numpy(dtype=float),
+            'grammy_category': chunk['category'].to_numpy(),
+            'data_source': 'grammy_historical',
+            'current_rank': np.nan
+        }))
+    
+    print(f"  ✓ Added {len(historical)} Grammy historical records")
+
+
+def synthetic_negative_records():
+    """
+    Part 2 fallback: synthetic negative examples, used when there is no
+    chart archive to sample from.
     
-    # Part 2: Create negative examples (songs NOT nominated)
-    # Use Billboard songs that don't appear in Grammy data as negative examples
+    Yields:
+        pd.DataFrame: Training records
+    """
     print("\nCreating negative examples (non-nominated songs)...")
     
-    # Get all Grammy-nominated songs
-    grammy_songs = set()
-    for _, row in grammy_df.iterrows():
-        if not pd.isna(row['song_title']):
-            key = (normalize_artist_name(row['artist_name']), row['song_title'].lower().strip())
-            grammy_songs.add(key)
-    
     # Generate synthetic negative examples
     # These are plausible songs that didn't get nominated
     negative_examples = [
@@ -250,73 +391,300 @@ def create_training_dataset(billboard_df, grammy_df):
         {'song_title': 'Track 5', 'artist_name': 'New Artist 5', 'peak_position': 70, 'weeks_on_chart': 2, 'genre': 'Pop', 'artist_past_grammy_noms': 0, 'artist_past_grammy_wins': 0},
     ]
     
-    for neg in negative_examples:
-        record = {
-            'song_title': neg['song_title'],
-            'artist_name': neg['artist_name'],
-            'peak_position': neg['peak_position'],
-            'weeks_on_chart': neg['weeks_on_chart'],
-            'genre': neg['genre'],
-            'artist_past_grammy_noms': neg['artist_past_grammy_noms'],
-            'artist_past_grammy_wins': neg['artist_past_grammy_wins'],
+    negatives = pd.DataFrame(negative_examples)
+    negatives['label_type'] = None
+    negatives['release_month'] = None
+    negatives['is_nominated'] = False  # Negative example
+    negatives['grammy_year'] = None
+    negatives['grammy_category'] = None
+    negatives['data_source'] = 'synthetic_negative'
+    negatives['current_rank'] = np.nan
+    
+    yield _conform(negatives[[col for col in TRAINING_DTYPES if col in negatives.columns]])
+    
+    print(f"  ✓ Added {len(negative_examples)} negative examples")
+
+
+def chart_negative_records(grammy_df, index, song_index, ratio=NEGATIVE_RATIO, chunk_size=None):
+    """
+    Part 2: Negative examples (songs NOT nominated).
+    
+    Real chart songs from each Grammy year's eligibility window that were
+    never nominated, sampled from the chart archive stratified by peak
+    position and genre (negative_sampling.py). The archive is read about a
+    year of weeks at a time, so memory stays bounded by the song table. Falls
+    back to the synthetic negatives when the archive is empty or ratio is 0.
+    
+    Args:
+        grammy_df: Grammy DataFrame
+        index: ArtistGrammyIndex
+        song_index: GrammySongIndex
+        ratio: Negatives per nominated song, per Grammy year
+        chunk_size: Rows per chunk (None for a single chunk)
+        
+    Yields:
+        pd.DataFrame: Training records
+    """
+    if ratio <= 0:
+        yield from synthetic_negative_records()
+        return
+    
+    print("\nSampling negative examples from the chart archive...")
+    
+    runs, n_weeks = archive_song_runs()
+    if len(runs) == 0:
+        print("  ⚠️  No chart archive (run scripts/chart_archive.py); using synthetic negatives")
+        yield from synthetic_negative_records()
+        return
+    
+    negatives = sample_negatives(runs, grammy_df, song_index, ratio=ratio, seed=NEGATIVE_SEED,
+                                 genres=index.genres_many(runs['artist_name']))
+    
+    if len(negatives) == 0:
+        print(f"  ⚠️  No eligible chart songs among {len(runs)} archived songs; using synthetic negatives")
+        yield from synthetic_negative_records()
+        return
+    
+    for chunk in _slices(negatives, chunk_size):
+        artist_ids = index.resolve_ids(chunk['artist_name'])
+        prior_noms, prior_wins = index.events.history(artist_ids, chunk['grammy_year'].to_numpy(dtype=np.int64))
+        
+        yield _conform(pd.DataFrame({
+            'song_title': chunk['song_title'].to_numpy(),
+            'artist_name': chunk['artist_name'].to_numpy(),
+            'peak_position': chunk['peak_position'].to_numpy(),
+            'weeks_on_chart': chunk['weeks_on_chart'].to_numpy(),
+            'genre': chunk['genre'].to_numpy(dtype=object),
+            'artist_past_grammy_noms': prior_noms,
+            'artist_past_grammy_wins': prior_wins,
             'label_type': None,
             'release_month': None,
-            'is_nominated': False,  # Negative example
-            'grammy_year': None,
+            'is_nominated': False,  # Charted in the eligibility window, never nominated
+            'grammy_year': chunk['grammy_year'].to_numpy(dtype=float),
             'grammy_category': None,
-            'data_source': 'synthetic_negative'
-        }
-        training_records.append(record)
+            'data_source': 'chart_negative',
+            'current_rank': np.nan
+        }))
     
-    print(f"  ✓ Added {len(negative_examples)} negative examples")
+    print(f"  ✓ Added {len(negatives)} negative examples from {len(runs)} archived songs "
+          f"({n_weeks} chart weeks, {negatives['grammy_year'].nunique()} Grammy years)")
+
+
+def _collapse_song_years(records):
+    """
+    One labeled chart record per song and Grammy year.
     
-    # Part 3: Billboard current data (prediction targets)
-    print("\nProcessing Billboard current data...")
-    for _, row in billboard_df.iterrows():
-        artist = row['artist_name']
+    Keeps the best peak, the longest run and the first known genre, so a hit
+    that charted for months counts once. Applying it again to its own output
+    (e.g. to per-chunk results) gives the same records.
+    
+    Args:
+        records: Labeled chart records with song_hash and grammy_year
         
-        # Get artist Grammy history
-        history = artist_history.get(artist, {'noms': 0, 'wins': 0})
+    Returns:
+        pd.DataFrame: Collapsed records, in order of first appearance
+    """
+    return records.groupby(['song_hash', 'grammy_year'], sort=False).agg(
+        song_title=('song_title', 'first'),
+        artist_name=('artist_name', 'first'),
+        peak_position=('peak_position', 'min'),
+        weeks_on_chart=('weeks_on_chart', 'max'),
+        genre=('genre', 'first'),
+        is_nominated=('is_nominated', 'first'),
+        grammy_category=('grammy_category', 'first'),
+    ).reset_index()
+
+
+def billboard_records(billboard_chunks, index, song_index, latest_grammy_year=None, chunk_size=None):
+    """
+    Part 3: Billboard chart data.
+    
+    Songs are labeled per chart week for the Grammy ceremony whose
+    eligibility window the week falls in (entity_resolution.py: hashed song
+    keys, one join per chunk). Unlabeled weeks are the prediction targets and
+    are passed through with the artist's full Grammy history (weeks of a
+    nominated song that fall in an earlier ceremony's window are dropped). Labeled weeks
+    are collapsed to one record per song and Grammy year, with the artist's
+    history before that year, and yielded after all chunks are read as
+    'billboard_labeled' (only unlabeled weeks are 'billboard_current').
+    
+    Args:
+        billboard_chunks: Iterable of Billboard DataFrames
+        index: ArtistGrammyIndex
+        song_index: GrammySongIndex
+        latest_grammy_year: Last ceremony year in the Grammy data
+        chunk_size: Rows per chunk of labeled records (None for a single chunk)
         
-        # Infer genre
-        genre = infer_genre(row['song_title'], artist, grammy_df)
+    Yields:
+        pd.DataFrame: Training records
+    """
+    print("\nProcessing Billboard current data...")
+    total = 0
+    with_history = 0
+    labeled_weeks = 0
+    skipped = 0
+    matched = pd.Series(dtype=int)
+    song_years = []
+    
+    for chunk in billboard_chunks:
+        chunk = song_index.label(chunk, latest_grammy_year=latest_grammy_year)
+        matched = matched.add(chunk['grammy_match'].value_counts(), fill_value=0)
+        
+        # Genre from chart membership (ingest_billboard), else inferred from Grammy data
+        genre = chunk['genre'].to_numpy(dtype=object) if 'genre' in chunk.columns else np.full(len(chunk), None, dtype=object)
+        missing_genre = pd.isna(genre)
+        if missing_genre.any():
+            genre[missing_genre] = index.genres_many(chunk['artist_name'][missing_genre])
         
-        record = {
-            'song_title': row['song_title'],
-            'artist_name': artist,
-            'peak_position': row['peak_position'],
-            'weeks_on_chart': row['weeks_on_chart'],
+        records = pd.DataFrame({
+            'song_title': chunk['song_title'].to_numpy(),
+            'artist_name': chunk['artist_name'].to_numpy(),
+            'peak_position': chunk['peak_position'].to_numpy(),
+            'weeks_on_chart': chunk['weeks_on_chart'].to_numpy(),
             'genre': genre,
-            'artist_past_grammy_noms': history['noms'],
-            'artist_past_grammy_wins': history['wins'],
+            'artist_past_grammy_noms': 0,  # Filled in below
+            'artist_past_grammy_wins': 0,
             'label_type': None,
             'release_month': None,
-            'is_nominated': None,  # Unknown - to be predicted
-            'grammy_year': None,
-            'grammy_category': None,
-            'data_source': 'billboard_current'
-        }
+            'is_nominated': chunk['is_nominated'].to_numpy(dtype=object),  # Missing: unknown, to be predicted
+            'grammy_year': chunk['grammy_year'].to_numpy(dtype=float),
+            'grammy_category': chunk['grammy_category'].to_numpy(dtype=object),
+            'data_source': 'billboard_current',
+            'current_rank': chunk['current_rank'].to_numpy(dtype=float) if 'current_rank' in chunk.columns else np.nan
+        })
+        
+        labeled = chunk['is_nominated'].notna().to_numpy()
+        if labeled.any():
+            weeks = records[labeled]
+            song_years.append(_collapse_song_years(weeks.assign(song_hash=song_keys(weeks)['song_hash'].to_numpy())))
+            labeled_weeks += int(labeled.sum())
+        
+        # Weeks of a nominated song outside that nomination's window, at a
+        # ceremony already held, are neither examples nor prediction targets
+        past = np.zeros(len(chunk), dtype=bool)
+        if 'chart_date' in chunk.columns and latest_grammy_year is not None:
+            past = (grammy_year_for_chart_date(chunk['chart_date']) <= latest_grammy_year).fillna(False).to_numpy()
+        ineligible = ~labeled & chunk['grammy_match'].notna().to_numpy() & past
+        skipped += int(ineligible.sum())
         
-        training_records.append(record)
+        current = records[~labeled & ~ineligible]
+        if len(current) > 0:
+            noms, wins = index.history_many(current['artist_name'])
+            with_history += int((noms > 0).sum())
+            total += len(current)
+            yield _conform(current.assign(artist_past_grammy_noms=noms, artist_past_grammy_wins=wins))
+    
+    if matched.sum() > 0:
+        print(f"  ✓ Matched {int(matched.sum())} chart songs to Grammy nominations "
+              f"({int(matched.get('exact', 0))} exact, {int(matched.get('fuzzy', 0))} fuzzy)")
+    print(f"  ✓ {with_history} chart entries by artists with Grammy history")
+    if skipped:
+        print(f"  ✓ Skipped {skipped} chart-weeks of nominated songs outside their Grammy year")
+    print(f"  ✓ Added {total} Billboard current records")
+    
+    if not song_years:
+        return
+    
+    song_years = _collapse_song_years(pd.concat(song_years, ignore_index=True))
+    for part in _slices(song_years, chunk_size):
+        artist_ids = index.resolve_ids(part['artist_name'])
+        prior_noms, prior_wins = index.events.history(artist_ids, part['grammy_year'].to_numpy(dtype=np.int64))
+        
+        yield _conform(pd.DataFrame({
+            'song_title': part['song_title'].to_numpy(),
+            'artist_name': part['artist_name'].to_numpy(),
+            'peak_position': part['peak_position'].to_numpy(),
+            'weeks_on_chart': part['weeks_on_chart'].to_numpy(),
+            'genre': part['genre'].to_numpy(dtype=object),
+            'artist_past_grammy_noms': prior_noms,
+            'artist_past_grammy_wins': prior_wins,
+            'label_type': None,
+            'release_month': None,
+            'is_nominated': part['is_nominated'].to_numpy(dtype=object),
+            'grammy_year': part['grammy_year'].to_numpy(dtype=float),
+            'grammy_category': part['grammy_category'].to_numpy(dtype=object),
+            'data_source': 'billboard_labeled',
+            'current_rank': np.nan  # A song-year spans many weeks
+        }))
+    
+    print(f"  ✓ Added {len(song_years)} labeled chart songs (one per song and Grammy year, "
+          f"from {labeled_weeks} chart-weeks)")
+
+
+def training_record_chunks(billboard_chunks, grammy_df, events=None, chunk_size=None, negative_ratio=NEGATIVE_RATIO):
+    """
+    Stream training records from all three parts, chunk by chunk.
     
-    print(f"  ✓ Added {len(billboard_df)} Billboard current records")
+    The Grammy indexes and chart trajectories are built once up front (the
+    Grammy table is small, trajectories are cached per chart date); Billboard
+    input is consumed one chunk at a time.
     
-    df = pd.DataFrame(training_records)
+    Args:
+        billboard_chunks: Iterable of Billboard DataFrames
+        grammy_df: Grammy DataFrame
+        events: GrammyEventStore for grammy_df (built from it if None)
+        chunk_size: Rows per Grammy chunk (None for a single chunk)
+        negative_ratio: Negatives per nominated song (see chart_negative_records)
+        
+    Yields:
+        pd.DataFrame: Training records (TRAINING_DTYPES columns)
+    """
+    from trajectory_features import TrajectoryStore, add_trajectory_features
+    
+    # Build the Grammy indexes once and share them across all lookups
+    index = ArtistGrammyIndex(grammy_df, events)
+    song_index = GrammySongIndex(grammy_df)
+    
+    print("\nLoading chart trajectories...")
+    trajectories = TrajectoryStore().features()
+    print(f"  ✓ {trajectories.index.get_level_values('song_hash').nunique()} songs with chart trajectories")
+    
+    parts = itertools.chain(
+        grammy_historical_records(grammy_df, index, chunk_size),
+        chart_negative_records(grammy_df, index, song_index, negative_ratio, chunk_size),
+        billboard_records(billboard_chunks, index, song_index, latest_grammy_year=grammy_df['year'].max(),
+                          chunk_size=chunk_size),
+    )
+    for chunk in parts:
+        yield _conform(add_trajectory_features(chunk, trajectories))
+
+
+def create_training_dataset(billboard_df, grammy_df, events=None, negative_ratio=NEGATIVE_RATIO):
+    """
+    Create training dataset by combining Billboard and Grammy data.
     
-    return df
+    Strategy:
+    1. Use Grammy historical data as training examples (with labels)
+    2. Add Billboard current data as prediction targets (no labels yet)
+    
+    Args:
+        billboard_df: Billboard DataFrame
+        grammy_df: Grammy DataFrame
+        events: GrammyEventStore for grammy_df (built from it if None)
+        negative_ratio: Negatives per nominated song (see chart_negative_records)
+        
+    Returns:
+        pd.DataFrame: Training dataset
+    """
+    print("\nCreating training dataset...")
+    
+    chunks = training_record_chunks([billboard_df], grammy_df, events, negative_ratio=negative_ratio)
+    return pd.concat(chunks, ignore_index=True)
 
 
-def fill_missing_values(df):
+def fill_missing_values(df, verbose=True):
     """
     Fill missing values with reasonable defaults.
     
     Args:
-        df: Training DataFrame
+        df: Training DataFrame (or a chunk of it)
+        verbose: Print null rates after filling
         
     Returns:
         pd.DataFrame: DataFrame with filled values
     """
-    print("\nFilling missing values...")
+    if verbose:
+        print("\nFilling missing values...")
     
     # For Grammy historical data, estimate chart performance
     # Songs that won/were nominated likely had good chart performance
@@ -335,31 +703,71 @@ def fill_missing_values(df):
     df['artist_past_grammy_noms'] = df['artist_past_grammy_noms'].fillna(0)
     df['artist_past_grammy_wins'] = df['artist_past_grammy_wins'].fillna(0)
     
-    # Calculate null rates
-    null_rates = df.isnull().sum() / len(df) * 100
+    if verbose:
+        print_null_rates(dataset_stats(df))
+    
+    return df
+
+
+def dataset_stats(df, total=None):
+    """
+    Row, null, source and label counts for a training table or chunk.
+    
+    Args:
+        df: Training DataFrame (or a chunk of it)
+        total: Stats of earlier chunks to add to
+        
+    Returns:
+        dict: {'rows', 'nulls' (per column), 'sources' (rows per data_source), 'labeled'}
+    """
+    stats = {
+        'rows': len(df),
+        'nulls': df.isnull().sum(),
+        'sources': df['data_source'].value_counts(),
+        'labeled': int(df['is_nominated'].notna().sum()),
+    }
+    if total is None:
+        return stats
+    
+    return {
+        'rows': total['rows'] + stats['rows'],
+        'nulls': total['nulls'].add(stats['nulls'], fill_value=0),
+        'sources': total['sources'].add(stats['sources'], fill_value=0),
+        'labeled': total['labeled'] + stats['labeled'],
+    }
+
+
+def print_null_rates(stats):
+    """Print the columns that still have missing values."""
+    null_rates = stats['nulls'] / max(stats['rows'], 1) * 100
     print("\nNull rates after filling:")
-    for col in df.columns:
+    for col in stats['nulls'].index:
         if null_rates[col] > 0:
             print(f"  {col}: {null_rates[col]:.1f}%")
-    
-    return df
 
 
-def validate_dataset(df):
+def validate_dataset(df, stats=None):
     """
     Validate training dataset meets acceptance criteria.
     
     Acceptance: null rate < 10% on core features
+    
+    Args:
+        df: Training DataFrame (None if stats are given)
+        stats: dataset_stats of the whole table (computed from df if None)
     """
     print("\nValidating dataset...")
     
+    if stats is None:
+        stats = dataset_stats(df)
+    
     core_features = [
         'song_title', 'artist_name', 'peak_position', 'weeks_on_chart',
         'genre', 'artist_past_grammy_noms', 'artist_past_grammy_wins'
     ]
     
     for feature in core_features:
-        null_rate = df[feature].isnull().sum() / len(df) * 100
+        null_rate = stats['nulls'][feature] / max(stats['rows'], 1) * 100
         status = "✓" if null_rate < 10 else "✗"
         print(f"  {status} {feature}: {null_rate:.1f}% null")
         
@@ -367,56 +775,119 @@ def validate_dataset(df):
             print(f"    ⚠️  Warning: {feature} exceeds 10% null threshold")
     
     # Check for labeled data
-    labeled_count = df['is_nominated'].notna().sum()
+    labeled_count = stats['labeled']
     print(f"\n  Labeled examples: {labeled_count}")
-    print(f"  Unlabeled examples: {df['is_nominated'].isna().sum()}")
+    print(f"  Unlabeled examples: {stats['rows'] - labeled_count}")
     
     return df
 
 
+def print_summary(stats, preview):
+    """Print the dataset summary and a preview of its first rows."""
+    print(f"\nDataset summary:")
+    print(f"  Total records: {stats['rows']}")
+    print(f"  Grammy historical: {int(stats['sources'].get('grammy_historical', 0))}")
+    print(f"  Negative examples: {int(stats['sources'].get('chart_negative', 0) + stats['sources'].get('synthetic_negative', 0))}")
+    print(f"  Billboard current: {int(stats['sources'].get('billboard_current', 0))}")
+    print(f"  Billboard labeled: {int(stats['sources'].get('billboard_labeled', 0))}")
+    print(f"  Labeled (for training): {stats['labeled']}")
+    print(f"  Unlabeled (for prediction): {stats['rows'] - stats['labeled']}")
+    
+    print(f"\nPreview:")
+    print(preview[['song_title', 'artist_name', 'genre', 'artist_past_grammy_noms', 'is_nominated']].head(10))
+
+
 def save_training_data(df):
     """Save training dataset to processed/."""
-    os.makedirs('data/processed', exist_ok=True)
-    
-    filename = 'data/processed/training.csv'
-    df.to_csv(filename, index=False)
+    filename = write_table(df, TRAINING_DATA_PATH)
     
     print(f"\n✓ Saved to {filename}")
-    print(f"\nDataset summary:")
-    print(f"  Total records: {len(df)}")
-    print(f"  Grammy historical: {len(df[df['data_source'] == 'grammy_historical'])}")
-    print(f"  Billboard current: {len(df[df['data_source'] == 'billboard_current'])}")
-    print(f"  Labeled (for training): {df['is_nominated'].notna().sum()}")
-    print(f"  Unlabeled (for prediction): {df['is_nominated'].isna().sum()}")
+    print_summary(dataset_stats(df), df)
     
-    print(f"\nPreview:")
-    print(df[['song_title', 'artist_name', 'genre', 'artist_past_grammy_noms', 'is_nominated']].head(10))
+    return filename
+
+
+def build_training_data_streaming(grammy_df, events, chunk_size, negative_ratio=NEGATIVE_RATIO):
+    """
+    Build the training dataset chunk by chunk, with bounded memory.
+    
+    Billboard input is read chunk_size rows at a time and each finished
+    chunk is filled and written straight out: one partition file per chunk
+    in TRAINING_PARTITIONS_DIR, plus the usual training.parquet/.csv.
+    Only one chunk (and the Grammy indexes) is held in memory at a time.
+    
+    Args:
+        grammy_df: Grammy DataFrame
+        events: GrammyEventStore for grammy_df
+        chunk_size: Rows per chunk
+        negative_ratio: Negatives per nominated song (see chart_negative_records)
+        
+    Returns:
+        str: Path to the training Parquet file
+    """
+    print(f"\nCreating training dataset (streaming, {chunk_size} rows per chunk)...")
+    
+    billboard_chunks = iter_billboard_data(chunk_size)
+    
+    stats = None
+    preview = None
+    with TableWriter(TRAINING_DATA_PATH, partition_dir=TRAINING_PARTITIONS_DIR) as writer:
+        for chunk in training_record_chunks(billboard_chunks, grammy_df, events, chunk_size, negative_ratio):
+            chunk = fill_missing_values(chunk, verbose=False)
+            writer.write(chunk)
+            
+            stats = dataset_stats(chunk, stats)
+            if preview is None:
+                preview = chunk.head(10)
+    
+    filename = table_path(TRAINING_DATA_PATH)
+    
+    print_null_rates(stats)
+    validate_dataset(None, stats)
+    
+    print(f"\n✓ Saved to {filename} ({writer.chunks} partitions in {TRAINING_PARTITIONS_DIR})")
+    print_summary(stats, preview)
     
     return filename
 
 
 def main():
     """Main execution."""
+    parser = argparse.ArgumentParser(description="Build the training dataset")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Stream the build, N rows per chunk (default: build in memory)")
+    parser.add_argument('--negative-ratio', type=float, default=NEGATIVE_RATIO,
+                        help="Chart-archive negatives per nominated song, per Grammy year (0: synthetic only)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Prepare Training Dataset (S1-03)")
     print("=" * 60)
     print()
     
     # Load data
-    billboard_df = load_billboard_data()
     grammy_df = load_grammy_data()
+    events = load_grammy_events(grammy_df)
     
-    # Create training dataset
-    training_df = create_training_dataset(billboard_df, grammy_df)
-    
-    # Fill missing values
-    training_df = fill_missing_values(training_df)
-    
-    # Validate
-    training_df = validate_dataset(training_df)
+    if args.chunk_size:
+        filename = build_training_data_streaming(grammy_df, events, args.chunk_size, args.negative_ratio)
+        training_df = None
+    else:
+        billboard_df = load_billboard_data()
+        
+        # Create training dataset
+        training_df = create_training_dataset(billboard_df, grammy_df, events, args.negative_ratio)
+        
+        # Fill missing values
+        training_df = fill_missing_values(training_df)
+        
+        # Validate
+        training_df = validate_dataset(training_df)
+        
+        # Save
+        filename = save_training_data(training_df)
     
-    # Save
-    filename = save_training_data(training_df)
+    save_alias_table()
     
     print()
     print("=" * 60)
@@ -1,26 +1,39 @@
 #!/usr/bin/env python3
 """
 S1-02: Grammy Historical Data Scraper
-Compiles Grammy nominees/winners from past 3-5 years from Wikipedia.
+Compiles Grammy nominees/winners from Wikipedia, for every edition since the
+1st Grammy Awards (1959) and every category.
 
 Usage:
     python scripts/scrape_grammy_history.py
+    python scripts/scrape_grammy_history.py --since 2015 --categories target
     
 Output:
-    data/raw/grammy_history.csv
+    data/raw/grammy_history.parquet (and .csv)
+    data/processed/grammy_events.npz (integer-coded event store, see grammy_events.py)
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import pandas as pd
-import re
 import os
 
+from grammy_events import GRAMMY_EVENTS_PATH, GrammyEventStore
+from grammy_parser import iter_nominees
+from http_fetch import DEFAULT_MAX_AGE, FAILURE_BACKOFF, MAX_WORKERS, CachedFetcher
+from storage import write_table
+
+
+WIKIPEDIA_BASE_URL = 'https://en.wikipedia.org/wiki'
+
+# The 1st Annual Grammy Awards were held in 1959
+FIRST_GRAMMY_YEAR = 1959
+LATEST_GRAMMY_YEAR = 2025
 
 # Grammy years to scrape (adjust as needed)
-GRAMMY_YEARS = [2021, 2022, 2023, 2024, 2025]
+GRAMMY_YEARS = list(range(FIRST_GRAMMY_YEAR, LATEST_GRAMMY_YEAR + 1))
 
-# Categories we care about (music performance categories)
+# Categories kept with --categories target (music performance categories);
+# the default keeps every award category on the page
 TARGET_CATEGORIES = [
     "Record of the Year",
     "Song of the Year",
@@ -43,95 +56,110 @@ TARGET_CATEGORIES = [
 ]
 
 
-def scrape_grammy_year(year):
+def ordinal(n):
+    """Convert number to ordinal string (1 -> 1st, 2 -> 2nd, etc.)"""
+    if 10 <= n % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
+def grammy_editions(year):
+    """
+    Grammy edition numbers held in a ceremony year (2024 -> [66]).
+    
+    The 1st and 2nd Grammy Awards were both held in 1959 and there was no
+    ceremony in 1960; from 1961 on there is one edition per year.
+    
+    Raises:
+        ValueError: If the year is before the first Grammy Awards
+    """
+    if year < FIRST_GRAMMY_YEAR:
+        raise ValueError(f"No Grammy Awards before {FIRST_GRAMMY_YEAR}: {year}")
+    
+    if year == 1959:
+        return [1, 2]
+    if year == 1960:
+        return []
+    return [year - 1958]
+
+
+def grammy_edition_url(edition, base_url=WIKIPEDIA_BASE_URL):
+    """Wikipedia page URL for a Grammy edition (66 -> .../66th_Annual_Grammy_Awards)."""
+    return f"{base_url}/{ordinal(edition)}_Annual_Grammy_Awards"
+
+
+def grammy_year_urls(year, base_url=WIKIPEDIA_BASE_URL):
+    """Wikipedia page URLs for the Grammy editions held in a year."""
+    return [grammy_edition_url(edition, base_url) for edition in grammy_editions(year)]
+
+
+def scrape_grammy_year(year, fetcher=None, base_url=WIKIPEDIA_BASE_URL, categories=None):
     """
     Scrape Grammy data for a specific year from Wikipedia.
     
     Args:
         year: Grammy year (e.g., 2024 for 66th Grammy Awards)
+        fetcher: CachedFetcher to fetch through (a new one if None)
+        base_url: Wiki base URL (point at a local server to use fixtures)
+        categories: Categories to keep (None keeps every award category)
         
     Returns:
         list: List of dicts with Grammy data
     """
-    # Map year to Grammy edition number (approximate)
-    edition = year - 1959  # 1st Grammys were in 1959
+    fetcher = fetcher or CachedFetcher()
     
-    url = f"https://en.wikipedia.org/wiki/{edition}th_Annual_Grammy_Awards"
-    
-    print(f"Fetching {year} Grammys (Edition {edition})...")
-    print(f"  URL: {url}")
-    
-    # Add headers to avoid 403 errors
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-    }
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"  ⚠️  Failed to fetch {year}: {e}")
-        return []
-    
-    soup = BeautifulSoup(response.content, 'html.parser')
+    print(f"Fetching {year} Grammys...")
     
     records = []
-    
-    # Wikipedia Grammy pages have inconsistent structure
-    # This is a simplified parser - may need manual adjustment
-    
-    # Look for category headers and nominees
-    for header in soup.find_all(['h3', 'h4']):
-        category_text = header.get_text().strip()
-        
-        # Check if this is a target category
-        matched_category = None
-        for target in TARGET_CATEGORIES:
-            if target.lower() in category_text.lower():
-                matched_category = target
-                break
+    for url in grammy_year_urls(year, base_url):
+        print(f"  URL: {url}")
         
-        if not matched_category:
+        try:
+            page = fetcher.get(url)
+        except Exception as e:
+            print(f"  ⚠️  Failed to fetch {year}: {e}")
             continue
         
-        print(f"  Found category: {matched_category}")
+        records.extend(parse_grammy_year(page.content, year, categories))
+    
+    return records
+
+
+def parse_grammy_year(html, year, categories=None, verbose=True):
+    """
+    Extract nominees from a Grammy year's Wikipedia page (list layout).
+    
+    Args:
+        html: Page content
+        year: Grammy year
+        categories: Categories to keep (None keeps every award category)
+        verbose: Print each category found
         
-        # Find nominees in the following content
-        # This is a heuristic - may need refinement
-        next_elem = header.find_next_sibling()
+    Returns:
+        list: List of dicts with Grammy data
+    """
+    records = []
+    seen_categories = set()
+    
+    # Single streaming pass; see grammy_parser.py for the layout rules
+    for category, song_title, artist_name, is_winner in iter_nominees(html, 'list', categories):
+        if category not in seen_categories:
+            seen_categories.add(category)
+            if verbose:
+                print(f"  Found category: {category}")
         
-        while next_elem and next_elem.name not in ['h2', 'h3', 'h4']:
-            if next_elem.name == 'ul':
-                for li in next_elem.find_all('li'):
-                    text = li.get_text()
-                    
-                    # Try to extract song/artist
-                    # Common patterns: "Song" by Artist, Artist - "Song"
-                    match = re.search(r'"([^"]+)".*?(?:by|–|-)\s*([^()\n]+)', text)
-                    
-                    if match:
-                        song_title = match.group(1).strip()
-                        artist_name = match.group(2).strip()
-                        
-                        # Check if winner (often marked with ✓ or bold)
-                        is_winner = '✓' in text or li.find('b') is not None
-                        
-                        records.append({
-                            'year': year,
-                            'category': matched_category,
-                            'song_title': song_title,
-                            'artist_name': artist_name,
-                            'is_nominated': True,
-                            'is_winner': is_winner,
-                        })
-            
-            next_elem = next_elem.find_next_sibling()
+        records.append({
+            'year': year,
+            'category': category,
+            'song_title': song_title,
+            'artist_name': artist_name,
+            'is_nominated': True,
+            'is_winner': is_winner,
+        })
     
-    print(f"  ✓ Extracted {len(records)} records for {year}")
+    print(f"  ✓ Extracted {len(records)} records for {year} ({len(seen_categories)} categories)")
     
     return records
 
@@ -276,8 +304,7 @@ def save_to_csv(df):
     """
     os.makedirs('data/raw', exist_ok=True)
     
-    filename = 'data/raw/grammy_history.csv'
-    df.to_csv(filename, index=False)
+    filename = write_table(df, 'data/raw/grammy_history')
     
     print(f"✓ Saved to {filename}")
     print(f"\nPreview:")
@@ -286,8 +313,41 @@ def save_to_csv(df):
     return filename
 
 
+def save_event_store(df, path=GRAMMY_EVENTS_PATH):
+    """
+    Save Grammy data as an integer-coded event store for prepare_training_data.py.
+    
+    Args:
+        df: Grammy DataFrame
+        path: Output .npz path
+        
+    Returns:
+        str: Path written
+    """
+    events = GrammyEventStore.from_frame(df)
+    events.save(path)
+    
+    print(f"✓ Indexed {len(events)} events ({len(events.artists)} artists, "
+          f"{len(events.categories)} categories) to {path}")
+    
+    return path
+
+
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Collect Grammy history from Wikipedia")
+    parser.add_argument('--base-url', default=WIKIPEDIA_BASE_URL, help="Wiki base URL (e.g. a local fixture server)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="Concurrent page fetches")
+    parser.add_argument('--refresh', action='store_true', help="Revalidate cached pages even if fresh, and retry recently failed ones")
+    parser.add_argument('--since', type=int, default=GRAMMY_YEARS[0], help="First Grammy year to collect")
+    parser.add_argument('--until', type=int, default=GRAMMY_YEARS[-1], help="Last Grammy year to collect")
+    parser.add_argument('--categories', choices=['all', 'target'], default='all',
+                        help="Every award category, or only TARGET_CATEGORIES")
+    args = parser.parse_args()
+    
+    years = [year for year in GRAMMY_YEARS if args.since <= year <= args.until]
+    categories = TARGET_CATEGORIES if args.categories == 'target' else None
+    
     print("=" * 60)
     print("Grammy Historical Data Collection (S1-02)")
     print("=" * 60)
@@ -295,10 +355,21 @@ def main():
     
     all_records = []
     
-    # Try scraping Wikipedia
-    for year in GRAMMY_YEARS:
-        records = scrape_grammy_year(year)
-        all_records.extend(records)
+    # Try scraping Wikipedia (pages fetched concurrently, through the cache)
+    fetcher = CachedFetcher(max_workers=args.workers, max_age=0 if args.refresh else DEFAULT_MAX_AGE,
+                            failure_backoff=0 if args.refresh else FAILURE_BACKOFF)
+    urls = [(year, url) for year in years for url in grammy_year_urls(year, args.base_url)]
+    pages = fetcher.get_many([url for _, url in urls])
+    
+    for year, url in urls:
+        page = pages[url]
+        if isinstance(page, Exception):
+            print(f"  ⚠️  Failed to fetch {year}: {page}")
+            continue
+        
+        source = "cache" if page.from_cache else "network"
+        print(f"Parsing {year} Grammys ({source}: {url})")
+        all_records.extend(parse_grammy_year(page.content, year, categories, verbose=categories is not None))
     
     # If scraping yielded insufficient data, use mock data
     if len(all_records) < 50:
@@ -313,12 +384,13 @@ def main():
     
     # Save
     filename = save_to_csv(df)
+    save_event_store(df)
     
     print()
     print("=" * 60)
     print(f"✓ S1-02 Complete: {len(df)} Grammy records collected")
     print(f"  Output: {filename}")
-    print(f"  Years covered: {sorted(df['year'].unique())}")
+    print(f"  Years covered: {df['year'].min()}-{df['year'].max()} ({df['year'].nunique()} years)")
     print(f"  Categories: {len(df['category'].unique())}")
     print(f"  Winners: {df['is_winner'].sum()}")
     print("=" * 60)
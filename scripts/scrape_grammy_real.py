@@ -7,107 +7,102 @@ Usage:
     python scripts/scrape_grammy_real.py
     
 Output:
-    data/raw/grammy_history_real.csv
+    data/raw/grammy_history_real.parquet (and .csv)
 """
 
-import requests
+import argparse
 from bs4 import BeautifulSoup
 import pandas as pd
-import re
 import os
-import time
 
+from grammy_parser import iter_nominees
+from http_fetch import DEFAULT_MAX_AGE, FAILURE_BACKOFF, MAX_WORKERS, CachedFetcher
+from scrape_grammy_history import grammy_edition_url, grammy_editions
+from storage import write_table
+
+
+WIKIPEDIA_BASE_URL = 'https://en.wikipedia.org/wiki'
+RECENT_YEARS = [2024, 2023, 2022, 2021, 2020]
 
-def ordinal(n):
-    """Convert number to ordinal string (1 -> 1st, 2 -> 2nd, etc.)"""
-    if 10 <= n % 100 <= 20:
-        suffix = 'th'
-    else:
-        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
-    return f"{n}{suffix}"
+
+def wikipedia_grammy_url(year, base_url=WIKIPEDIA_BASE_URL):
+    """Wikipedia page URL for a Grammy year (its last ceremony, for 1959)."""
+    editions = grammy_editions(year)
+    if not editions:
+        raise ValueError(f"No Grammy Awards ceremony in {year}")
+    
+    return grammy_edition_url(editions[-1], base_url)
 
 
-def scrape_wikipedia_grammy(year):
+def scrape_wikipedia_grammy(year, fetcher=None, base_url=WIKIPEDIA_BASE_URL):
     """
     Scrape Grammy data from Wikipedia with corrected URLs.
     
     Args:
         year: Grammy year (e.g., 2024)
+        fetcher: CachedFetcher to fetch through (a new one if None)
+        base_url: Wiki base URL (point at a local server to use fixtures)
         
     Returns:
         list: Grammy records
     """
-    edition = year - 1959
-    edition_str = ordinal(edition)
-    
-    url = f"https://en.wikipedia.org/wiki/{edition_str}_Annual_Grammy_Awards"
+    fetcher = fetcher or CachedFetcher()
+    url = wikipedia_grammy_url(year, base_url)
     
-    print(f"\nFetching {year} Grammys ({edition_str} Annual)...")
+    print(f"\nFetching {year} Grammys...")
     print(f"  URL: {url}")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        print(f"  ✓ Page fetched successfully ({len(response.content)} bytes)")
+        page = fetcher.get(url)
+        print(f"  ✓ Page fetched successfully ({len(page.content)} bytes)")
     except Exception as e:
         print(f"  ✗ Failed: {e}")
         return []
     
-    soup = BeautifulSoup(response.content, 'html.parser')
-    records = []
+    return parse_wikipedia_grammy(page.content, year)
+
+
+def parse_wikipedia_grammy(html, year):
+    """
+    Extract nominees from a Grammy year's Wikipedia page (table layout).
     
-    # Look for tables with Grammy data
-    tables = soup.find_all('table', {'class': 'wikitable'})
+    Args:
+        html: Page content
+        year: Grammy year
+        
+    Returns:
+        list: Grammy records
+    """
+    records = []
+    seen_categories = set()
     
-    for table in tables:
-        # Try to find category in preceding header
-        prev_header = table.find_previous(['h2', 'h3', 'h4'])
-        if prev_header:
-            category_text = prev_header.get_text().strip()
-            
-            # Check if it's a music category we care about
-            if any(keyword in category_text.lower() for keyword in ['record', 'song', 'performance', 'album', 'artist']):
-                print(f"  Found table for: {category_text}")
-                
-                # Parse table rows
-                rows = table.find_all('tr')[1:]  # Skip header
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        # Extract text from cells
-                        nominee_cell = cells[0].get_text().strip()
-                        
-                        # Check if winner (often has special formatting)
-                        is_winner = bool(row.find('b') or '✓' in nominee_cell or row.get('style', '').find('background') != -1)
-                        
-                        # Try to parse "Song" by Artist or Artist - "Song"
-                        match = re.search(r'"([^"]+)".*?(?:by|–|-)\s*([^(\n]+)', nominee_cell)
-                        if match:
-                            song = match.group(1).strip()
-                            artist = match.group(2).strip()
-                            
-                            records.append({
-                                'year': year,
-                                'category': category_text,
-                                'song_title': song,
-                                'artist_name': artist,
-                                'is_nominated': True,
-                                'is_winner': is_winner,
-                            })
+    # Single streaming pass; see grammy_parser.py for the layout rules
+    for category, song, artist, is_winner in iter_nominees(html, 'table'):
+        if category not in seen_categories:
+            seen_categories.add(category)
+            print(f"  Found table for: {category}")
+        
+        records.append({
+            'year': year,
+            'category': category,
+            'song_title': song,
+            'artist_name': artist,
+            'is_nominated': True,
+            'is_winner': is_winner,
+        })
     
     print(f"  ✓ Extracted {len(records)} records")
     return records
 
 
-def scrape_grammy_com_api():
+def scrape_grammy_com_api(fetcher=None):
     """
     Attempt to scrape from grammy.com
     Note: This may require API keys or may be blocked
     
+    Args:
+        fetcher: CachedFetcher to fetch through (a new one if None)
+        
     Returns:
         list: Grammy records
     """
@@ -116,12 +111,8 @@ def scrape_grammy_com_api():
     # Grammy.com uses a different structure - this is exploratory
     url = "https://www.grammy.com/awards"
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = (fetcher or CachedFetcher()).get(url)
         print(f"  Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -233,17 +224,34 @@ def manual_curated_data():
 
 def main():
     """Main execution."""
+    parser = argparse.ArgumentParser(description="Scrape real Grammy data")
+    parser.add_argument('--base-url', default=WIKIPEDIA_BASE_URL, help="Wiki base URL (e.g. a local fixture server)")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="Concurrent page fetches")
+    parser.add_argument('--refresh', action='store_true', help="Revalidate cached pages even if fresh, and retry recently failed ones")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Real Grammy Data Scraper")
     print("=" * 60)
     
     all_records = []
     
-    # Try Wikipedia scraping for recent years
-    for year in [2024, 2023, 2022, 2021, 2020]:
-        records = scrape_wikipedia_grammy(year)
-        all_records.extend(records)
-        time.sleep(1)  # Be polite
+    # Try Wikipedia scraping for recent years: pages are fetched concurrently
+    # (politely rate-limited per host) and cached on disk between runs
+    fetcher = CachedFetcher(max_workers=args.workers, max_age=0 if args.refresh else DEFAULT_MAX_AGE,
+                            failure_backoff=0 if args.refresh else FAILURE_BACKOFF)
+    urls = {year: wikipedia_grammy_url(year, args.base_url) for year in RECENT_YEARS}
+    pages = fetcher.get_many(list(urls.values()))
+    
+    for year, url in urls.items():
+        page = pages[url]
+        if isinstance(page, Exception):
+            print(f"\n  ✗ {year} failed: {page}")
+            continue
+        
+        source = "cache" if page.from_cache else "network"
+        print(f"\nParsing {year} Grammys ({source}, {len(page.content)} bytes)")
+        all_records.extend(parse_wikipedia_grammy(page.content, year))
     
     # If scraping didn't work well, use curated data
     if len(all_records) < 100:
@@ -256,8 +264,7 @@ def main():
     
     # Save
     os.makedirs('data/raw', exist_ok=True)
-    filename = 'data/raw/grammy_history_real.csv'
-    df.to_csv(filename, index=False)
+    filename = write_table(df, 'data/raw/grammy_history_real')
     
     print(f"\n✓ Saved to {filename}")
     print(f"\nSample:")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Dataset storage: typed, compressed Parquet alongside CSV.
+
+Each dataset is addressed by a base path without extension (for example
+'data/processed/training'). write_table writes <base>.parquet (zstd,
+dictionary-encoded artist/genre/category columns, nullable booleans for the
+label columns) and, by default, a <base>.csv copy for people and older tools.
+read_table prefers the Parquet file unless the CSV is newer (e.g. edited by
+hand), and reads only the requested columns.
+
+Large tables can be streamed: iter_table reads one in chunks, and
+TableWriter writes one chunk at a time (optionally also as partition files).
+"""
+
+import glob
+import os
+
+import pandas as pd
+
+
+# Low-cardinality text columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = [
+    'artist_name', 'genre', 'category', 'grammy_category', 'data_source', 'label_type', 'chart_date'
+]
+
+# Label columns stored as nullable booleans (True/False/missing)
+BOOLEAN_COLUMNS = ['is_nominated', 'is_winner']
+
+# Text spellings of label values found in CSVs
+_BOOLEAN_TEXT = {'true': True, '1': True, '1.0': True, 'false': False, '0': False, '0.0': False}
+
+PARQUET_COMPRESSION = 'zstd'
+
+# Rows per chunk for iter_table
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _parquet_path(base_path):
+    return f"{base_path}.parquet"
+
+
+def _csv_path(base_path):
+    return f"{base_path}.csv"
+
+
+def base_path_of(path):
+    """Strip a .csv/.parquet extension from a dataset file path."""
+    root, ext = os.path.splitext(path)
+    return root if ext in ('.csv', '.parquet') else path
+
+
+def table_path(base_path):
+    """
+    File read_table would read for a dataset.
+
+    Args:
+        base_path: Dataset path without extension
+
+    Returns:
+        str: Path to the Parquet or CSV file
+
+    Raises:
+        FileNotFoundError: If neither file exists
+    """
+    parquet_path = _parquet_path(base_path)
+    csv_path = _csv_path(base_path)
+
+    has_parquet = os.path.exists(parquet_path)
+    has_csv = os.path.exists(csv_path)
+
+    if has_parquet and (not has_csv or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        return parquet_path
+    if has_csv:
+        return csv_path
+
+    raise FileNotFoundError(f"No dataset found at {parquet_path} or {csv_path}")
+
+
+def table_exists(base_path):
+    """True if the dataset exists in either format."""
+    return os.path.exists(_parquet_path(base_path)) or os.path.exists(_csv_path(base_path))
+
+
+def _typed(df):
+    """Apply storage dtypes: dictionary-encoded text, nullable booleans."""
+    df = df.copy()
+
+    for col in BOOLEAN_COLUMNS:
+        if col in df.columns and not pd.api.types.is_bool_dtype(df[col].dtype):
+            df[col] = df[col].astype('string').str.strip().str.lower().map(_BOOLEAN_TEXT)
+        if col in df.columns:
+            df[col] = df[col].astype('boolean')
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    return df
+
+
+def write_table(df, base_path, csv=True):
+    """
+    Write a dataset as Parquet (and optionally CSV).
+
+    Args:
+        df: DataFrame to save
+        base_path: Dataset path without extension
+        csv: Also write a CSV copy
+
+    Returns:
+        str: Path to the Parquet file
+    """
+    os.makedirs(os.path.dirname(base_path) or '.', exist_ok=True)
+
+    typed = _typed(df)
+    dictionary_columns = [col for col in CATEGORICAL_COLUMNS if col in typed.columns]
+
+    parquet_path = _parquet_path(base_path)
+    if csv:
+        # CSV first so the Parquet file is never older than it
+        df.to_csv(_csv_path(base_path), index=False)
+    typed.to_parquet(
+        parquet_path,
+        index=False,
+        compression=PARQUET_COMPRESSION,
+        use_dictionary=dictionary_columns or False,
+    )
+
+    return parquet_path
+
+
+def read_table(base_path, columns=None, keep_categories=False):
+    """
+    Read a dataset, preferring Parquet.
+
+    Args:
+        base_path: Dataset path without extension
+        columns: Columns to read (missing ones are skipped); None reads all
+        keep_categories: Keep dictionary-encoded columns as pandas
+            categoricals instead of converting them back to plain values
+
+    Returns:
+        pd.DataFrame: Dataset (label columns as nullable booleans)
+    """
+    path = table_path(base_path)
+
+    if path.endswith('.parquet'):
+        if columns is not None:
+            import pyarrow.parquet as pq
+
+            available = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in available]
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        usecols = None if columns is None else (lambda col: col in set(columns))
+        df = _typed(pd.read_csv(path, usecols=usecols))
+
+    if not keep_categories:
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(df[col].cat.categories.dtype)
+
+    return df
+
+
+def iter_table(base_path, columns=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a dataset in chunks, preferring Parquet (see read_table).
+
+    Args:
+        base_path: Dataset path without extension
+        columns: Columns to read (missing ones are skipped); None reads all
+        chunk_size: Rows per chunk
+
+    Yields:
+        pd.DataFrame: Consecutive chunks (label columns as nullable booleans)
+    """
+    path = table_path(base_path)
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [col for col in columns if col in available]
+        batches = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns))
+    else:
+        usecols = None if columns is None else (lambda col: col in set(columns))
+        batches = (_typed(chunk) for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_size))
+
+    for df in batches:
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(df[col].cat.categories.dtype)
+        yield df
+
+
+def _chunk_field(field):
+    """Schema field that later chunks can be cast to."""
+    import pyarrow as pa
+
+    # Dictionary index width depends on each chunk's cardinality; all-missing
+    # columns in the first chunk carry no type, so assume text
+    if pa.types.is_dictionary(field.type):
+        value_type = pa.string() if pa.types.is_null(field.type.value_type) else field.type.value_type
+        return pa.field(field.name, pa.dictionary(pa.int32(), value_type))
+    if pa.types.is_null(field.type):
+        return pa.field(field.name, pa.string())
+    return field
+
+
+class TableWriter:
+    """
+    Write a dataset chunk by chunk, holding only one chunk in memory.
+
+    Each chunk is written as its own partition file (<partition_dir>/part-NNNNN.parquet)
+    and appended to <base>.parquet (one row group per chunk) and <base>.csv,
+    so readers of the single-file dataset work unchanged. The single files
+    are written under temporary names and moved into place by close().
+    Chunks must have the same columns and compatible dtypes.
+
+    Args:
+        base_path: Dataset path without extension
+        partition_dir: Directory for partition files (None skips them);
+            existing partitions there are removed
+        csv: Also write a CSV copy
+    """
+
+    def __init__(self, base_path, partition_dir=None, csv=True):
+        self.base_path = base_path
+        self.partition_dir = partition_dir
+        self.csv = csv
+        self.rows = 0
+        self.chunks = 0
+
+        self._schema = None
+        self._writer = None
+        self._parquet_tmp = f"{_parquet_path(base_path)}.tmp"
+        self._csv_tmp = f"{_csv_path(base_path)}.tmp"
+
+        os.makedirs(os.path.dirname(base_path) or '.', exist_ok=True)
+        if partition_dir:
+            os.makedirs(partition_dir, exist_ok=True)
+            for old_part in glob.glob(os.path.join(partition_dir, 'part-*.parquet')):
+                os.remove(old_part)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _table(self, df):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(_typed(df), preserve_index=False)
+
+        if self._schema is None:
+            self._schema = pa.schema([_chunk_field(field) for field in table.schema],
+                                     metadata=table.schema.metadata)
+
+        return table.cast(self._schema)
+
+    def write(self, df):
+        """
+        Append a chunk.
+
+        Args:
+            df: DataFrame chunk
+        """
+        import pyarrow.parquet as pq
+
+        table = self._table(df)
+        dictionary_columns = [col for col in CATEGORICAL_COLUMNS if col in table.column_names] or False
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                self._parquet_tmp, self._schema,
+                compression=PARQUET_COMPRESSION, use_dictionary=dictionary_columns,
+            )
+        self._writer.write_table(table)
+
+        if self.partition_dir:
+            part_path = os.path.join(self.partition_dir, f"part-{self.chunks:05d}.parquet")
+            pq.write_table(table, part_path, compression=PARQUET_COMPRESSION, use_dictionary=dictionary_columns)
+
+        if self.csv:
+            df.to_csv(self._csv_tmp, mode='w' if self.chunks == 0 else 'a', header=self.chunks == 0, index=False)
+
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self):
+        """
+        Finish writing and move the single-file dataset into place.
+
+        Returns:
+            str: Path to the Parquet file
+
+        Raises:
+            ValueError: If no chunk was written
+        """
+        if self._writer is None:
+            raise ValueError(f"No data written to {self.base_path}")
+
+        self._writer.close()
+        self._writer = None
+
+        # CSV first so the Parquet file is never older than it
+        if self.csv:
+            os.replace(self._csv_tmp, _csv_path(self.base_path))
+        os.replace(self._parquet_tmp, _parquet_path(self.base_path))
+
+        return _parquet_path(self.base_path)
+
+    def abort(self):
+        """Discard a partially written dataset (the previous files stay)."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for tmp_path in (self._parquet_tmp, self._csv_tmp):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -5,35 +5,65 @@ Trains logistic regression model to predict Grammy nominations.
 
 Usage:
     python scripts/train_baseline.py
+    python scripts/train_baseline.py --search --latency-budget-ms 25   # model zoo (model_zoo.py)
     
 Output:
     model/baseline_lr.pkl
+    model/baseline_lr/ (pickle-free bundle loaded by the app; linear models only)
+    model/model_search.parquet (and .csv; --search only)
+    data/processed/predictions.parquet
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import pickle
+import hashlib
 import os
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    roc_auc_score, classification_report, confusion_matrix
-)
+import shutil
 import warnings
 warnings.filterwarnings('ignore')
 
+from model_format import MODEL_BUNDLE_DIR, MODEL_PICKLE_PATH, can_export, export_model_bundle, model_source_path
+from predictor import FEATURE_COLUMNS, predict_batch
+from storage import read_table, table_exists, table_path, write_table
 
-def load_training_data():
-    """Load processed training data."""
-    filepath = 'data/processed/training.csv'
+# scikit-learn is imported inside the training/evaluation functions, so
+# prediction-only callers (e.g. predict_current_billboard) don't pay for it
+
+MODEL_PATH = MODEL_PICKLE_PATH
+TRAINING_DATA_PATH = 'data/processed/training'
+PREDICTIONS_PATH = 'data/processed/predictions.parquet'
+MODEL_SEARCH_PATH = 'model/model_search'
+
+# Song columns kept in the predictions artifact (what the app displays)
+PREDICTION_COLUMNS = [
+    'song_title', 'artist_name', 'current_rank', 'peak_position', 'weeks_on_chart', 'genre',
+    'artist_past_grammy_noms', 'artist_past_grammy_wins'
+]
+
+# Training data columns used for fitting and scoring
+TRAINING_COLUMNS = PREDICTION_COLUMNS + ['is_nominated', 'data_source']
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents (used to tie artifacts to their inputs)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_training_data(columns=TRAINING_COLUMNS):
+    """Load processed training data (only the given columns)."""
+    filepath = TRAINING_DATA_PATH
     
-    if not os.path.exists(filepath):
+    if not table_exists(filepath):
         raise FileNotFoundError("Training data not found. Run scripts/prepare_training_data.py first.")
     
-    print(f"Loading training data: {filepath}")
-    df = pd.read_csv(filepath)
+    print(f"Loading training data: {table_path(filepath)}")
+    df = read_table(filepath, columns=columns)
     print(f"  ✓ Loaded {len(df)} records")
     
     return df
@@ -68,6 +98,8 @@ def prepare_features(df):
     encoders = {}
     
     # Encode genre
+    from sklearn.preprocessing import LabelEncoder
+    
     le_genre = LabelEncoder()
     labeled_df['genre_encoded'] = le_genre.fit_transform(labeled_df['genre'])
     encoders['genre'] = le_genre
@@ -75,8 +107,7 @@ def prepare_features(df):
     print(f"  Genre categories: {list(le_genre.classes_)}")
     
     # Select features
-    X_cols = ['peak_position', 'weeks_on_chart', 'artist_past_grammy_noms', 
-              'artist_past_grammy_wins', 'genre_encoded']
+    X_cols = list(FEATURE_COLUMNS)
     
     X = labeled_df[X_cols].values
     y = labeled_df['is_nominated'].astype(int).values
@@ -87,34 +118,96 @@ def prepare_features(df):
     return X, y, X_cols, encoders, labeled_df
 
 
-def train_model(X, y):
+def split_data(X, y):
     """
-    Train logistic regression model with train/test split.
+    Stratified 80/20 train/test split.
     
     Args:
         X: Feature matrix
         y: Target labels
         
+    Returns:
+        tuple: (X_train, X_test, y_train, y_test)
+    """
+    from sklearn.model_selection import train_test_split
+    
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def search_models(X_train, y_train, latency_budget_ms, n_splits, max_workers):
+    """
+    Cross-validated search over the model zoo (see model_zoo.py).
+    
+    Only the training split is searched; the test split stays held out for
+    evaluate_model. The results table is saved to MODEL_SEARCH_PATH.
+    
+    Args:
+        X_train: Training feature matrix
+        y_train: Training labels
+        latency_budget_ms: Champion scoring budget (ms per model_zoo.LATENCY_BATCH_ROWS rows)
+        n_splits: CV folds
+        max_workers: Worker processes (None uses all cores)
+        
+    Returns:
+        object: Unfitted champion model
+    """
+    from model_zoo import LATENCY_BATCH_ROWS, build_model, choose_champion, results_table, run_search
+    
+    results = run_search(X_train, y_train, n_splits=n_splits, max_workers=max_workers)
+    champion = choose_champion(results, latency_budget_ms)
+    
+    table = results_table(results, latency_budget_ms)
+    os.makedirs('model', exist_ok=True)
+    write_table(table, MODEL_SEARCH_PATH)
+    
+    print(f"\n  {'Family':<20} {'Params':<55} {'ROC AUC':>8} {'F1':>6} {'Fit s':>7} {'ms/' + str(LATENCY_BATCH_ROWS):>8}")
+    print("  " + "-" * 108)
+    for _, row in table.iterrows():
+        if pd.notna(row['error']):
+            continue
+        flag = '' if row['within_budget'] else '  (over budget)'
+        print(f"  {row['family']:<20} {row['params'][:53]:<55} {row['roc_auc']:>8.3f} {row['f1']:>6.3f} "
+              f"{row['fit_time_s']:>7.3f} {row['latency_ms']:>8.2f}{flag}")
+    
+    print(f"\n  ✓ Champion: {champion['family']} {champion['params']} "
+          f"(ROC AUC {champion['roc_auc']:.3f}, {champion['latency_ms']:.2f} ms, budget {latency_budget_ms:.1f} ms)")
+    print(f"  ✓ Search results saved to {MODEL_SEARCH_PATH}.parquet")
+    
+    return build_model(champion['family'], champion['params'])
+
+
+def train_model(X, y, model=None):
+    """
+    Train a model with train/test split.
+    
+    Args:
+        X: Feature matrix
+        y: Target labels
+        model: Unfitted model (None trains the baseline logistic regression)
+        
     Returns:
         tuple: (model, X_train, X_test, y_train, y_test)
     """
-    print("\nTraining baseline logistic regression...")
+    from sklearn.linear_model import LogisticRegression
     
     # Split data (80/20)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+    X_train, X_test, y_train, y_test = split_data(X, y)
+    
+    if model is None:
+        print("\nTraining baseline logistic regression...")
+        
+        # Train logistic regression
+        model = LogisticRegression(
+            random_state=42,
+            max_iter=1000,
+            class_weight='balanced'  # Handle class imbalance
+        )
+    else:
+        print(f"\nTraining {type(model).__name__}...")
     
     print(f"  Train set: {len(X_train)} samples")
     print(f"  Test set: {len(X_test)} samples")
     
-    # Train logistic regression
-    model = LogisticRegression(
-        random_state=42,
-        max_iter=1000,
-        class_weight='balanced'  # Handle class imbalance
-    )
-    
     model.fit(X_train, y_train)
     
     print(f"  ✓ Model trained successfully")
@@ -132,6 +225,11 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, feature_names):
         y_train, y_test: Target labels
         feature_names: List of feature names
     """
+    from sklearn.metrics import (
+        accuracy_score, precision_score, recall_score, f1_score,
+        roc_auc_score, confusion_matrix
+    )
+    
     print("\n" + "=" * 60)
     print("MODEL EVALUATION")
     print("=" * 60)
@@ -167,11 +265,16 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, feature_names):
     print(f"  False Negatives: {cm[1, 0] if cm.shape[0] > 1 else 0}")
     print(f"  True Positives:  {cm[1, 1] if cm.shape[0] > 1 and cm.shape[1] > 1 else 0}")
     
-    # Feature importance
-    print("\n🔍 Feature Importance (Coefficients):")
-    coefficients = model.coef_[0]
-    for i, (feat, coef) in enumerate(zip(feature_names, coefficients)):
-        print(f"  {feat:30s}: {coef:+.4f}")
+    # Feature importance (linear models: coefficients; tree models: importances)
+    if hasattr(model, 'coef_'):
+        print("\n🔍 Feature Importance (Coefficients):")
+        coefficients = model.coef_[0]
+        for i, (feat, coef) in enumerate(zip(feature_names, coefficients)):
+            print(f"  {feat:30s}: {coef:+.4f}")
+    elif hasattr(model, 'feature_importances_'):
+        print("\n🔍 Feature Importance:")
+        for feat, importance in zip(feature_names, model.feature_importances_):
+            print(f"  {feat:30s}: {importance:.4f}")
     
     print("\n" + "=" * 60)
 
@@ -184,6 +287,9 @@ def save_model(model, encoders, feature_names):
         model: Trained model
         encoders: Dictionary of label encoders
         feature_names: List of feature names
+        
+    Returns:
+        tuple: (path the app loads the model from, model_package)
     """
     os.makedirs('model', exist_ok=True)
     
@@ -196,24 +302,32 @@ def save_model(model, encoders, feature_names):
         'trained_date': pd.Timestamp.now().isoformat()
     }
     
-    filepath = 'model/baseline_lr.pkl'
-    
-    with open(filepath, 'wb') as f:
+    # Pickle: full sklearn objects, for training-side tools
+    with open(MODEL_PATH, 'wb') as f:
         pickle.dump(model_package, f)
     
-    print(f"\n✓ Model saved to {filepath}")
+    print(f"\n✓ Model saved to {MODEL_PATH}")
+    
+    # Bundle: pickle-free, NumPy-only format the app and API load
+    if can_export(model):
+        filepath = export_model_bundle(model_package, MODEL_BUNDLE_DIR)
+        print(f"✓ Model bundle saved to {MODEL_BUNDLE_DIR}/")
+    else:
+        # Don't leave an older bundle that would shadow this model
+        if os.path.isdir(MODEL_BUNDLE_DIR):
+            shutil.rmtree(MODEL_BUNDLE_DIR)
+        filepath = MODEL_PATH
+        print(f"  ⚠️  {type(model).__name__} can't be exported as a bundle; serving will load the pickle")
     
-    return filepath
+    return filepath, model_package
 
 
-def predict_current_billboard(model, encoders, feature_names):
+def predict_current_billboard(model_package):
     """
     Make predictions on current Billboard Top 10.
     
     Args:
-        model: Trained model
-        encoders: Dictionary of label encoders
-        feature_names: List of feature names
+        model_package: Saved model package (model, encoders, metadata)
         
     Returns:
         pd.DataFrame: Predictions
@@ -223,10 +337,10 @@ def predict_current_billboard(model, encoders, feature_names):
     print("=" * 60)
     
     # Load full dataset
-    df = pd.read_csv('data/processed/training.csv')
+    df = read_table(TRAINING_DATA_PATH, columns=TRAINING_COLUMNS)
     
     # Filter to unlabeled (current Billboard)
-    current_df = df[df['is_nominated'].isna()].copy()
+    current_df = df[df['data_source'] == 'billboard_current'].copy()
     
     if len(current_df) == 0:
         print("  No unlabeled data to predict")
@@ -234,24 +348,11 @@ def predict_current_billboard(model, encoders, feature_names):
     
     print(f"\n  Predicting for {len(current_df)} songs...")
     
-    # Prepare features
-    current_df['genre_encoded'] = encoders['genre'].transform(current_df['genre'])
-    
-    X_cols = ['peak_position', 'weeks_on_chart', 'artist_past_grammy_noms',
-              'artist_past_grammy_wins', 'genre_encoded']
-    
-    X_current = current_df[X_cols].values
-    
-    # Predict
-    predictions = model.predict(X_current)
-    probabilities = model.predict_proba(X_current)[:, 1]
-    
-    # Add to dataframe
-    current_df['nomination_probability'] = probabilities
-    current_df['predicted_nominated'] = predictions
+    # Predict (probability, label and explanation in one batch)
+    current_df = current_df.join(predict_batch(model_package, current_df))
     
     # Sort by probability
-    current_df = current_df.sort_values('nomination_probability', ascending=False)
+    current_df = current_df.sort_values('probability', ascending=False)
     
     # Display
     print("\n  Results:")
@@ -259,15 +360,58 @@ def predict_current_billboard(model, encoders, feature_names):
     print("  " + "-" * 85)
     
     for idx, row in current_df.iterrows():
-        pred_str = "✓ Nominated" if row['predicted_nominated'] else "✗ Not nominated"
-        print(f"  {int(row.get('current_rank', 0)):<6} {row['song_title'][:28]:<30} "
-              f"{row['artist_name'][:23]:<25} {row['nomination_probability']:.1%}{'':>8} {pred_str}")
+        pred_str = "✓ Nominated" if row['prediction'] else "✗ Not nominated"
+        rank = f"{row['current_rank']:.0f}" if pd.notna(row.get('current_rank')) else '-'
+        print(f"  {rank:<6} {row['song_title'][:28]:<30} "
+              f"{row['artist_name'][:23]:<25} {row['probability']:.1%}{'':>8} {pred_str}")
     
     return current_df
 
 
+def save_predictions(predictions_df, model_package):
+    """
+    Save scored predictions so the app can serve them without rescoring.
+    
+    The artifact records the model version and the content hashes of the
+    model and training data it was computed from; the app treats it as stale
+    (and falls back to live scoring) when either file no longer matches.
+    
+    Args:
+        predictions_df: Output of predict_current_billboard
+        model_package: Saved model package
+        
+    Returns:
+        str: Path to the artifact
+    """
+    os.makedirs(os.path.dirname(PREDICTIONS_PATH), exist_ok=True)
+    
+    columns = [col for col in PREDICTION_COLUMNS if col in predictions_df.columns]
+    artifact = predictions_df[columns + ['probability', 'prediction', 'explanation']].reset_index(drop=True)
+    artifact['prediction'] = artifact['prediction'].astype(int)
+    artifact['model_version'] = f"{model_package['version']}+{model_package['trained_date']}"
+    artifact['model_sha256'] = file_sha256(model_source_path())
+    artifact['training_data_sha256'] = file_sha256(table_path(TRAINING_DATA_PATH))
+    
+    artifact.to_parquet(PREDICTIONS_PATH, index=False)
+    
+    print(f"\n✓ Predictions saved to {PREDICTIONS_PATH}")
+    
+    return PREDICTIONS_PATH
+
+
 def main():
     """Main execution."""
+    from model_zoo import CV_FOLDS, DEFAULT_LATENCY_BUDGET_MS
+    
+    parser = argparse.ArgumentParser(description="Train the nomination model")
+    parser.add_argument('--search', action='store_true',
+                        help="Cross-validated search across model families instead of the baseline")
+    parser.add_argument('--latency-budget-ms', type=float, default=DEFAULT_LATENCY_BUDGET_MS,
+                        help="Max champion scoring time per 1000 rows (--search)")
+    parser.add_argument('--cv-folds', type=int, default=CV_FOLDS, help="CV folds (--search)")
+    parser.add_argument('--workers', type=int, default=None, help="Search worker processes (default: all cores)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Train Baseline Model (S1-04)")
     print("=" * 60)
@@ -279,17 +423,25 @@ def main():
     # Prepare features
     X, y, feature_names, encoders, labeled_df = prepare_features(df)
     
+    # Pick the model family (optional search on the training split only)
+    model = None
+    if args.search:
+        X_train, _, y_train, _ = split_data(X, y)
+        model = search_models(X_train, y_train, args.latency_budget_ms, args.cv_folds, args.workers)
+    
     # Train model
-    model, X_train, X_test, y_train, y_test = train_model(X, y)
+    model, X_train, X_test, y_train, y_test = train_model(X, y, model)
     
     # Evaluate
     evaluate_model(model, X_train, X_test, y_train, y_test, feature_names)
     
     # Save
-    model_path = save_model(model, encoders, feature_names)
+    model_path, model_package = save_model(model, encoders, feature_names)
     
-    # Predict current Billboard
-    predictions_df = predict_current_billboard(model, encoders, feature_names)
+    # Predict current Billboard and save the scored artifact
+    predictions_df = predict_current_billboard(model_package)
+    if predictions_df is not None:
+        save_predictions(predictions_df, model_package)
     
     print()
     print("=" * 60)
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Chart-trajectory features over each song's run in the chart archive.
+
+Per song (keyed by the hashed normalized artist/title, see
+entity_resolution.song_keys):
+    debut_rank      rank in the song's first chart week
+    weeks_in_top10  weeks ranked 1-10
+    rank_auc        area under the rank curve: sum over charted weeks of
+                    (101 - rank), so longer and higher runs score more
+    velocity        average ranks gained per week from debut to peak
+                    (0 when the song debuted at its peak)
+    re_entries      times the song came back after dropping off the chart
+
+Everything is computed from a per-song summary (first/last week, debut,
+peak, counts) that combines associatively: a run split into consecutive
+pieces summarizes to the same thing as the whole run. A single chart week is
+the smallest piece, so the archive is summarized with grouped NumPy
+reductions (reduceat over songs sorted by week), and adding weeks only
+summarizes the new weeks and combines them with the cached summary.
+
+Summaries are kept per song and Grammy year (the ceremony whose eligibility
+window the weeks fall in, see entity_resolution.grammy_year_for_chart_date).
+A training row for Grammy year Y gets the features of the song's run up to
+the end of Y's window, a running combine over its years <= Y, so no chart
+week after the window leaks into it. A gap between pieces counts as a
+re-entry only if the song was missing from an archived chart week in it;
+weeks missing from the archive are not re-entries.
+
+The summary is cached in data/interim/trajectory_cache/<chart>/ together
+with the chart dates it covers. Only new chart dates after the newest cached
+date are read on update, WEEKS_PER_BATCH weeks at a time; a backfilled older
+week triggers a full rebuild.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from chart_archive import ARCHIVE_DIR, DEFAULT_CHART, archived_dates, load_chart_archive
+from entity_resolution import grammy_year_for_chart_date, song_keys
+from storage import read_table, table_exists, write_table
+
+
+TRAJECTORY_CACHE_DIR = 'data/interim/trajectory_cache'
+CHECKPOINT_FILE = 'dates.json'
+
+TRAJECTORY_COLUMNS = ['debut_rank', 'weeks_in_top10', 'rank_auc', 'velocity', 're_entries']
+
+# Summary columns per song and Grammy year (combined across pieces of a run)
+SUMMARY_COLUMNS = ['song_hash', 'grammy_year', 'first_week', 'last_week', 'debut_rank', 'last_rank', 'peak_rank',
+                   'peak_week', 'weeks_charted', 'weeks_in_top10', 'rank_points', 're_entries']
+
+CHART_SIZE = 100
+
+# Archived weeks read at a time on update (about a year)
+WEEKS_PER_BATCH = 52
+
+# Grammy year looked up for rows without one (current chart songs): the whole run
+LATEST_YEAR = 9999
+
+
+def week_numbers(chart_dates):
+    """
+    Week index of chart dates (consecutive weekly charts differ by 1).
+
+    Args:
+        chart_dates: Chart dates (YYYY-MM-DD strings or datetimes)
+
+    Returns:
+        np.ndarray: int64 week numbers
+    """
+    days = pd.to_datetime(pd.Series(chart_dates)).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return days // 7
+
+
+def week_summaries(weeks):
+    """
+    One-week summaries for chart entries (the smallest piece of a run).
+
+    Args:
+        weeks: Chart entries with song_title, artist_name, current_rank and chart_date
+
+    Returns:
+        pd.DataFrame: SUMMARY_COLUMNS, one row per song and chart week
+    """
+    keys = song_keys(weeks)
+    valid = ((keys['artist_key'] != '') & (keys['title_key'] != '') & weeks['current_rank'].notna()).to_numpy()
+
+    rank = weeks['current_rank'].to_numpy(dtype=float)[valid].astype(np.int64)
+    chart_dates = weeks['chart_date'].to_numpy()[valid]
+    week = week_numbers(chart_dates)
+
+    pieces = pd.DataFrame({
+        'song_hash': keys['song_hash'].to_numpy()[valid],
+        'grammy_year': grammy_year_for_chart_date(chart_dates).to_numpy(dtype=np.int64),
+        'first_week': week,
+        'last_week': week,
+        'debut_rank': rank,
+        'last_rank': rank,
+        'peak_rank': rank,
+        'peak_week': week,
+        'weeks_charted': 1,
+        'weeks_in_top10': (rank <= 10).astype(np.int64),
+        'rank_points': CHART_SIZE + 1 - rank,
+        're_entries': 0,
+    })
+
+    return pieces.drop_duplicates(['song_hash', 'first_week'])
+
+
+def _empty_summary():
+    return pd.DataFrame({col: pd.Series(dtype=np.uint64 if col == 'song_hash' else np.int64)
+                         for col in SUMMARY_COLUMNS})
+
+
+def _missed_weeks(last_week, first_week, chart_weeks):
+    """True where an archived chart week falls strictly between last_week and first_week."""
+    return np.searchsorted(chart_weeks, first_week, side='left') > np.searchsorted(chart_weeks, last_week, side='right')
+
+
+def combine_summaries(pieces, chart_weeks):
+    """
+    Combine run pieces into one summary per song and Grammy year.
+
+    Pieces of a song must not overlap in time (e.g. the cached summary plus
+    the summaries of later weeks).
+
+    Args:
+        pieces: DataFrame with SUMMARY_COLUMNS
+        chart_weeks: Sorted week numbers of the archived charts (see week_numbers)
+
+    Returns:
+        pd.DataFrame: SUMMARY_COLUMNS, one row per song and Grammy year
+    """
+    if len(pieces) == 0:
+        return _empty_summary()
+
+    song = pieces['song_hash'].to_numpy(dtype=np.uint64)
+    year = pieces['grammy_year'].to_numpy(dtype=np.int64)
+    order = np.lexsort((pieces['first_week'].to_numpy(), year, song))
+    p = {col: pieces[col].to_numpy()[order] for col in SUMMARY_COLUMNS}
+    song, year = p['song_hash'], p['grammy_year']
+
+    is_start = np.concatenate(([True], (song[1:] != song[:-1]) | (year[1:] != year[:-1])))
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], len(song)) - 1
+    sizes = ends - starts + 1
+
+    peak_rank = np.minimum.reduceat(p['peak_rank'], starts)
+
+    # Earliest piece reaching the peak (pieces are in time order)
+    at_peak = p['peak_rank'] == np.repeat(peak_rank, sizes)
+    first_at_peak = np.minimum.reduceat(np.where(at_peak, np.arange(len(song)), len(song)), starts)
+
+    # Re-entry: the song missed an archived chart week between consecutive pieces
+    gap = np.zeros(len(song), dtype=np.int64)
+    gap[1:] = _missed_weeks(p['last_week'][:-1], p['first_week'][1:], chart_weeks)
+    gap[is_start] = 0
+
+    return pd.DataFrame({
+        'song_hash': song[starts],
+        'grammy_year': year[starts],
+        'first_week': p['first_week'][starts],
+        'last_week': p['last_week'][ends],
+        'debut_rank': p['debut_rank'][starts],
+        'last_rank': p['last_rank'][ends],
+        'peak_rank': peak_rank,
+        'peak_week': p['peak_week'][first_at_peak],
+        'weeks_charted': np.add.reduceat(p['weeks_charted'], starts),
+        'weeks_in_top10': np.add.reduceat(p['weeks_in_top10'], starts),
+        'rank_points': np.add.reduceat(p['rank_points'], starts),
+        're_entries': np.add.reduceat(p['re_entries'] + gap, starts),
+    })
+
+
+def cumulative_summaries(summary, chart_weeks):
+    """
+    Each song's run up to the end of each of its Grammy years.
+
+    A running combine over the song's yearly summaries, in year order.
+
+    Args:
+        summary: combine_summaries output
+        chart_weeks: Sorted week numbers of the archived charts
+
+    Returns:
+        pd.DataFrame: SUMMARY_COLUMNS, one row per song and Grammy year,
+            sorted by song and year
+    """
+    if len(summary) == 0:
+        return _empty_summary()
+
+    order = np.lexsort((summary['grammy_year'].to_numpy(), summary['song_hash'].to_numpy(dtype=np.uint64)))
+    p = {col: summary[col].to_numpy()[order] for col in SUMMARY_COLUMNS}
+    song = p['song_hash']
+    positions = np.arange(len(song))
+
+    is_start = np.concatenate(([True], song[1:] != song[:-1]))
+    group_start = np.maximum.accumulate(np.where(is_start, positions, 0))
+
+    def running_sum(values):
+        total = np.cumsum(values)
+        return total - total[group_start] + values[group_start]
+
+    # Running best rank; its week moves only when a later year beats it
+    peak_rank = pd.Series(p['peak_rank']).groupby(group_start).cummin().to_numpy()
+    previous_peak = np.empty_like(peak_rank)
+    previous_peak[1:] = peak_rank[:-1]
+    new_peak = is_start | (p['peak_rank'] < previous_peak)
+    peak_at = np.maximum.accumulate(np.where(new_peak, positions, 0))
+
+    gap = np.zeros(len(song), dtype=np.int64)
+    gap[1:] = _missed_weeks(p['last_week'][:-1], p['first_week'][1:], chart_weeks)
+    gap[is_start] = 0
+
+    return pd.DataFrame({
+        'song_hash': song,
+        'grammy_year': p['grammy_year'],
+        'first_week': p['first_week'][group_start],
+        'last_week': p['last_week'],
+        'debut_rank': p['debut_rank'][group_start],
+        'last_rank': p['last_rank'],
+        'peak_rank': peak_rank,
+        'peak_week': p['peak_week'][peak_at],
+        'weeks_charted': running_sum(p['weeks_charted']),
+        'weeks_in_top10': running_sum(p['weeks_in_top10']),
+        'rank_points': running_sum(p['rank_points']),
+        're_entries': running_sum(p['re_entries'] + gap),
+    })
+
+
+def trajectory_features(summary):
+    """
+    Trajectory features from per-song summaries.
+
+    Args:
+        summary: cumulative_summaries output
+
+    Returns:
+        pd.DataFrame: TRAJECTORY_COLUMNS (float), indexed by (song_hash,
+            grammy_year), sorted
+    """
+    weeks_to_peak = (summary['peak_week'] - summary['first_week']).to_numpy(dtype=float)
+    climb = (summary['debut_rank'] - summary['peak_rank']).to_numpy(dtype=float)
+
+    return pd.DataFrame({
+        'debut_rank': summary['debut_rank'].to_numpy(dtype=float),
+        'weeks_in_top10': summary['weeks_in_top10'].to_numpy(dtype=float),
+        'rank_auc': summary['rank_points'].to_numpy(dtype=float),
+        'velocity': np.divide(climb, weeks_to_peak, out=np.zeros(len(summary)), where=weeks_to_peak > 0),
+        're_entries': summary['re_entries'].to_numpy(dtype=float),
+    }, index=pd.MultiIndex.from_arrays([summary['song_hash'].to_numpy(dtype=np.uint64),
+                                        summary['grammy_year'].to_numpy(dtype=np.int64)],
+                                       names=['song_hash', 'grammy_year']))
+
+
+class TrajectoryStore:
+    """
+    Cached run summaries (per song and Grammy year) for one archived chart,
+    updated incrementally.
+
+    Args:
+        chart_name: Billboard chart name
+        cache_dir: Cache root
+        archive_dir: Chart archive root
+    """
+
+    def __init__(self, chart_name=DEFAULT_CHART, cache_dir=TRAJECTORY_CACHE_DIR, archive_dir=ARCHIVE_DIR):
+        self.chart_name = chart_name
+        self.archive_dir = archive_dir
+        self.cache_dir = os.path.join(cache_dir, chart_name)
+        self._summary_path = os.path.join(self.cache_dir, 'summary')
+        self._checkpoint_path = os.path.join(self.cache_dir, CHECKPOINT_FILE)
+
+    def _load(self):
+        if not (table_exists(self._summary_path) and os.path.exists(self._checkpoint_path)):
+            return _empty_summary(), []
+
+        summary = read_table(self._summary_path)
+        if list(summary.columns) != SUMMARY_COLUMNS:
+            # Cached by an earlier layout (e.g. one summary per song): rebuild
+            return _empty_summary(), []
+
+        with open(self._checkpoint_path, 'r', encoding='utf-8') as f:
+            dates = json.load(f)['dates']
+        return summary, dates
+
+    def _save(self, summary, dates):
+        write_table(summary, self._summary_path, csv=False)
+
+        # Dates last, so they never claim weeks the summary doesn't have
+        tmp_path = f"{self._checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'dates': dates}, f)
+        os.replace(tmp_path, self._checkpoint_path)
+
+    def update(self):
+        """
+        Bring the cached summaries up to date with the archive.
+
+        Returns:
+            tuple: (summaries as in combine_summaries, sorted week numbers
+                of the archived charts)
+        """
+        summary, cached_dates = self._load()
+        archive_dates = archived_dates(self.chart_name, self.archive_dir)
+        chart_weeks = np.unique(week_numbers(archive_dates)) if archive_dates else np.empty(0, dtype=np.int64)
+
+        new_dates = sorted(set(archive_dates) - set(cached_dates))
+        if not new_dates:
+            return summary, chart_weeks
+
+        if cached_dates and new_dates[0] < cached_dates[-1]:
+            # An older week was backfilled: rebuild from the whole archive
+            print(f"  ⚠️  Chart archive has weeks before {cached_dates[-1]} not in the trajectory cache; rebuilding")
+            summary, cached_dates, new_dates = _empty_summary(), [], archive_dates
+
+        for start in range(0, len(new_dates), WEEKS_PER_BATCH):
+            batch = new_dates[start:start + WEEKS_PER_BATCH]
+            weeks = load_chart_archive(self.chart_name, columns=['song_title', 'artist_name', 'current_rank'],
+                                       since=batch[0], until=batch[-1], archive_dir=self.archive_dir)
+            summary = combine_summaries(pd.concat([summary, week_summaries(weeks)], ignore_index=True), chart_weeks)
+
+        self._save(summary, sorted(set(cached_dates) | set(new_dates)))
+        print(f"  ✓ Trajectories updated with {len(new_dates)} chart weeks "
+              f"({summary['song_hash'].nunique()} songs)")
+
+        return summary, chart_weeks
+
+    def features(self):
+        """
+        Up-to-date trajectory features, as of the end of each Grammy year.
+
+        Returns:
+            pd.DataFrame: TRAJECTORY_COLUMNS, indexed by (song_hash, grammy_year)
+        """
+        return trajectory_features(cumulative_summaries(*self.update()))
+
+
+def add_trajectory_features(df, features):
+    """
+    Join trajectory features onto a table of songs.
+
+    Each row gets its song's run up to the end of the row's Grammy year (the
+    latest year with chart weeks at or before it); rows without a Grammy
+    year get the whole run.
+
+    Args:
+        df: DataFrame with artist_name, song_title and (optionally) grammy_year
+        features: TrajectoryStore.features() output
+
+    Returns:
+        pd.DataFrame: df with TRAJECTORY_COLUMNS (missing for songs with no
+            archived week by then)
+    """
+    df = df.copy()
+    if len(features) == 0 or len(df) == 0:
+        for col in TRAJECTORY_COLUMNS:
+            df[col] = np.nan
+        return df
+
+    # One sortable key per (song, year): features are sorted by song, then year
+    songs = features.index.get_level_values('song_hash')
+    years = features.index.get_level_values('grammy_year').to_numpy(dtype=np.int64)
+    song_codes = pd.Index(songs.unique())
+    codes = song_codes.get_indexer(songs)
+    feature_keys = codes * (LATEST_YEAR + 1) + years
+
+    row_codes = song_codes.get_indexer(song_keys(df)['song_hash'].to_numpy(dtype=np.uint64))
+    row_years = np.full(len(df), LATEST_YEAR, dtype=np.int64)
+    if 'grammy_year' in df.columns:
+        grammy_year = df['grammy_year'].to_numpy(dtype=float)
+        has_year = ~np.isnan(grammy_year)
+        row_years[has_year] = np.minimum(grammy_year[has_year], LATEST_YEAR).astype(np.int64)
+
+    positions = np.searchsorted(feature_keys, row_codes * (LATEST_YEAR + 1) + row_years, side='right') - 1
+    found = (row_codes >= 0) & (positions >= 0)
+    found[found] = codes[positions[found]] == row_codes[found]
+    for col in TRAJECTORY_COLUMNS:
+        values = np.full(len(df), np.nan)
+        values[found] = features[col].to_numpy()[positions[found]]
+        df[col] = values
+
+    return df
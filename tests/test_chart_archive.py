@@ -0,0 +1,100 @@
+"""Chart archive backfill and checkpoint resume, replayed from tests/fixtures/charts."""
+
+import os
+
+import pytest
+
+pytest.importorskip('billboard')
+
+from conftest import FIXTURES_DIR
+from chart_archive import (FixtureChartSource, archived_dates, load_chart_archive,
+                           load_checkpoint, update_archive)
+
+CHART_FIXTURES = os.path.join(FIXTURES_DIR, 'charts')
+HOT_100_WEEKS = ['2025-09-20', '2025-09-27', '2025-10-04', '2025-10-11']
+
+
+class RecordingSource(FixtureChartSource):
+    """Fixture replay that records the dates requested, and can fail on one of them."""
+
+    def __init__(self, fail_on=None):
+        super().__init__(CHART_FIXTURES)
+        self.requested = []
+        self.fail_on = fail_on
+
+    def fetch(self, chart_name, chart_date=None):
+        self.requested.append(chart_date)
+        if chart_date is not None and chart_date == self.fail_on:
+            raise ConnectionError(f"lost connection fetching {chart_date}")
+        return super().fetch(chart_name, chart_date)
+
+
+def test_backfill_stores_every_week_and_reaches_the_start(tmp_path):
+    added = update_archive(source=RecordingSource(), archive_dir=str(tmp_path))
+
+    assert sorted(added) == HOT_100_WEEKS
+    assert archived_dates(archive_dir=str(tmp_path)) == HOT_100_WEEKS
+
+    checkpoint = load_checkpoint(archive_dir=str(tmp_path))
+    assert checkpoint['backfill_complete']
+    assert checkpoint['oldest_date'] == '2025-09-20'
+    assert checkpoint['newest_date'] == '2025-10-11'
+    assert all(d < '2025-09-20' for d in checkpoint['no_chart_dates'])
+
+    archive = load_chart_archive(archive_dir=str(tmp_path))
+    assert len(archive) == 8 * len(HOT_100_WEEKS)
+    latest = archive[archive['chart_date'] == '2025-10-11'].set_index('current_rank')
+    assert latest.loc[1, 'song_title'] == 'The Fate Of Ophelia'
+    assert latest.loc[2, 'last_week_rank'] == 1
+
+
+def test_rerun_requests_only_the_current_chart(tmp_path):
+    update_archive(source=RecordingSource(), archive_dir=str(tmp_path))
+
+    source = RecordingSource()
+    added = update_archive(source=source, archive_dir=str(tmp_path))
+
+    assert added == []
+    assert source.requested == [None]
+
+
+def test_max_weeks_run_resumes_where_it_stopped(tmp_path):
+    first = RecordingSource()
+    added = update_archive(source=first, max_weeks=2, archive_dir=str(tmp_path))
+    assert added == ['2025-10-11', '2025-10-04']
+
+    second = RecordingSource()
+    added = update_archive(source=second, archive_dir=str(tmp_path))
+
+    assert added == ['2025-09-27', '2025-09-20']
+    assert '2025-10-04' not in second.requested
+    assert archived_dates(archive_dir=str(tmp_path)) == HOT_100_WEEKS
+
+
+def test_interrupted_backfill_keeps_finished_weeks(tmp_path):
+    with pytest.raises(ConnectionError):
+        update_archive(source=RecordingSource(fail_on='2025-09-27'), archive_dir=str(tmp_path))
+
+    assert archived_dates(archive_dir=str(tmp_path)) == ['2025-10-04', '2025-10-11']
+    assert load_checkpoint(archive_dir=str(tmp_path))['oldest_date'] == '2025-10-04'
+
+    source = RecordingSource()
+    added = update_archive(source=source, archive_dir=str(tmp_path))
+
+    assert added == ['2025-09-27', '2025-09-20']
+    assert source.requested[:2] == [None, '2025-09-27']
+
+
+def test_since_limits_the_backfill(tmp_path):
+    added = update_archive(source=RecordingSource(), since='2025-10-01', archive_dir=str(tmp_path))
+
+    assert added == ['2025-10-11', '2025-10-04']
+    assert not load_checkpoint(archive_dir=str(tmp_path)).get('backfill_complete')
+
+
+def test_genre_chart_partitions_carry_the_chart_genre(tmp_path):
+    update_archive('pop-songs', source=RecordingSource(), archive_dir=str(tmp_path))
+
+    archive = load_chart_archive('pop-songs', archive_dir=str(tmp_path))
+    assert len(archive) == 6
+    assert set(archive['genre']) == {'Pop'}
@@ -0,0 +1,58 @@
+"""Streaming Grammy page parser against the BeautifulSoup parsers it replaced, on tests/fixtures/grammy_pages."""
+
+import os
+
+import pytest
+
+from benchmark_grammy_parser import PAGE_FIXTURES_DIR, legacy_parse_list, legacy_parse_table, synthetic_page
+from grammy_parser import iter_nominees
+from scrape_grammy_history import TARGET_CATEGORIES
+
+
+def read_page(layout):
+    with open(os.path.join(PAGE_FIXTURES_DIR, layout, '66th_Annual_Grammy_Awards.html'), 'rb') as f:
+        return f.read()
+
+
+def test_list_layout_matches_legacy_parser():
+    html = read_page('list')
+    nominees = list(iter_nominees(html, 'list', TARGET_CATEGORIES))
+
+    assert sorted(nominees) == sorted(legacy_parse_list(html, TARGET_CATEGORIES))
+    assert len(nominees) == 61
+    assert ('Record of the Year', 'Flowers', 'Miley Cyrus', True) in nominees
+    assert ('Best Rap Song', 'Attention', 'Doja Cat', False) in nominees
+    # Categories outside TARGET_CATEGORIES, album titles and artist-only entries are skipped
+    assert not any(category.startswith('Best Dance') for category, *_ in nominees)
+    assert not any(title == 'Midnights' for _, title, *_ in nominees)
+
+
+def test_table_layout_matches_legacy_parser():
+    html = read_page('table')
+    nominees = list(iter_nominees(html, 'table'))
+
+    assert sorted(nominees) == sorted(legacy_parse_table(html))
+    winners = {(category, title) for category, title, artist, is_winner in nominees if is_winner}
+    assert ('Song of the Year[edit]', 'What Was I Made For?') in winners
+    assert len(winners) == 12
+    # The performers table sits under a heading that names no category
+    assert not any(category.startswith('Performers') for category, *_ in nominees)
+
+
+def test_str_and_bytes_input_agree():
+    html = read_page('list')
+    assert list(iter_nominees(html.decode('utf-8'), 'list')) == list(iter_nominees(html, 'list'))
+
+
+@pytest.mark.parametrize('layout', ['list', 'table'])
+def test_generated_page_matches_legacy_parser(layout):
+    html = synthetic_page(layout, 40)
+    if layout == 'list':
+        expected = legacy_parse_list(html, TARGET_CATEGORIES)
+        nominees = list(iter_nominees(html, 'list', TARGET_CATEGORIES))
+    else:
+        expected = legacy_parse_table(html)
+        nominees = list(iter_nominees(html, 'table'))
+
+    assert sorted(nominees) == sorted(expected)
+    assert len(nominees) == 40 * 5
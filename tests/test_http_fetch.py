@@ -0,0 +1,136 @@
+"""CachedFetcher against a local HTTP server: cache reuse, 304 revalidation, failure backoff."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_fetch import CachedFetcher, FetchBackoff
+
+LAST_MODIFIED = 'Sat, 11 Oct 2025 00:00:00 GMT'
+
+
+class ChartPageHandler(BaseHTTPRequestHandler):
+    """Serves /page with an ETag and Last-Modified (304 when they match); /dead, or any page while down, is a 503."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+
+        if self.path == '/dead' or server.down:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        etag = f'"v{server.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = f"page version {server.version}".encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ChartPageHandler)
+    httpd.requests = []
+    httpd.version = 1
+    httpd.down = False
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_fetcher(cache_dir, **kwargs):
+    return CachedFetcher(cache_dir=str(cache_dir), min_interval=0, timeout=5, **kwargs)
+
+
+def failures(cache_dir, url):
+    failure = make_fetcher(cache_dir)._read_failure(url)
+    return failure['failures'] if failure else 0
+
+
+def test_fresh_cache_is_reused_without_a_request(server, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+
+    first = fetcher.get(f"{server.url}/page")
+    second = make_fetcher(tmp_path).get(f"{server.url}/page")
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.text == first.text == 'page version 1'
+    assert len(server.requests) == 1
+
+
+def test_revalidation_sends_validators_and_reuses_body_on_304(server, tmp_path):
+    make_fetcher(tmp_path).get(f"{server.url}/page")
+
+    result = make_fetcher(tmp_path, max_age=0).get(f"{server.url}/page")
+
+    path, headers = server.requests[-1]
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == LAST_MODIFIED
+    assert result.from_cache
+    assert result.status_code == 200
+    assert result.text == 'page version 1'
+
+
+def test_revalidation_downloads_changed_page(server, tmp_path):
+    make_fetcher(tmp_path).get(f"{server.url}/page")
+    server.version = 2
+
+    result = make_fetcher(tmp_path, max_age=0).get(f"{server.url}/page")
+    cached = make_fetcher(tmp_path).get(f"{server.url}/page")
+
+    assert not result.from_cache
+    assert result.text == cached.text == 'page version 2'
+    assert len(server.requests) == 2
+
+
+def test_failed_fetch_backs_off(server, tmp_path):
+    url = f"{server.url}/dead"
+
+    with pytest.raises(requests.HTTPError):
+        make_fetcher(tmp_path).get(url)
+    with pytest.raises(FetchBackoff):
+        make_fetcher(tmp_path).get(url)
+    assert len(server.requests) == 1
+
+    # --refresh (no backoff) retries, and the failure count keeps growing
+    with pytest.raises(requests.HTTPError):
+        make_fetcher(tmp_path, failure_backoff=0).get(url)
+    assert len(server.requests) == 2
+    assert failures(tmp_path, url) == 2
+
+
+def test_backoff_serves_stale_copy_until_a_retry_succeeds(server, tmp_path):
+    url = f"{server.url}/page"
+    make_fetcher(tmp_path).get(url)
+
+    # Revalidation fails: the stale copy is served, then no request until the backoff passes
+    server.down = True
+    assert make_fetcher(tmp_path, max_age=0).get(url).text == 'page version 1'
+    assert make_fetcher(tmp_path, max_age=0).get(url).text == 'page version 1'
+    assert len(server.requests) == 2
+    assert failures(tmp_path, url) == 1
+
+    # A successful retry clears the failure
+    server.down = False
+    server.version = 2
+    result = make_fetcher(tmp_path, max_age=0, failure_backoff=0).get(url)
+    assert result.text == 'page version 2'
+    assert failures(tmp_path, url) == 0
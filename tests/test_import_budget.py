@@ -0,0 +1,18 @@
+"""Import-time budgets and forbidden startup imports (see scripts/check_import_budget.py)."""
+
+import os
+
+import pytest
+
+from check_import_budget import IMPORT_BUDGETS_MS, check_module
+
+# Budget multiplier for slow or busy machines
+SCALE = float(os.environ.get('IMPORT_BUDGET_SCALE', '1.0'))
+
+
+@pytest.mark.parametrize('module', list(IMPORT_BUDGETS_MS))
+def test_import_budget(module):
+    best_ms, budget_ms, forbidden = check_module(module, runs=3, scale=SCALE)
+
+    assert not forbidden, f"{module} imports {', '.join(forbidden)} at startup"
+    assert best_ms <= budget_ms, f"{module} imports in {best_ms:.0f} ms (budget {budget_ms:.0f} ms)"
@@ -0,0 +1,85 @@
+"""Multi-chart ingestion and genre by chart membership, replayed from tests/fixtures/charts."""
+
+import os
+
+import pytest
+
+pytest.importorskip('billboard')
+
+from conftest import FIXTURES_DIR
+from chart_archive import FixtureChartSource, load_chart_archive
+from ingest_billboard import fetch_charts, main, merge_charts
+
+CHART_FIXTURES = os.path.join(FIXTURES_DIR, 'charts')
+
+
+@pytest.fixture(scope='module')
+def charts():
+    return fetch_charts(source=FixtureChartSource(CHART_FIXTURES), max_workers=2)
+
+
+@pytest.fixture(scope='module')
+def songs(charts):
+    return merge_charts(charts).set_index('song_title')
+
+
+def test_fetch_charts_skips_charts_without_fixtures(charts):
+    assert set(charts) == {'hot-100', 'pop-songs', 'r-and-b-songs', 'country-songs', 'billboard-200'}
+    assert {chart.date for chart in charts.values()} == {'2025-10-11'}
+
+
+def test_fetch_charts_requires_the_hot_100(tmp_path):
+    with pytest.raises(RuntimeError):
+        fetch_charts(['hot-100', 'pop-songs'], source=FixtureChartSource(str(tmp_path)))
+
+
+def test_merge_charts_takes_genre_from_the_best_ranked_genre_chart(songs):
+    assert songs.loc['Golden', 'genre'] == 'Pop'
+    assert songs.loc['The Fate Of Ophelia', 'genre'] == 'Pop'
+    # R&B #1 beats Pop #4
+    assert songs.loc['Man I Need', 'genre'] == 'R&B'
+    # "feat." on the country chart matches "Featuring" on the Hot 100
+    assert songs.loc['What I Want', 'genre'] == 'Country'
+    assert songs.loc['What I Want', 'charts'] == 'hot-100|country-songs'
+    # On no genre chart
+    assert songs.loc[['Tears', 'Soda Pop'], 'genre'].isna().all()
+
+
+def test_merge_charts_keeps_hot_100_fields(songs):
+    want = songs.loc['What I Want']
+    assert want['artist_name'] == 'Morgan Wallen Featuring Tate McRae'
+    assert want['current_rank'] == 5
+    assert want['on_hot_100']
+
+    # Songs off the Hot 100 keep their best-ranked chart's entry
+    manchild = songs.loc['Manchild']
+    assert not manchild['on_hot_100']
+    assert manchild['current_rank'] == 3
+    assert manchild['genre'] == 'Pop'
+
+
+def test_merge_charts_flags_billboard_200_artists(songs):
+    assert songs.loc['The Fate Of Ophelia', 'artist_on_billboard_200']
+    assert songs.loc['Just In Case', 'artist_on_billboard_200']
+    assert not songs.loc['Ordinary', 'artist_on_billboard_200']
+
+
+def test_merge_charts_without_billboard_200(charts):
+    songs = merge_charts({name: chart for name, chart in charts.items() if name != 'billboard-200'})
+    assert songs['artist_on_billboard_200'].isna().all()
+
+
+def test_fixture_replay_archives_hot_100_with_merged_genres(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('sys.argv', ['ingest_billboard.py', '--fixtures', CHART_FIXTURES])
+
+    df = main()
+
+    assert list(df['current_rank']) == list(range(1, 9))
+    assert os.path.exists('data/raw/billboard_hot100_2025-10-11.parquet')
+    assert os.path.exists('data/raw/billboard_songs_2025-10-11.parquet')
+
+    archived = load_chart_archive('hot-100').set_index('song_title')
+    assert archived.loc['Man I Need', 'genre'] == 'R&B'
+    assert archived.loc['Just In Case', 'genre'] == 'Country'
+    assert len(load_chart_archive('country-songs')) == 2